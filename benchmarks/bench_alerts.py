@@ -0,0 +1,44 @@
+"""Compare the table-driven alert engine with the original per-station loop
+
+Usage:
+    python benchmarks/bench_alerts.py --stations 1000 10000
+"""
+import argparse
+
+from common import make_fleet, timed
+from legacy import generate_alerts_loop
+from src.alerts.alert_engine import evaluate_alerts
+from src.data_processing.measurement_generator import MeasurementGenerator
+
+
+def run_engine(measurements_df, stations_df):
+    latest_data = measurements_df.groupby('station_id').last().reset_index()
+    return evaluate_alerts(latest_data, stations_df).to_dict('records')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--stations', type=int, nargs='+', default=[1000, 10000])
+    parser.add_argument('--days', type=int, default=1, help="History length per station")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--skip-loop', action='store_true', help="Only time the rule engine")
+    args = parser.parse_args()
+
+    for n_stations in args.stations:
+        stations_df = make_fleet(n_stations, seed=args.seed)
+        measurements_df = MeasurementGenerator(days=args.days, seed=args.seed).generate(stations_df)
+        print(f"{n_stations} stations, {len(measurements_df):,} readings")
+
+        engine_time, engine_alerts = timed(run_engine, measurements_df, stations_df, repeat=3)
+        print(f"  rule engine: {engine_time:8.3f}s  ({len(engine_alerts)} alerts)")
+
+        if not args.skip_loop:
+            loop_time, loop_alerts = timed(generate_alerts_loop, measurements_df, stations_df)
+            same = [(a['station_id'], a['type'], a['severity']) for a in loop_alerts] == \
+                   [(a['station_id'], a['type'], a['severity']) for a in engine_alerts]
+            print(f"  loop:        {loop_time:8.3f}s  (speedup x{loop_time / engine_time:.1f}, "
+                  f"identical alerts: {same})")
+
+
+if __name__ == '__main__':
+    main()
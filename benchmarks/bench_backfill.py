@@ -0,0 +1,87 @@
+"""Measure bulk backfill throughput (rows/s) and check that an interrupted import resumes exactly
+
+Usage:
+    python benchmarks/bench_backfill.py --stations 1000 --days 365 --files 40 --workers 1 4
+"""
+import argparse
+import tempfile
+from pathlib import Path
+
+from common import make_fleet, timed
+from src.data_processing.measurement_generator import MeasurementGenerator
+from src.data_processing.measurement_store import MeasurementStore
+from src.ingestion.backfill import BackfillImporter
+
+# Column names of the logger export format, as found in the archives
+CSV_COLUMNS = {
+    'station_id': 'Station', 'timestamp': 'DateTime', 'water_level': 'Level_m', 'flow_rate': 'Discharge',
+    'temperature': 'Temp_C', 'data_quality': 'QC', 'battery_level': 'Battery'
+}
+
+
+class Interrupted(Exception):
+    pass
+
+
+def write_archive(stations_df, measurements_df, archive_dir, n_files):
+    """Split the readings by station into CSV and JSON-lines files"""
+    groups = stations_df['station_id'].to_numpy()
+    for number in range(n_files):
+        station_ids = groups[number::n_files]
+        part = measurements_df[measurements_df['station_id'].isin(station_ids)]
+        if number % 2:
+            part.to_json(archive_dir / f"logs-{number:03d}.jsonl", orient='records', lines=True, date_format='iso')
+        else:
+            part.drop(columns='transmission_status').rename(columns=CSV_COLUMNS).to_csv(
+                archive_dir / f"logs-{number:03d}.csv", index=False
+            )
+
+
+def stop_after(n_files):
+    def progress(message):
+        if message.startswith(f"[{n_files}/"):
+            raise Interrupted(message)
+    return progress
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--stations', type=int, default=1000)
+    parser.add_argument('--days', type=int, default=90)
+    parser.add_argument('--files', type=int, default=20)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 4])
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    stations_df = make_fleet(args.stations, seed=args.seed)
+    measurements_df = MeasurementGenerator(days=args.days, seed=args.seed).generate(stations_df)
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        archive_dir = Path(work_dir) / 'archive'
+        archive_dir.mkdir()
+        write_time, _ = timed(write_archive, stations_df, measurements_df, archive_dir, args.files)
+        size = sum(path.stat().st_size for path in archive_dir.iterdir())
+        print(f"{args.stations} stations, {len(measurements_df):,} readings in {args.files} files "
+              f"({size / 1e6:.0f} MB, written in {write_time:.1f}s)")
+
+        for workers in args.workers:
+            store = MeasurementStore(Path(work_dir) / f'store-{workers}')
+            totals = BackfillImporter(store, stations_df, workers=workers).run([archive_dir], progress=lambda _: None)
+            print(f"  {workers} worker(s): {totals['rows']:,} rows in {totals['seconds']:.1f}s "
+                  f"({totals['rows_per_second']:,.0f} rows/s)")
+
+        # Interrupt after half of the files, then resume
+        store = MeasurementStore(Path(work_dir) / 'store-resume')
+        try:
+            BackfillImporter(store, stations_df, workers=1).run([archive_dir], progress=stop_after(args.files // 2))
+        except Interrupted:
+            pass
+        totals = BackfillImporter(store, stations_df, workers=1).run([archive_dir], progress=lambda _: None)
+        stored = store.read(columns=['station_id', 'timestamp'])
+        duplicates = stored.duplicated().sum()
+        print(f"  resume: {totals['files']} remaining file(s) imported, {len(stored):,} rows stored "
+              f"(expected {len(measurements_df):,}, {duplicates} duplicates)")
+
+
+if __name__ == '__main__':
+    main()
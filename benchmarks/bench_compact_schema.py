@@ -0,0 +1,46 @@
+"""Memory footprint per row of the station and measurement frames in the default and compact schemas
+
+Usage:
+    python benchmarks/bench_compact_schema.py --stations 1000 --days 30
+    python benchmarks/bench_compact_schema.py --stations 10000 --days 30
+"""
+import argparse
+import time
+
+import pandas as pd
+
+from common import make_fleet
+from src.data_processing.compact_schema import compact_measurements, compact_stations, memory_report
+from src.data_processing.dataset_service import DatasetSnapshot
+from src.data_processing.measurement_generator import MeasurementGenerator
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--stations', type=int, default=1000)
+    parser.add_argument('--days', type=int, default=30)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    stations_df = make_fleet(args.stations, seed=args.seed)
+    measurements_df = MeasurementGenerator(days=args.days, seed=args.seed).generate(stations_df)
+
+    start = time.perf_counter()
+    compact_stations_df = compact_stations(stations_df)
+    compact_measurements_df = compact_measurements(measurements_df, station_ids=compact_stations_df['station_id'])
+    elapsed = time.perf_counter() - start
+
+    with pd.option_context('display.width', 120):
+        print(f"Measurements ({len(measurements_df):,} rows)")
+        print(memory_report(measurements_df, compact_measurements_df).to_string())
+        print(f"\nStations ({len(stations_df):,} rows)")
+        print(memory_report(stations_df, compact_stations_df).to_string())
+
+    default = DatasetSnapshot('default', stations_df, measurements_df)
+    compact = DatasetSnapshot('compact', compact_stations_df, compact_measurements_df)
+    print(f"\nSnapshot: {default.nbytes / 1e6:,.1f} MB -> {compact.nbytes / 1e6:,.1f} MB "
+          f"(x{compact.nbytes / default.nbytes:.2f}), converted in {elapsed:.2f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+"""Measure sustained telemetry ingest throughput and end-to-end latency with the fleet simulator
+
+Usage:
+    python benchmarks/bench_ingestion.py --stations 1000 --days 1 --speedup 3600
+    python benchmarks/bench_ingestion.py --commit-interval 0.05 0   # group commit vs per-batch
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import tempfile
+
+from common import make_fleet, timed
+from src.data_processing.measurement_store import MeasurementStore
+from src.ingestion.protocol import encode_request, read_message
+from src.ingestion.service import TelemetryIngestService
+from src.ingestion.simulator import FleetSimulator
+
+
+def serve(stations_df, store_dir, commit_interval, max_commit_rows, ready):
+    """Run the service in its own process so it does not share a CPU with the simulator"""
+    service = TelemetryIngestService(
+        MeasurementStore(store_dir), stations_df, port=0,
+        commit_interval=commit_interval,
+        # Without a commit interval every batch is committed on its own
+        max_commit_rows=max_commit_rows if commit_interval else 1
+    )
+
+    async def run():
+        await service.start()
+        ready.send(service.port)
+        await asyncio.Event().wait()
+
+    asyncio.run(run())
+
+
+async def fetch_stats(port):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    writer.write(encode_request('GET', '/health', None))
+    await writer.drain()
+    _, _, body = await read_message(reader, 1024 * 1024)
+    writer.close()
+    return json.loads(body)
+
+
+def run_once(stations_df, store_dir, args, commit_interval, messages):
+    ready, child_end = multiprocessing.Pipe()
+    process = multiprocessing.Process(
+        target=serve, args=(stations_df, store_dir, commit_interval, args.max_commit_rows, child_end), daemon=True
+    )
+    process.start()
+    try:
+        port = ready.recv()
+        simulator = FleetSimulator(stations_df, port=port, days=args.days, speedup=args.speedup,
+                                   connections=args.connections, seed=args.seed)
+        report = asyncio.run(simulator.run(messages))
+        # Every accepted batch was acknowledged after its commit, so the stats are final
+        return report, asyncio.run(fetch_stats(port))
+    finally:
+        process.terminate()
+        process.join()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--stations', type=int, default=1000)
+    parser.add_argument('--days', type=float, default=1)
+    parser.add_argument('--speedup', type=float, default=3600,
+                        help="Simulated seconds per real second")
+    parser.add_argument('--connections', type=int, default=64,
+                        help="Concurrent logger connections (one outstanding batch each)")
+    parser.add_argument('--commit-interval', type=float, nargs='+', default=[0.05])
+    parser.add_argument('--max-commit-rows', type=int, default=50_000)
+    parser.add_argument('--fault-rate', type=float, default=0.01)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    stations_df = make_fleet(args.stations, seed=args.seed)
+    simulator = FleetSimulator(stations_df, days=args.days, speedup=args.speedup,
+                               fault_rate=args.fault_rate, seed=args.seed)
+    build_time, messages = timed(simulator.messages)
+    print(f"{args.stations} stations, {len(messages):,} messages, "
+          f"{sum(n for _, _, n in messages):,} readings over {args.days:g} day(s) "
+          f"replayed in ~{messages[-1][0]:.1f}s (built in {build_time:.1f}s)")
+
+    for commit_interval in args.commit_interval:
+        with tempfile.TemporaryDirectory() as store_dir:
+            report, stats = run_once(stations_df, store_dir, args, commit_interval, messages)
+        latency = report['latency_ms']
+        print(f"  commit interval {commit_interval * 1000:4.0f} ms: "
+              f"{report['rows_per_second']:8,.0f} rows/s sustained "
+              f"(offered {report['offered_rows_per_second']:,.0f}), "
+              f"{stats['commits']:,} commits ({stats['rows_per_commit']:.0f} rows, "
+              f"{stats['commit_seconds'] / max(stats['commits'], 1) * 1000:.0f} ms each)")
+        print(f"    latency p50 {latency['p50']:6.1f} ms  p95 {latency['p95']:6.1f} ms  "
+              f"p99 {latency['p99']:6.1f} ms  max {latency['max']:6.1f} ms; "
+              f"{report['rejected_messages']} rejected, {report['throttled_retries']} throttled, "
+              f"{report['errors']} errors")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,43 @@
+"""Compare the vectorized measurement engine with the original per-reading loop
+
+Usage:
+    python benchmarks/bench_measurement_generation.py --stations 68 500 2000
+"""
+import argparse
+
+from common import make_fleet, timed
+from legacy import generate_measurements_loop
+from src.data_processing.measurement_generator import MeasurementGenerator
+
+COMPARED_COLUMNS = ['water_level', 'flow_rate', 'temperature', 'data_quality', 'battery_level']
+
+
+def compare_statistics(loop_df, vector_df):
+    """Print per-column mean/std of both engines side by side"""
+    print(f"  {'column':<14}{'loop mean':>12}{'vector mean':>13}{'loop std':>11}{'vector std':>12}")
+    for column in COMPARED_COLUMNS:
+        print(f"  {column:<14}{loop_df[column].mean():>12.2f}{vector_df[column].mean():>13.2f}"
+              f"{loop_df[column].std():>11.2f}{vector_df[column].std():>12.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--stations', type=int, nargs='+', default=[68, 500, 2000])
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--skip-loop', action='store_true', help="Only time the vectorized engine")
+    args = parser.parse_args()
+
+    for n_stations in args.stations:
+        stations_df = make_fleet(n_stations, seed=args.seed)
+        vector_time, vector_df = timed(MeasurementGenerator(seed=args.seed).generate, stations_df)
+        print(f"{n_stations} stations, {len(vector_df):,} readings")
+        print(f"  vectorized: {vector_time:8.3f}s")
+
+        if not args.skip_loop:
+            loop_time, loop_df = timed(generate_measurements_loop, stations_df)
+            print(f"  loop:       {loop_time:8.3f}s  (speedup x{loop_time / vector_time:.1f})")
+            compare_statistics(loop_df, vector_df)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+"""Compare Trend Analysis queries on rollup cubes with raw merge + groupby
+
+Usage:
+    python benchmarks/bench_rollups.py --stations 1000 5000
+"""
+import argparse
+
+from common import make_fleet, timed
+from src.data_processing.measurement_generator import MeasurementGenerator
+from src.data_processing.rollups import MeasurementRollups
+
+
+def raw_queries(measurements_df, stations_df, parameter):
+    data = measurements_df.merge(stations_df[['station_id', 'country', 'climate_zone']], on='station_id')
+    data.groupby('country')[parameter].agg(['mean', 'std', 'min', 'max'])
+    data.groupby('climate_zone')[parameter].agg(['mean', 'std', 'count'])
+    data.groupby(data['timestamp'].dt.hour)[parameter].mean()
+    data.groupby(data['timestamp'].dt.month)[parameter].mean()
+
+
+def rollup_queries(rollups, stations_df, parameter):
+    rollups.summarize(parameter, 'country', stations_df)
+    rollups.summarize(parameter, 'climate_zone', stations_df)
+    rollups.profile(parameter, 'hour')
+    rollups.profile(parameter, 'month')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--stations', type=int, nargs='+', default=[1000, 5000])
+    parser.add_argument('--days', type=int, default=30)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    for n_stations in args.stations:
+        stations_df = make_fleet(n_stations, seed=args.seed)
+        measurements_df = MeasurementGenerator(days=args.days, seed=args.seed).generate(stations_df)
+        print(f"{n_stations} stations, {len(measurements_df):,} readings")
+
+        build_time, rollups = timed(MeasurementRollups, measurements_df)
+        print(f"  build cubes:    {build_time:8.3f}s  "
+              f"({len(rollups.tables['hour']):,} hourly / {len(rollups.tables['day']):,} daily rows)")
+        rollup_time, _ = timed(rollup_queries, rollups, stations_df, 'water_level', repeat=3)
+        raw_time, _ = timed(raw_queries, measurements_df, stations_df, 'water_level', repeat=3)
+        print(f"  rollup queries: {rollup_time:8.3f}s")
+        print(f"  raw queries:    {raw_time:8.3f}s  (speedup x{raw_time / rollup_time:.1f})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+"""Run a batch of due scheduled reports and measure dashboard responsiveness meanwhile
+
+Usage:
+    python benchmarks/bench_scheduler.py --stations 1000 --schedules 50
+    python benchmarks/bench_scheduler.py --workers 4 --niceness 0   # unbounded, full priority
+"""
+import argparse
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+
+from common import FLEET_COUNTRIES, make_fleet
+from src.data_processing.measurement_generator import MeasurementGenerator
+from src.data_processing.measurement_store import MeasurementStore
+from src.reporting.report_engine import REPORT_KINDS, ReportEngine
+from src.reporting.scheduler import OutboxMailer, ReportScheduler, ScheduleStore
+
+
+def dashboard_probe(measurements_df):
+    """Stand-in for a dashboard rerun: per-station statistics of the loaded data"""
+    start = time.perf_counter()
+    measurements_df.groupby('station_id')[['water_level', 'flow_rate', 'data_quality']].mean()
+    return time.perf_counter() - start
+
+
+def probe_latencies(measurements_df, seconds=None, until=None):
+    """Probe back to back for a number of seconds or until until() is true; latencies in ms"""
+    latencies = []
+    deadline = time.perf_counter() + (seconds or float('inf'))
+    while time.perf_counter() < deadline and not (until and until()):
+        latencies.append(dashboard_probe(measurements_df) * 1000)
+        time.sleep(0.05)  # A user clicks now and then, not continuously
+    return np.array(latencies)
+
+
+def add_stakeholder_schedules(store, count, now):
+    """Weekly schedules that all fell due at the last Monday run; stakeholders share some filters"""
+    countries = list(FLEET_COUNTRIES)
+    kinds = list(REPORT_KINDS)
+    for number in range(count):
+        group = number % (len(countries) + 1)
+        store.add(
+            kinds[number % len(kinds)],
+            'PDF Report',
+            'Weekly',
+            '06:00',
+            [f"stakeholder{number + 1}@nilebasin.org"],
+            {'countries': [] if group == len(countries) else [countries[group]], 'statuses': ['Active']},
+            now=now - timedelta(days=7)
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--stations', type=int, default=1000)
+    parser.add_argument('--days', type=int, default=30)
+    parser.add_argument('--schedules', type=int, default=50)
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--concurrency', type=int, default=2, help="Renders in flight at a time")
+    parser.add_argument('--niceness', type=int, default=10)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    stations_df = make_fleet(args.stations, seed=args.seed)
+    measurements_df = MeasurementGenerator(days=args.days, seed=args.seed).generate(stations_df)
+    baseline = probe_latencies(measurements_df, seconds=3)
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        work_dir = Path(work_dir)
+        MeasurementStore(work_dir / 'store').write(measurements_df, stations_df)
+        store = ScheduleStore(work_dir / 'schedules.sqlite')
+        add_stakeholder_schedules(store, args.schedules, datetime.now())
+        engine = ReportEngine(work_dir / 'store', work_dir / 'reports', work_dir / 'assets',
+                              workers=args.workers, niceness=args.niceness)
+        scheduler = ReportScheduler(store, engine, OutboxMailer(work_dir / 'outbox'),
+                                    stations_provider=lambda: stations_df, alerts_provider=list,
+                                    max_concurrent=args.concurrency, poll_interval=1)
+
+        started = time.perf_counter()
+        scheduler.start()
+        during = probe_latencies(
+            measurements_df, until=lambda: len(store.deliveries(limit=args.schedules)) >= args.schedules
+        )
+        elapsed = time.perf_counter() - started
+        scheduler.stop()
+        engine.shutdown()
+
+        deliveries = store.deliveries(limit=args.schedules)
+        sent = sum(delivery['status'] == 'sent' for delivery in deliveries)
+        reused = sum(delivery['reused'] for delivery in deliveries)
+        emails = len(list((work_dir / 'outbox').glob('*.eml')))
+
+    print(f"{args.schedules} weekly reports over {args.stations} stations x {args.days} days, "
+          f"{args.workers} worker(s) at niceness {args.niceness}, {args.concurrency} render(s) in flight")
+    print(f"  {sent} sent ({emails} emails), {args.schedules - reused} rendered, {reused} reused, "
+          f"in {elapsed:.1f}s ({elapsed / max(args.schedules - reused, 1):.2f}s per render)")
+    for label, latencies in (('idle', baseline), ('during', during)):
+        print(f"  dashboard probe {label:>6}: p50 {np.percentile(latencies, 50):6.1f} ms  "
+              f"p95 {np.percentile(latencies, 95):6.1f} ms  max {latencies.max():6.1f} ms  ({len(latencies)} probes)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+"""Compare per-station lookups on the offset index with boolean-mask scans
+
+Usage:
+    python benchmarks/bench_station_index.py --stations 1000 5000
+"""
+import argparse
+from datetime import datetime, timedelta
+
+from common import make_fleet, timed
+from src.data_processing.measurement_generator import MeasurementGenerator
+from src.data_processing.station_index import StationIndexedMeasurements
+
+
+def scan_lookups(measurements_df, station_ids, cutoff):
+    for station_id in station_ids:
+        measurements_df[(measurements_df['station_id'] == station_id) & (measurements_df['timestamp'] >= cutoff)]
+
+
+def index_lookups(index, station_ids, cutoff):
+    for station_id in station_ids:
+        index.station(station_id, start=cutoff)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--stations', type=int, nargs='+', default=[1000, 5000])
+    parser.add_argument('--lookups', type=int, default=50)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    cutoff = datetime.now() - timedelta(days=7)
+    for n_stations in args.stations:
+        stations_df = make_fleet(n_stations, seed=args.seed)
+        measurements_df = MeasurementGenerator(days=30, seed=args.seed).generate(stations_df)
+        station_ids = stations_df['station_id'].sample(args.lookups, random_state=args.seed).tolist()
+        print(f"{n_stations} stations, {len(measurements_df):,} readings, {args.lookups} lookups")
+
+        build_time, index = timed(StationIndexedMeasurements, measurements_df)
+        print(f"  build index:   {build_time:8.3f}s")
+        index_time, _ = timed(index_lookups, index, station_ids, cutoff, repeat=3)
+        scan_time, _ = timed(scan_lookups, measurements_df, station_ids, cutoff, repeat=3)
+        print(f"  index lookups: {index_time:8.4f}s")
+        print(f"  mask scans:    {scan_time:8.4f}s  (speedup x{scan_time / index_time:.0f})")
+
+
+if __name__ == '__main__':
+    main()
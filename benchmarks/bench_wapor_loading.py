@@ -0,0 +1,68 @@
+"""Compare WaPOR layer loading: sequential glob + json.load vs catalog + threaded loader
+
+Usage:
+    python benchmarks/bench_wapor_loading.py --copies 1 10
+"""
+import argparse
+import json
+import shutil
+import tempfile
+from pathlib import Path
+
+from common import REPO_ROOT, timed
+from src.data_processing.wapor_catalog import PRODUCT_FOLDERS, WaPORCatalog
+from src.data_processing.wapor_processor import WaPORProcessor
+
+
+def make_raw_tree(target, copies):
+    """Copy data/raw into target, repeating every product folder's files `copies` times"""
+    n_files = 0
+    for folder in PRODUCT_FOLDERS:
+        source = REPO_ROOT / 'data' / 'raw' / folder
+        destination = target / folder
+        destination.mkdir(parents=True)
+        for file_path in source.glob('*.json'):
+            for copy in range(copies):
+                # Catalog entries are keyed by path, so every copy is indexed separately
+                name = file_path.name if copy == 0 else f"COPY{copy}-{file_path.name}"
+                shutil.copyfile(file_path, destination / name)
+                n_files += 1
+    return n_files
+
+
+def load_sequential(data_dir):
+    layers = []
+    for file_path in sorted(Path(data_dir).glob('**/*.json')):
+        with open(file_path, 'r') as f:
+            layers.append(json.load(f))
+    return layers
+
+
+def load_catalog(data_dir, index_path):
+    catalog = WaPORCatalog(data_dir, index_path)
+    catalog.refresh()
+    return list(WaPORProcessor(data_dir, catalog=catalog).iter_layers())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--copies', type=int, nargs='+', default=[1, 10])
+    args = parser.parse_args()
+
+    for copies in args.copies:
+        with tempfile.TemporaryDirectory() as tmp:
+            data_dir = Path(tmp) / 'raw'
+            index_path = Path(tmp) / 'wapor_catalog.json'
+            n_files = make_raw_tree(data_dir, copies)
+            print(f"{n_files:,} layer files")
+
+            cold_time, layers = timed(load_catalog, data_dir, index_path)
+            print(f"  catalog (cold): {cold_time:8.3f}s  ({len(layers):,} layers)")
+            warm_time, _ = timed(load_catalog, data_dir, index_path, repeat=3)
+            print(f"  catalog (warm): {warm_time:8.3f}s")
+            seq_time, _ = timed(load_sequential, data_dir, repeat=3)
+            print(f"  sequential:     {seq_time:8.3f}s")
+
+
+if __name__ == '__main__':
+    main()
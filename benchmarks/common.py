@@ -0,0 +1,63 @@
+"""Shared helpers for the benchmark scripts"""
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Make the repository root importable when scripts are run directly
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+FLEET_COUNTRIES = {
+    'Uganda': ('UGA', 'Tropical', 1100),
+    'Kenya': ('KEN', 'Arid/Semi-arid', 1795),
+    'Tanzania': ('TAN', 'Tropical', 1018),
+    'Rwanda': ('RWA', 'Temperate', 1598),
+    'Burundi': ('BUR', 'Tropical Highland', 1504),
+    'Ethiopia': ('ETH', 'Highland/Arid', 1330),
+    'Sudan': ('SUD', 'Arid', 568),
+    'South Sudan': ('SOU', 'Tropical', 400),
+    'DRC': ('DRC', 'Tropical', 726),
+    'Egypt': ('EGY', 'Arid', 321)
+}
+
+
+def make_fleet(n_stations, seed=0, frequency=None):
+    """Build a stations DataFrame with the app's schema for a given fleet size"""
+    rng = np.random.default_rng(seed)
+    countries = list(FLEET_COUNTRIES)
+    country = rng.choice(countries, n_stations)
+    codes = [FLEET_COUNTRIES[c][0] for c in country]
+    now = datetime.now()
+
+    return pd.DataFrame({
+        'station_id': [f"NBI-{code}-{i + 1:05d}" for i, code in enumerate(codes)],
+        'name': [f"Bench Station {i + 1}" for i in range(n_stations)],
+        'country': country,
+        'latitude': rng.uniform(-5, 30, n_stations),
+        'longitude': rng.uniform(22, 40, n_stations),
+        'elevation': [FLEET_COUNTRIES[c][2] + rng.uniform(-200, 200) for c in country],
+        'type': rng.choice(['Lake Level', 'River Flow', 'Reservoir', 'Groundwater'], n_stations),
+        'status': rng.choice(['Active', 'Maintenance', 'Offline', 'Calibration'], n_stations,
+                             p=[0.82, 0.12, 0.04, 0.02]),
+        'installation_date': [now - timedelta(days=int(d)) for d in rng.integers(365, 3650, n_stations)],
+        'transmission_method': rng.choice(['GPRS', 'Satellite', 'Both'], n_stations, p=[0.3, 0.4, 0.3]),
+        'data_frequency': frequency or rng.choice(['Hourly', '6-hourly', 'Daily'], n_stations),
+        'climate_zone': [FLEET_COUNTRIES[c][1] for c in country],
+        'major_feature': rng.choice(['Lake Victoria', 'Blue Nile', 'White Nile', 'Main Nile'], n_stations)
+    })
+
+
+def timed(func, *args, repeat=1, **kwargs):
+    """Run func and return (best wall time in seconds, last result)"""
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        best = min(best, time.perf_counter() - start)
+    return best, result
@@ -0,0 +1,272 @@
+"""Benchmark the app's heavy entry points over fleet sizes and history lengths, against a baseline
+
+Every case runs in a fresh process without Streamlit: the data it needs is
+built first (not timed), then the entry point is timed (best of --repeat)
+and run once more under tracemalloc for its peak allocation. Results go to
+a JSON file and are compared with the stored baseline; a case regresses
+when it is slower or larger than the baseline by more than the tolerance
+and the noise floor. The exit status is 1 when anything regressed.
+
+Usage:
+    python benchmarks/suite.py                                  # full matrix, compare with baseline
+    python benchmarks/suite.py --stations 100 1000 --days 7     # quick run
+    python benchmarks/suite.py --cases map_rendering alert_evaluation
+    python benchmarks/suite.py --save-baseline                  # accept the current numbers
+"""
+import argparse
+import json
+import multiprocessing
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+import warnings
+from datetime import datetime, timedelta
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Unix only; peak RSS is then not reported
+    resource = None
+
+from common import REPO_ROOT, make_fleet
+from src.alerts.alert_engine import evaluate_alerts
+from src.alerts.incremental import IncrementalAlertEvaluator
+from src.data_processing.latest_readings import LatestReadingIndex
+from src.data_processing.measurement_generator import MeasurementGenerator
+from src.data_processing.rollups import ROLLUP_PARAMETERS, MeasurementRollups
+from src.visualization.map_creator import create_professional_nile_map
+
+BENCHMARK_DIR = Path(__file__).resolve().parent
+
+DEFAULT_BASELINE = BENCHMARK_DIR / 'baseline.json'
+
+DEFAULT_OUTPUT = BENCHMARK_DIR / 'results' / 'latest.json'
+
+# Relative slack over the baseline, and absolute floors below which differences are noise
+TIME_TOLERANCE = 0.25
+MEMORY_TOLERANCE = 0.20
+TIME_FLOOR_SECONDS = 0.05
+MEMORY_FLOOR_MB = 5
+
+
+def _measurements(stations_df, days, seed):
+    return MeasurementGenerator(days=days, seed=seed).generate(stations_df, end_time=datetime.now())
+
+
+def _setup_none(stations_df, days, seed):
+    return {}
+
+
+def _setup_latest(stations_df, days, seed):
+    return {'latest': LatestReadingIndex(_measurements(stations_df, days, seed))}
+
+
+def _setup_measurements(stations_df, days, seed):
+    return {'measurements': _measurements(stations_df, days, seed)}
+
+
+def _setup_rollups(stations_df, days, seed):
+    return {'rollups': MeasurementRollups(_measurements(stations_df, days, seed))}
+
+
+def measurement_generation(stations_df, days, seed, data):
+    """generate_enhanced_measurement_data: the fleet's synthetic history"""
+    return len(MeasurementGenerator(days=days, seed=seed).generate(stations_df))
+
+
+def alert_evaluation(stations_df, days, seed, data):
+    """evaluate_alerts: rule table over the latest reading of every station, from the index"""
+    return len(evaluate_alerts(data['latest'].to_frame(), stations_df).to_dict('records'))
+
+
+def incremental_alerts(stations_df, days, seed, data):
+    """Alert evaluator of the dashboard: the whole history folded in, then the open alerts"""
+    evaluator = IncrementalAlertEvaluator(stations_df)
+    evaluator.update(data['measurements'])
+    return len(evaluator.active_alerts())
+
+
+def map_rendering(stations_df, days, seed, data):
+    """create_professional_nile_map rendered to the HTML served to the browser"""
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', UserWarning)  # Tile provider API key notice
+        return len(create_professional_nile_map(stations_df, latest_readings=data['latest']).get_root().render())
+
+
+def trend_rollup_build(stations_df, days, seed, data):
+    """Rollup cubes behind Trend Analysis, built from the raw readings"""
+    return len(MeasurementRollups(data['measurements']).tables['hour'])
+
+
+def trend_queries(stations_df, days, seed, data):
+    """Every Trend Analysis view, for each parameter, over the last 7 days and the full history"""
+    rollups = data['rollups']
+    for cutoff, grain in ((datetime.now() - timedelta(days=7), 'hour'), (None, 'day')):
+        for parameter in ROLLUP_PARAMETERS:
+            rollups.summarize(parameter, 'country', stations_df, cutoff, grain)
+            rollups.summarize(parameter, 'climate_zone', stations_df, cutoff, grain)
+            rollups.bucket_means(parameter, 'country', stations_df, cutoff)
+            rollups.profile(parameter, 'hour', cutoff)
+            rollups.profile(parameter, 'month', cutoff)
+        rollups.daily('data_quality', 'country', stations_df, cutoff)
+        rollups.transmission('transmission_method', stations_df, cutoff, grain)
+        rollups.transmission('country', stations_df, cutoff, grain)
+    return len(ROLLUP_PARAMETERS)
+
+
+# Case -> (setup building the untimed inputs, timed entry point)
+CASES = {
+    'measurement_generation': (_setup_none, measurement_generation),
+    'alert_evaluation': (_setup_latest, alert_evaluation),
+    'incremental_alerts': (_setup_measurements, incremental_alerts),
+    'map_rendering': (_setup_latest, map_rendering),
+    'trend_rollup_build': (_setup_measurements, trend_rollup_build),
+    'trend_queries': (_setup_rollups, trend_queries)
+}
+
+
+def run_case(case, n_stations, days, seed, repeat):
+    """Child process: set up, time and measure one case"""
+    setup, entry_point = CASES[case]
+    stations_df = make_fleet(n_stations, seed=seed)
+    data = setup(stations_df, days, seed)
+
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        entry_point(stations_df, days, seed, data)
+        best = min(best, time.perf_counter() - started)
+
+    tracemalloc.start()
+    entry_point(stations_df, days, seed, data)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    rss = peak_rss()
+
+    return {
+        'case': case,
+        'stations': n_stations,
+        'days': days,
+        'seconds': round(best, 4),
+        'peak_alloc_mb': round(peak / 1e6, 1),
+        'peak_rss_mb': None if rss is None else round(rss / 1e6, 1)
+    }
+
+
+def peak_rss():
+    """Peak resident memory of this process in bytes, or None where it cannot be read"""
+    try:
+        # ru_maxrss survives exec, so a spawned child would report its parent's peak
+        with open('/proc/self/status') as status:
+            for line in status:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    if resource is None:
+        return None
+    # Kilobytes on Linux, bytes on macOS
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * (1 if sys.platform == 'darwin' else 1024)
+
+
+def compare(results, baseline, time_tolerance, memory_tolerance):
+    """Annotate results with their baseline ratios; returns the regressed ones"""
+    reference = {(entry['case'], entry['stations'], entry['days']): entry for entry in baseline['results']}
+    regressions = []
+    for result in results:
+        base = reference.get((result['case'], result['stations'], result['days']))
+        if base is None:
+            continue
+        result['time_ratio'] = round(result['seconds'] / max(base['seconds'], 1e-9), 2)
+        result['memory_ratio'] = round(result['peak_alloc_mb'] / max(base['peak_alloc_mb'], 1e-9), 2)
+        slower = (result['seconds'] > base['seconds'] * (1 + time_tolerance)
+                  and result['seconds'] - base['seconds'] > TIME_FLOOR_SECONDS)
+        larger = (result['peak_alloc_mb'] > base['peak_alloc_mb'] * (1 + memory_tolerance)
+                  and result['peak_alloc_mb'] - base['peak_alloc_mb'] > MEMORY_FLOOR_MB)
+        result['regressed'] = [name for name, flag in (('time', slower), ('memory', larger)) if flag]
+        if result['regressed']:
+            regressions.append(result)
+    return regressions
+
+
+def environment():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_ROOT,
+                                capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit = ''
+    return {
+        'date': datetime.now().isoformat(timespec='seconds'),
+        'commit': commit,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': multiprocessing.cpu_count()
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--cases', nargs='+', choices=list(CASES), default=list(CASES))
+    parser.add_argument('--stations', type=int, nargs='+', default=[100, 1000, 10000])
+    parser.add_argument('--days', type=int, nargs='+', default=[7, 30], help="History lengths")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--baseline', type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument('--output', type=Path, default=DEFAULT_OUTPUT)
+    parser.add_argument('--time-tolerance', type=float, default=TIME_TOLERANCE)
+    parser.add_argument('--memory-tolerance', type=float, default=MEMORY_TOLERANCE)
+    parser.add_argument('--save-baseline', action='store_true', help="Store these results as the new baseline")
+    args = parser.parse_args()
+
+    baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() else None
+    results = []
+    context = multiprocessing.get_context('spawn')
+    print(f"{'case':<24}{'stations':>9}{'days':>6}{'seconds':>10}{'alloc MB':>10}{'RSS MB':>9}{'vs base':>9}")
+    for n_stations in args.stations:
+        for days in args.days:
+            for case in args.cases:
+                # A fresh process per case: no warm caches or memory left over from the previous one
+                with context.Pool(1) as pool:
+                    result = pool.apply(run_case, (case, n_stations, days, args.seed, args.repeat))
+                if baseline is not None:
+                    compare([result], baseline, args.time_tolerance, args.memory_tolerance)
+                results.append(result)
+                flag = ' <- ' + '/'.join(result['regressed']) if result.get('regressed') else ''
+                ratio = f"x{result['time_ratio']:.2f}" if 'time_ratio' in result else '-'
+                rss = '-' if result['peak_rss_mb'] is None else f"{result['peak_rss_mb']:.1f}"
+                print(f"{case:<24}{n_stations:>9}{days:>6}{result['seconds']:>10.3f}"
+                      f"{result['peak_alloc_mb']:>10.1f}{rss:>9}{ratio:>9}{flag}")
+
+    report = {'environment': environment(), 'results': results}
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(report, indent=2))
+    print(f"Results written to {args.output}")
+
+    if args.save_baseline:
+        # Cases not run this time keep their previous baseline entries
+        kept = [entry for entry in (baseline or {'results': []})['results']
+                if (entry['case'], entry['stations'], entry['days'])
+                not in {(result['case'], result['stations'], result['days']) for result in results}]
+        stored = {'environment': report['environment'],
+                  'results': kept + [{key: result[key] for key in
+                                      ('case', 'stations', 'days', 'seconds', 'peak_alloc_mb', 'peak_rss_mb')}
+                                     for result in results]}
+        args.baseline.write_text(json.dumps(stored, indent=2))
+        print(f"Baseline saved to {args.baseline}")
+        return
+
+    if baseline is None:
+        print(f"No baseline at {args.baseline}; run with --save-baseline to store one")
+        return
+    regressions = [result for result in results if result.get('regressed')]
+    if regressions:
+        print(f"{len(regressions)} regression(s) beyond {args.time_tolerance:.0%} time / "
+              f"{args.memory_tolerance:.0%} memory tolerance")
+        sys.exit(1)
+    print("No regressions against the baseline")
+
+
+if __name__ == '__main__':
+    main()
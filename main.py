@@ -4,13 +4,73 @@ import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
-import folium
-from streamlit_folium import st_folium
+import streamlit.components.v1 as components
+from streamlit.runtime.media_file_manager import MediaFileManager
 from datetime import datetime, timedelta
-import random
 import json
+import itertools
+import os
+import tempfile
 from pathlib import Path
 
+from src.data_processing.measurement_generator import MeasurementGenerator
+from src.data_processing.measurement_store import MeasurementStore
+from src.data_processing.latest_readings import LatestReadingIndex
+from src.data_processing.rollups import MeasurementRollups
+from src.data_processing.station_index import StationIndexedMeasurements
+from src.data_processing.dataset_service import DatasetService
+from src.data_processing.artifact_graph import ArtifactGraph
+from src.data_processing.compact_schema import compact_measurements, compact_stations
+from src.data_processing.fleet_generator import MEASUREMENTS_DIR, generate_stations, load_fleet
+from src.alerts.alert_engine import AlertRuleTable
+from src.visualization.map_creator import create_professional_nile_map
+from src.visualization.map_cache import MapArtifactCache
+from src.visualization.downsampling import SeriesCache, scatter_trace
+from src.alerts.incremental import IncrementalAlertEvaluator
+from src.data_processing.wapor_catalog import PRODUCT_FOLDERS, WaPORCatalog
+from src.data_processing.wapor_processor import WaPORProcessor
+from src.data_processing.zonal_stats import ZonalStatsEngine
+from src.reporting.export_pipeline import COMPRESSIONS, EXPORT_FORMATS, write_export
+from src.reporting.report_engine import REPORT_FORMATS, REPORT_KINDS, ReportEngine
+from src.reporting.report_statistics import covered_period, system_uptime
+from src.reporting.scheduler import (
+    FREQUENCIES, OutboxMailer, ReportScheduler, ScheduleStore, SmtpMailer, parse_recipients
+)
+from src.data_processing.rollups import TRANSMISSION_OK_QUALITY
+from src.monitoring.perf import DISABLED, PerfRecorder, process_memory
+
+# A fleet written by src.data_processing.fleet_generator, loaded instead of the generated demo network
+FLEET_DIR = os.environ.get("NBI_FLEET_DIR")
+FLEET_SNAPSHOT_DAYS = 30  # Readings of a loaded fleet kept in memory; reports read the full history from its store
+# The generated demo network gets a store of its own: it is replaced on every start, whereas
+# data/processed/measurements keeps backfilled archives and ingested telemetry
+DEMO_STORE_DIR = Path("data/processed/demo_measurements")
+MEASUREMENT_STORE_DIR = Path(FLEET_DIR) / MEASUREMENTS_DIR if FLEET_DIR else DEMO_STORE_DIR
+# Seed of the generated demo network, so every process generates (and stores) the same readings
+DATA_SEED = int(os.environ.get("NBI_DATA_SEED", "42"))
+DATASET_MEMORY_BUDGET = 1024 * 1024 * 1024  # Snapshots kept in memory across versions
+# Categoricals, float32 readings and uint8 percentages: about a third of the memory per reading
+COMPACT_SCHEMA = os.environ.get("NBI_COMPACT_SCHEMA") == "1"
+EXPORT_DIR = Path(tempfile.gettempdir()) / "nbi_exports"
+EXPORT_CHUNK_ROWS = 100_000  # Readings encoded per step when writing an export file
+REPORT_ASSET_DIR = Path(tempfile.gettempdir()) / "nbi_report_assets"
+REPORT_WORKERS = 2
+REPORT_POLL_SECONDS = 2
+SCHEDULE_DB_PATH = Path("data/processed/report_schedules.sqlite")
+REPORT_OUTBOX_DIR = Path("data/processed/outbox")  # Scheduled reports land here unless an SMTP relay is set
+SMTP_HOST = os.environ.get("NBI_SMTP_HOST")
+SMTP_PORT = int(os.environ.get("NBI_SMTP_PORT", "25"))
+# Scheduled reports render one at a time at low priority, so a batch of them leaves the dashboard responsive
+SCHEDULED_REPORT_WORKERS = 1
+SCHEDULED_REPORT_NICENESS = 10
+SCHEDULED_REPORT_CONCURRENCY = 2
+SCHEDULER_POLL_SECONDS = 30
+# Per-stage rerun timings and the Performance page; when off no timing code runs
+PERF_INSTRUMENTATION = os.environ.get("NBI_PERF_INSTRUMENTATION") == "1"
+PERFORMANCE_PAGE = "⏱️ Performance"
+# Newer Streamlit reads a download button's data from a callable only when it is clicked
+DEFERRED_DOWNLOADS = hasattr(MediaFileManager, "add_deferred")
+
 # Page configuration - Enhanced with professional branding
 st.set_page_config(
     page_title="NBI Water Resources Management System",
@@ -112,34 +172,77 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+@st.cache_resource
+def get_perf_recorder():
+    """Rerun timings and cache counters shared by all sessions (a no-op stand-in when disabled)"""
+    return PerfRecorder() if PERF_INSTRUMENTATION else DISABLED
+
+# WaPOR layer catalog, refreshed from its saved index once per process
+@st.cache_resource
+def get_wapor_catalog():
+    """Index of every WaPOR layer file under data/raw"""
+    catalog = WaPORCatalog("data/raw")
+    catalog.refresh()
+    return catalog
+
+@st.cache_resource
+def get_wapor_processor():
+    """WaPOR loader sharing the catalog and the local raster store"""
+    return WaPORProcessor("data/raw", catalog=get_wapor_catalog())
+
+@st.cache_resource
+def get_zonal_stats_engine():
+    """Per-country zonal statistics with label grids and layer summaries cached per process"""
+    return ZonalStatsEngine()
+
+def summarize_wapor_et_by_country():
+    """Per-country ET of the monthly AETI rasters, or None when no rasters are available locally"""
+    processor = get_wapor_processor()
+    if not processor.rasters.codes():
+        return None
+    summary = get_zonal_stats_engine().summarize_layers(processor, processor.iter_layers(families=['AETI']))
+    if summary.empty:
+        return None
+    
+    summary['year'] = summary['start'].dt.year
+    yearly = summary.groupby(['country', 'year'])['mean'].mean().unstack()
+    # Relative change per year of the yearly means, classified like the sample data
+    trend = yearly.apply(
+        lambda row: np.polyfit(row.dropna().index, row.dropna().values, 1)[0] / row.mean() * 100
+        if row.notna().sum() > 1 else 0.0,
+        axis=1
+    )
+    by_country = summary.groupby('country').agg(
+        Avg_ET_mm_month=('mean', 'mean'),
+        Data_Quality=('coverage_pct', 'mean')
+    )
+    by_country['Annual_Trend'] = np.select([trend > 2, trend < -2], ['Increasing', 'Decreasing'], 'Stable')
+    return by_country.round(1).reset_index().rename(columns={'country': 'Country'})
+
 # Load your real WaPOR data (integration with actual datasets)
-@st.cache_data
+@get_perf_recorder().track_cache(st.cache_data)
 def load_wapor_data():
     """Load actual WaPOR data from your uploaded datasets"""
     try:
         # Check if data directory exists
         data_dir = Path("data/raw")
         if data_dir.exists():
-            # Load actual evapotranspiration data
-            et_files = list(data_dir.glob("**/WAPOR*AETI*.json"))[:5]  # Sample first 5 files
+            catalog = get_wapor_catalog()
+            et_files = catalog.find(mapset='L2-AETI-M')
+            et_years = catalog.years('L2-AETI-M')
             
             wapor_summary = {
-                'datasets_available': len(et_files),
-                'data_types': [
-                    'Actual Evapotranspiration (Monthly)',
-                    'Quality Land Surface Temperature (Dekadal)', 
-                    'Evaporation (Annual)',
-                    'Land Cover Classification (Annual)',
-                    'FAO WaPOR 2014-2018'
-                ],
+                'datasets_available': len(catalog),
+                'data_types': list(PRODUCT_FOLDERS.values()),
+                'product_files': [len(catalog.find(product=folder)) for folder in PRODUCT_FOLDERS],
                 'spatial_resolution': '100m',
-                'temporal_coverage': '2014-2018',
+                'temporal_coverage': f"{et_years[0]}-{et_years[-1]}" if et_years else 'N/A',
                 'countries_covered': 10
             }
             
             # Try to load a sample file for demonstration
             if et_files:
-                sample_file = et_files[0]
+                sample_file = catalog.path(et_files[0])
                 try:
                     with open(sample_file, 'r') as f:
                         sample_data = json.load(f)
@@ -156,457 +259,234 @@ def load_wapor_data():
         return None
 
 # Enhanced station data generation with more realistic parameters
-@st.cache_data
 def generate_enhanced_station_data():
     """Generate comprehensive monitoring station data for NBI countries"""
-    countries_data = {
-        'Uganda': {
-            'center': [1.3733, 32.2903], 
-            'stations': 8,
-            'major_features': ['Lake Victoria', 'Victoria Nile', 'Lake Kyoga'],
-            'avg_elevation': 1100,
-            'climate': 'Tropical'
-        },
-        'Kenya': {
-            'center': [0.0236, 37.9062], 
-            'stations': 6,
-            'major_features': ['Lake Victoria (Kenyan part)', 'Ewaso Ng\'iro'],
-            'avg_elevation': 1795,
-            'climate': 'Arid/Semi-arid'
-        },
-        'Tanzania': {
-            'center': [-6.3690, 34.8888], 
-            'stations': 7,
-            'major_features': ['Lake Victoria', 'Kagera River', 'Mara River'],
-            'avg_elevation': 1018,
-            'climate': 'Tropical'
-        },
-        'Rwanda': {
-            'center': [-1.9403, 29.8739], 
-            'stations': 4,
-            'major_features': ['Nyabarongo River', 'Akagera River'],
-            'avg_elevation': 1598,
-            'climate': 'Temperate'
-        },
-        'Burundi': {
-            'center': [-3.3731, 29.9189], 
-            'stations': 3,
-            'major_features': ['Ruvubu River', 'Ruvyironza River'],
-            'avg_elevation': 1504,
-            'climate': 'Tropical Highland'
-        },
-        'Ethiopia': {
-            'center': [9.1450, 40.4897], 
-            'stations': 12,
-            'major_features': ['Blue Nile', 'Lake Tana', 'Atbara River'],
-            'avg_elevation': 1330,
-            'climate': 'Highland/Arid'
-        },
-        'Sudan': {
-            'center': [12.8628, 30.2176], 
-            'stations': 8,
-            'major_features': ['Main Nile', 'Blue Nile', 'White Nile Confluence'],
-            'avg_elevation': 568,
-            'climate': 'Arid'
-        },
-        'South Sudan': {
-            'center': [6.8770, 31.3070], 
-            'stations': 5,
-            'major_features': ['White Nile', 'Bahr el Ghazal', 'Sobat River'],
-            'avg_elevation': 400,
-            'climate': 'Tropical'
-        },
-        'DRC': {
-            'center': [-4.0383, 21.7587], 
-            'stations': 4,
-            'major_features': ['Lake Albert tributaries'],
-            'avg_elevation': 726,
-            'climate': 'Tropical'
-        },
-        'Egypt': {
-            'center': [26.0975, 31.2357], 
-            'stations': 3,
-            'major_features': ['Main Nile', 'Lake Nasser', 'Nile Delta'],
-            'avg_elevation': 321,
-            'climate': 'Arid'
-        }
-    }
-    
-    stations = []
-    station_id = 1
-    
-    for country, info in countries_data.items():
-        for i in range(info['stations']):
-            # More sophisticated coordinate variation
-            lat_var = random.uniform(-0.8, 0.8)
-            lon_var = random.uniform(-0.8, 0.8)
-            
-            # Determine station type based on major features
-            if 'Lake' in str(info['major_features']):
-                station_types = ['Lake Level', 'River Flow', 'Reservoir']
-                weights = [0.4, 0.4, 0.2]
-            else:
-                station_types = ['River Flow', 'Groundwater', 'Reservoir']
-                weights = [0.6, 0.2, 0.2]
-            
-            station_type = random.choices(station_types, weights=weights)[0]
-            
-            # More realistic status distribution
-            status_weights = {
-                'Active': 0.82,
-                'Maintenance': 0.12,
-                'Offline': 0.04,
-                'Calibration': 0.02
-            }
-            
-            station = {
-                'station_id': f"NBI-{country[:3].upper()}-{station_id:03d}",
-                'name': f"{random.choice(info['major_features']).split()[0]} Station {i+1}",
-                'country': country,
-                'latitude': info['center'][0] + lat_var,
-                'longitude': info['center'][1] + lon_var,
-                'elevation': info['avg_elevation'] + random.uniform(-200, 200),
-                'type': station_type,
-                'status': random.choices(list(status_weights.keys()), 
-                                       weights=list(status_weights.values()))[0],
-                'installation_date': datetime.now() - timedelta(days=random.randint(365, 3650)),
-                'transmission_method': random.choices(['GPRS', 'Satellite', 'Both'], weights=[0.3, 0.4, 0.3])[0],
-                'data_frequency': random.choice(['Hourly', '6-hourly', 'Daily']),
-                'climate_zone': info['climate'],
-                'major_feature': random.choice(info['major_features'])
-            }
-            stations.append(station)
-            station_id += 1
-    
-    return pd.DataFrame(stations)
+    return generate_stations(seed=DATA_SEED)
 
 # Enhanced measurement data with better algorithms
-@st.cache_data
 def generate_enhanced_measurement_data(stations_df):
     """Generate sophisticated measurement data with realistic patterns"""
-    measurements = []
-    
-    for _, station in stations_df.iterrows():
-        # Generate 30 days of data based on frequency
-        base_time = datetime.now() - timedelta(days=30)
-        
-        if station['data_frequency'] == 'Hourly':
-            time_points = 30 * 24
-            time_delta = timedelta(hours=1)
-        elif station['data_frequency'] == '6-hourly':
-            time_points = 30 * 4
-            time_delta = timedelta(hours=6)
-        else:  # Daily
-            time_points = 30
-            time_delta = timedelta(days=1)
-        
-        for point in range(time_points):
-            timestamp = base_time + (time_delta * point)
-            
-            # Enhanced seasonal and daily patterns
-            day_of_year = timestamp.timetuple().tm_yday
-            hour_of_day = timestamp.hour
-            
-            # Seasonal factor (more realistic)
-            if station['country'] in ['Ethiopia', 'Sudan', 'Egypt']:  # Northern countries
-                seasonal_factor = 1 + 0.4 * np.cos(2 * np.pi * (day_of_year - 60) / 365)  # Peak in Dec-Jan
-            else:  # Southern/Equatorial countries
-                seasonal_factor = 1 + 0.3 * np.sin(2 * np.pi * (day_of_year - 80) / 365)  # Peak in Apr-May
-            
-            # Daily pattern
-            daily_factor = 1 + 0.1 * np.sin(2 * np.pi * hour_of_day / 24)
-            
-            # Base values based on station characteristics
-            if station['type'] == 'Lake Level':
-                base_level = 1175 + (station['elevation'] - 1100) * 0.1
-                base_flow = random.uniform(50, 300)
-                level_stability = 0.95  # Lakes are more stable
-            elif station['type'] == 'River Flow':
-                base_level = 300 + station['elevation'] * 0.3
-                base_flow = random.uniform(100, 2000)
-                level_stability = 0.85  # Rivers more variable
-            else:  # Reservoir/Groundwater
-                base_level = 400 + station['elevation'] * 0.2
-                base_flow = random.uniform(80, 600)
-                level_stability = 0.9
-            
-            # Climate influence
-            climate_multiplier = {
-                'Tropical': 1.2,
-                'Arid': 0.7,
-                'Semi-arid': 0.8,
-                'Temperate': 1.0,
-                'Highland': 1.1,
-                'Tropical Highland': 1.15
-            }.get(station['climate_zone'], 1.0)
-            
-            # Add noise and variations
-            level_noise = random.normalvariate(0, base_level * 0.02)
-            flow_noise = random.normalvariate(0, base_flow * 0.05)
-            
-            # Final calculations
-            water_level = (base_level * seasonal_factor * daily_factor * climate_multiplier + 
-                          level_noise) * level_stability
-            
-            flow_rate = (base_flow * seasonal_factor * daily_factor * climate_multiplier + 
-                        flow_noise) * (2 - level_stability)  # Inverse relationship
-            
-            # Temperature based on climate and elevation
-            base_temp = {
-                'Tropical': 26,
-                'Arid': 28,
-                'Semi-arid': 24,
-                'Temperate': 18,
-                'Highland': 15,
-                'Tropical Highland': 20
-            }.get(station['climate_zone'], 22)
-            
-            # Elevation effect: -6.5°C per 1000m
-            temp_elevation_effect = -(station['elevation'] / 1000) * 6.5
-            temp_seasonal = 5 * np.sin(2 * np.pi * day_of_year / 365)
-            temp_daily = 8 * np.sin(2 * np.pi * (hour_of_day - 6) / 24)
-            
-            temperature = (base_temp + temp_elevation_effect + temp_seasonal + 
-                          temp_daily + random.normalvariate(0, 1.5))
-            
-            # Data quality based on transmission method and status
-            if station['status'] == 'Active':
-                if station['transmission_method'] == 'Both':
-                    base_quality = random.uniform(95, 99)
-                elif station['transmission_method'] == 'Satellite':
-                    base_quality = random.uniform(90, 97)
-                else:  # GPRS
-                    base_quality = random.uniform(85, 95)
-            elif station['status'] == 'Maintenance':
-                base_quality = random.uniform(70, 85)
-            elif station['status'] == 'Calibration':
-                base_quality = random.uniform(60, 80)
-            else:  # Offline
-                base_quality = random.uniform(0, 30)
-            
-            measurement = {
-                'station_id': station['station_id'],
-                'timestamp': timestamp,
-                'water_level': max(0, water_level),  # Ensure non-negative
-                'flow_rate': max(0, flow_rate),
-                'temperature': temperature,
-                'data_quality': base_quality,
-                'transmission_status': station['transmission_method'],
-                'battery_level': random.uniform(60, 100) if station['status'] != 'Offline' else 0
-            }
-            measurements.append(measurement)
-    
-    return pd.DataFrame(measurements)
+    return MeasurementGenerator(days=30, seed=DATA_SEED).generate(stations_df)
 
-# Enhanced mapping function
-def create_professional_nile_map(stations_df, measurements_df=None):
-    """Create a professional interactive map with enhanced features"""
-    # Initialize map with better styling
-    m = folium.Map(
-        location=[15, 30],
-        zoom_start=4,
-        tiles=None  # We'll add custom tiles
-    )
-    
-    # Add multiple tile layers for better visualization
-    folium.TileLayer('OpenStreetMap', name='Street Map').add_to(m)
-    folium.TileLayer('CartoDB positron', name='Light Map').add_to(m)
-    folium.TileLayer('CartoDB dark_matter', name='Dark Map').add_to(m)
-    
-    # Add satellite imagery
-    folium.TileLayer(
-        tiles='https://server.arcgisonline.com/ArcGIS/rest/services/World_Imagery/MapServer/tile/{z}/{y}/{x}',
-        attr='Esri',
-        name='Satellite',
-        overlay=False,
-        control=True
-    ).add_to(m)
-    
-    # Color mapping for enhanced status visualization
-    status_colors = {
-        'Active': '#4CAF50',
-        'Maintenance': '#FF9800', 
-        'Offline': '#F44336',
-        'Calibration': '#2196F3'
+@st.cache_resource
+def get_measurement_store():
+    """Parquet measurement store of this process"""
+    return MeasurementStore(MEASUREMENT_STORE_DIR)
+
+# One copy of the data per process: every session reads the same versioned snapshots
+@st.cache_resource
+def get_dataset_service():
+    """Dataset service holding the station and measurement snapshots"""
+    service = DatasetService(memory_budget_bytes=DATASET_MEMORY_BUDGET)
+    if FLEET_DIR:
+        # Already persisted in the fleet's own store
+        _, stations_df, measurements_df = load_fleet(FLEET_DIR, days=FLEET_SNAPSHOT_DAYS)
+    else:
+        stations_df = generate_enhanced_station_data()
+        measurements_df = generate_enhanced_measurement_data(stations_df)
+        # Persisted once at load, whichever pages are opened later; days of earlier runs are
+        # dropped, which only ever touches the demo store
+        get_measurement_store().replace(measurements_df, stations_df)
+    if COMPACT_SCHEMA:
+        stations_df = compact_stations(stations_df)
+        measurements_df = compact_measurements(measurements_df, station_ids=stations_df['station_id'])
+    service.publish(stations_df, measurements_df)
+    return service
+
+# Structures derived from a dataset version, built on first use by a page that needs them
+ARTIFACTS = ArtifactGraph()
+
+@ARTIFACTS.artifact('summary')
+def build_summary(snapshot):
+    """Network-wide figures for the sidebar and the overview KPIs"""
+    stations_df = snapshot.stations
+    measurements_df = snapshot.measurements
+    return {
+        'total_stations': len(stations_df),
+        'active_stations': int((stations_df['status'] == 'Active').sum()),
+        'avg_quality': measurements_df['data_quality'].mean(),
+        'avg_battery': measurements_df['battery_level'].mean(),
+        'transmission_success': (measurements_df['data_quality'] > 80).mean() * 100,
+        'first_reading': measurements_df['timestamp'].min(),
+        'last_update': measurements_df['timestamp'].max(),
+        'data_points': len(measurements_df)
     }
-    
-    # Create marker clusters for better performance
-    from folium.plugins import MarkerCluster
-    marker_cluster = MarkerCluster(name='Monitoring Stations').add_to(m)
-    
-    # Add stations with enhanced popups
-    for _, station in stations_df.iterrows():
-        color = status_colors.get(station['status'], '#9E9E9E')
-        
-        # Get latest measurement if available
-        latest_data = ""
-        if measurements_df is not None:
-            station_measurements = measurements_df[measurements_df['station_id'] == station['station_id']]
-            if not station_measurements.empty:
-                latest = station_measurements.iloc[-1]
-                latest_data = f"""
-                <br><b>Latest Readings:</b><br>
-                Water Level: {latest['water_level']:.2f}m<br>
-                Flow Rate: {latest['flow_rate']:.1f} m³/s<br>
-                Temperature: {latest['temperature']:.1f}°C<br>
-                Data Quality: {latest['data_quality']:.1f}%<br>
-                Battery: {latest['battery_level']:.0f}%
-                """
-        
-        popup_content = f"""
-        <div style="font-family: Arial; width: 300px;">
-            <h4 style="color: {color}; margin-bottom: 10px;">
-                🌊 {station['name']}
-            </h4>
-            <table style="width: 100%; font-size: 12px;">
-                <tr><td><b>Country:</b></td><td>{station['country']}</td></tr>
-                <tr><td><b>Type:</b></td><td>{station['type']}</td></tr>
-                <tr><td><b>Status:</b></td><td><span style="color: {color};">{station['status']}</span></td></tr>
-                <tr><td><b>Elevation:</b></td><td>{station['elevation']:.0f}m</td></tr>
-                <tr><td><b>Climate:</b></td><td>{station['climate_zone']}</td></tr>
-                <tr><td><b>Transmission:</b></td><td>{station['transmission_method']}</td></tr>
-                <tr><td><b>Feature:</b></td><td>{station['major_feature']}</td></tr>
-                <tr><td><b>Installed:</b></td><td>{station['installation_date'].strftime('%Y-%m-%d')}</td></tr>
-            </table>
-            {latest_data}
-        </div>
-        """
-        
-        # Enhanced marker with custom icon
-        icon = folium.Icon(
-            color='white',
-            icon_color=color,
-            icon='tint',
-            prefix='fa'
-        )
-        
-        folium.Marker(
-            location=[station['latitude'], station['longitude']],
-            popup=folium.Popup(popup_content, max_width=350),
-            tooltip=f"{station['name']} ({station['status']})",
-            icon=icon
-        ).add_to(marker_cluster)
-    
-    # Add enhanced legend
-    legend_html = f'''
-    <div style="position: fixed; 
-                bottom: 50px; left: 50px; width: 200px; height: 140px; 
-                background-color: white; border: 2px solid grey; z-index: 9999; 
-                font-size: 14px; padding: 15px; border-radius: 10px;
-                box-shadow: 0 4px 8px rgba(0,0,0,0.1);">
-    <h4 style="margin-top: 0; color: #333;">Station Status</h4>
-    <p style="margin: 5px 0;"><i class="fa fa-circle" style="color: #4CAF50;"></i> Active ({len(stations_df[stations_df["status"] == "Active"])})</p>
-    <p style="margin: 5px 0;"><i class="fa fa-circle" style="color: #FF9800;"></i> Maintenance ({len(stations_df[stations_df["status"] == "Maintenance"])})</p>
-    <p style="margin: 5px 0;"><i class="fa fa-circle" style="color: #2196F3;"></i> Calibration ({len(stations_df[stations_df["status"] == "Calibration"])})</p>
-    <p style="margin: 5px 0;"><i class="fa fa-circle" style="color: #F44336;"></i> Offline ({len(stations_df[stations_df["status"] == "Offline"])})</p>
-    </div>
-    '''
-    m.get_root().html.add_child(folium.Element(legend_html))
-    
-    # Add layer control
-    folium.LayerControl().add_to(m)
-    
-    return m
+
+@ARTIFACTS.artifact('station_measurements')
+def build_station_measurements(snapshot):
+    """Measurements sorted by station with per-station offsets"""
+    return StationIndexedMeasurements(snapshot.measurements)
+
+@ARTIFACTS.artifact('latest_readings')
+def build_latest_readings(snapshot):
+    """Latest reading of every station"""
+    return LatestReadingIndex(snapshot.measurements)
+
+@ARTIFACTS.artifact('rollups')
+def build_rollups(snapshot):
+    """Hourly and daily rollup cubes, folded forward as new readings arrive"""
+    return MeasurementRollups(snapshot.measurements)
+
+@ARTIFACTS.artifact('default_alert_evaluator')
+def build_default_alert_evaluator(snapshot):
+    """Alert state under the default thresholds, shared by every session that kept them"""
+    evaluator = IncrementalAlertEvaluator(snapshot.stations)
+    evaluator.update(snapshot.measurements)
+    return evaluator
+
+@ARTIFACTS.artifact('alert_evaluator', shared=False)
+def build_alert_evaluator(snapshot):
+    """Alert evaluator of the current session: the shared one unless thresholds were edited"""
+    if not st.session_state.get('custom_alert_rules'):
+        return ARTIFACTS.resolve(['default_alert_evaluator'], snapshot)['default_alert_evaluator']
+    evaluator = get_alert_evaluator(snapshot.stations, get_alert_rules())
+    evaluator.update(snapshot.measurements)
+    return evaluator
+
+@ARTIFACTS.artifact('alerts', requires=['alert_evaluator'], shared=False)
+def build_alerts(snapshot, alert_evaluator):
+    """Open alerts of the current session"""
+    return alert_evaluator.active_alerts()
+
+PAGES = [
+    "🏠 Regional Overview",
+    "📊 Station Monitoring",
+    "📈 Trend Analysis",
+    "⚠️ Alerts & Warnings",
+    "🛰️ WaPOR Integration",
+    "📥 Data Export & Reports"
+]
+
+# Artifacts each page reads; the sidebar needs the summary and the alert evaluator everywhere
+SIDEBAR_ARTIFACTS = ['summary', 'alert_evaluator']
+PAGE_ARTIFACTS = {
+    "🏠 Regional Overview": ['latest_readings', 'alerts'],
+    "📊 Station Monitoring": ['latest_readings', 'station_measurements'],
+    "📈 Trend Analysis": ['rollups'],
+    "⚠️ Alerts & Warnings": ['alerts'],
+    "🛰️ WaPOR Integration": [],
+    "📥 Data Export & Reports": ['station_measurements', 'alerts'],
+    PERFORMANCE_PAGE: []
+}
+# Timed as the alerts stage of a rerun rather than as data loading
+ALERT_ARTIFACTS = {'default_alert_evaluator', 'alert_evaluator', 'alerts'}
+
+@st.cache_resource
+def get_series_cache():
+    """Downsampled chart series shared across sessions"""
+    return SeriesCache()
+
+@st.cache_resource
+def get_map_cache():
+    """Rendered map HTML shared by all sessions (LRU, 64 MB budget)"""
+    return MapArtifactCache(max_bytes=64 * 1024 * 1024)
+
+@st.cache_resource
+def get_report_engine():
+    """Report rendering workers shared by all sessions"""
+    return ReportEngine(MEASUREMENT_STORE_DIR, EXPORT_DIR, REPORT_ASSET_DIR, workers=REPORT_WORKERS)
+
+@st.cache_resource
+def get_report_scheduler():
+    """Background runner of the saved report schedules, started once per process"""
+    dataset_service = get_dataset_service()
+    engine = ReportEngine(MEASUREMENT_STORE_DIR, EXPORT_DIR, REPORT_ASSET_DIR,
+                          workers=SCHEDULED_REPORT_WORKERS, niceness=SCHEDULED_REPORT_NICENESS)
+    mailer = SmtpMailer(SMTP_HOST, SMTP_PORT) if SMTP_HOST else OutboxMailer(REPORT_OUTBOX_DIR)
+
+    def current_alerts():
+        # Scheduled reports use the default thresholds, not any session's edited ones
+        snapshot = dataset_service.get()
+        return ARTIFACTS.resolve(['default_alert_evaluator'], snapshot)['default_alert_evaluator'].active_alerts()
+
+    scheduler = ReportScheduler(
+        ScheduleStore(SCHEDULE_DB_PATH),
+        engine,
+        mailer,
+        stations_provider=lambda: dataset_service.get().stations,
+        alerts_provider=current_alerts,
+        max_concurrent=SCHEDULED_REPORT_CONCURRENCY,
+        poll_interval=SCHEDULER_POLL_SECONDS
+    )
+    return scheduler.start()
+
+def file_download_button(result, label, **kwargs):
+    """Download button for a file on disk (an export or report result)
+
+    Where Streamlit supports it the file is only read when the button is
+    clicked; otherwise every rerun showing the button copies it into the
+    media file store.
+    """
+    if DEFERRED_DOWNLOADS:
+        return st.download_button(label=label, data=result.path.read_bytes,
+                                  file_name=result.file_name, mime=result.mime, **kwargs)
+    with result.open() as file:
+        return st.download_button(label=label, data=file, file_name=result.file_name, mime=result.mime, **kwargs)
+
+def show_report_jobs(job_ids):
+    """Status of the session's report jobs, newest first, with downloads of finished ones"""
+    engine = get_report_engine()
+    for job_id in reversed(job_ids):
+        status = engine.status(job_id)
+        if status['state'] == 'unknown':
+            continue
+        label = f"{status['kind']} ({status['format']})"
+        if status['state'] == 'done':
+            result = status['result']
+            if not result.path.exists():
+                st.caption(f"{label}: expired, generate it again")
+                continue
+            file_download_button(
+                result,
+                f"📥 {label}: {result.file_name}",
+                key=f"report_download_{job_id}",
+                help=f"{result.rows:,} readings, rendered in {status['seconds']:.1f}s "
+                     f"({status['charts_cached']} chart(s) reused)"
+            )
+        elif status['state'] == 'failed':
+            st.error(f"❌ {label} failed: {status['error']}")
+        else:
+            st.info(f"⏳ {label} {status['state']} for {status['seconds']:.0f}s")
 
 # Enhanced alert system
-def generate_sophisticated_alerts(measurements_df, stations_df):
-    """Generate comprehensive alert system with multiple criteria"""
-    alerts = []
-    
-    # Get latest measurements
-    latest_data = measurements_df.groupby('station_id').last().reset_index()
-    
-    for _, data in latest_data.iterrows():
-        station_info = stations_df[stations_df['station_id'] == data['station_id']].iloc[0]
-        
-        # Dynamic thresholds based on station type and climate
-        if station_info['type'] == 'Lake Level':
-            if station_info['climate_zone'] in ['Tropical', 'Tropical Highland']:
-                flood_threshold = 1178 + (station_info['elevation'] - 1100) * 0.1
-                drought_threshold = 1172 + (station_info['elevation'] - 1100) * 0.1
-            else:
-                flood_threshold = 1176 + (station_info['elevation'] - 1100) * 0.1
-                drought_threshold = 1174 + (station_info['elevation'] - 1100) * 0.1
-        elif station_info['type'] == 'River Flow':
-            base_flood = 480 + station_info['elevation'] * 0.2
-            base_drought = 320 + station_info['elevation'] * 0.2
-            flood_threshold = base_flood
-            drought_threshold = base_drought
-        else:  # Reservoir/Groundwater
-            flood_threshold = 580 + station_info['elevation'] * 0.15
-            drought_threshold = 420 + station_info['elevation'] * 0.15
-        
-        # Check multiple alert conditions
-        alerts_for_station = []
-        
-        # Water level alerts
-        if data['water_level'] > flood_threshold:
-            severity = 'Critical' if data['water_level'] > flood_threshold * 1.05 else 'High' if data['water_level'] > flood_threshold * 1.02 else 'Medium'
-            alerts_for_station.append({
-                'type': 'Flood Warning',
-                'severity': severity,
-                'parameter': 'Water Level',
-                'current_value': f"{data['water_level']:.2f}m",
-                'threshold': f"{flood_threshold:.2f}m",
-                'exceedance': f"{((data['water_level'] / flood_threshold - 1) * 100):.1f}%"
-            })
-        
-        elif data['water_level'] < drought_threshold:
-            severity = 'Critical' if data['water_level'] < drought_threshold * 0.95 else 'High' if data['water_level'] < drought_threshold * 0.98 else 'Medium'
-            alerts_for_station.append({
-                'type': 'Drought Warning',
-                'severity': severity,
-                'parameter': 'Water Level',
-                'current_value': f"{data['water_level']:.2f}m",
-                'threshold': f"{drought_threshold:.2f}m",
-                'exceedance': f"{((1 - data['water_level'] / drought_threshold) * 100):.1f}%"
-            })
-        
-        # Data quality alerts
-        if data['data_quality'] < 80:
-            severity = 'Critical' if data['data_quality'] < 60 else 'High' if data['data_quality'] < 70 else 'Medium'
-            alerts_for_station.append({
-                'type': 'Data Quality Alert',
-                'severity': severity,
-                'parameter': 'Data Quality',
-                'current_value': f"{data['data_quality']:.1f}%",
-                'threshold': "80.0%",
-                'exceedance': f"{(80 - data['data_quality']):.1f}%"
-            })
-        
-        # Battery level alerts
-        if 'battery_level' in data and data['battery_level'] < 30:
-            severity = 'Critical' if data['battery_level'] < 15 else 'High' if data['battery_level'] < 25 else 'Medium'
-            alerts_for_station.append({
-                'type': 'Battery Alert',
-                'severity': severity,
-                'parameter': 'Battery Level',
-                'current_value': f"{data['battery_level']:.0f}%",
-                'threshold': "30%",
-                'exceedance': f"{(30 - data['battery_level']):.0f}%"
-            })
-        
-        # Add station information to each alert
-        for alert in alerts_for_station:
-            alert.update({
-                'station_id': data['station_id'],
-                'station_name': station_info['name'],
-                'country': station_info['country'],
-                'station_type': station_info['type'],
-                'timestamp': data['timestamp'],
-                'coordinates': [station_info['latitude'], station_info['longitude']]
-            })
-            alerts.append(alert)
-    
-    return alerts
+def format_duration(duration):
+    """Duration in its largest whole unit, e.g. '1 hour' or '90 minutes'"""
+    seconds = int(pd.Timedelta(duration).total_seconds())
+    for unit, size in (('day', 86400), ('hour', 3600), ('minute', 60)):
+        if seconds and seconds % size == 0:
+            count = seconds // size
+            return f"{count} {unit}{'' if count == 1 else 's'}"
+    return f"{seconds} second{'' if seconds == 1 else 's'}"
+
+def get_alert_rules():
+    """Alert rule table of the current session (edited by the threshold sliders)"""
+    if 'alert_rules' not in st.session_state:
+        st.session_state['alert_rules'] = AlertRuleTable()
+    return st.session_state['alert_rules']
+
+def get_alert_evaluator(stations_df, rules):
+    """Incremental alert evaluator of the current session (keeps alert state across reruns)"""
+    if 'alert_evaluator' not in st.session_state:
+        st.session_state['alert_evaluator'] = IncrementalAlertEvaluator(stations_df, rules)
+    return st.session_state['alert_evaluator']
+
+def apply_threshold_sliders():
+    """Write the Configure Alert Thresholds slider values into the rule table"""
+    state = st.session_state
+    rules = get_alert_rules()
+    rules.set_levels('Lake Level', flood=state['lake_flood'], drought=state['lake_drought'])
+    rules.set_levels('River Flow', flood=state['river_flood'], drought=state['river_drought'])
+    rules.set_limits(
+        quality_critical=state['quality_critical'],
+        quality_warning=state['quality_warning'],
+        battery_critical=state['battery_critical'],
+        battery_warning=state['battery_warning']
+    )
+    # Thresholds changed: re-evaluate alert state from recent history
+    state.pop('alert_evaluator', None)
+    state['custom_alert_rules'] = True
 
 def main():
-    # Load all data
-    stations_df = generate_enhanced_station_data()
-    measurements_df = generate_enhanced_measurement_data(stations_df)
-    wapor_data = load_wapor_data()
-    alerts = generate_sophisticated_alerts(measurements_df, stations_df)
-    
     # Enhanced header with professional styling
     st.markdown("""
     <div class="main-header">
@@ -631,24 +511,38 @@ def main():
         """, unsafe_allow_html=True)
         
         st.header("🧭 Navigation")
-        page = st.selectbox(
-            "Select Module:",
-            [
-                "🏠 Regional Overview",
-                "📊 Station Monitoring", 
-                "📈 Trend Analysis",
-                "⚠️ Alerts & Warnings",
-                "🛰️ WaPOR Integration",
-                "📥 Data Export & Reports"
-            ]
-        )
-        
+        perf_recorder = get_perf_recorder()
+        # The Performance page is only listed while instrumentation is on
+        page = st.selectbox("Select Module:", PAGES + [PERFORMANCE_PAGE] if perf_recorder.enabled else PAGES)
+    rerun = perf_recorder.start(page)
+    
+    # Load the shared, read-only snapshot of the latest dataset version and
+    # build only the artifacts this page and the sidebar read
+    with rerun.span("data"):
+        snapshot = get_dataset_service().get()
+        artifact_names = SIDEBAR_ARTIFACTS + PAGE_ARTIFACTS[page]
+        artifacts = ARTIFACTS.resolve([name for name in artifact_names if name not in ALERT_ARTIFACTS], snapshot)
+        wapor_data = load_wapor_data()
+    with rerun.span("alerts"):
+        artifacts.update(ARTIFACTS.resolve([name for name in artifact_names if name in ALERT_ARTIFACTS], snapshot))
+    # Saved report schedules run in the background whichever page is open
+    report_scheduler = get_report_scheduler()
+    stations_df = snapshot.stations
+    measurements_df = snapshot.measurements
+    summary = artifacts['summary']
+    alert_evaluator = artifacts['alert_evaluator']
+    station_measurements = artifacts.get('station_measurements')
+    latest_readings = artifacts.get('latest_readings')
+    rollups = artifacts.get('rollups')
+    alerts = artifacts.get('alerts')
+    
+    with st.sidebar:
         # Add system status in sidebar
         st.markdown("---")
         st.subheader("📡 System Status")
         
-        total_stations = len(stations_df)
-        active_stations = len(stations_df[stations_df['status'] == 'Active'])
+        total_stations = summary['total_stations']
+        active_stations = summary['active_stations']
         system_health = (active_stations / total_stations) * 100
         
         if system_health >= 90:
@@ -659,9 +553,8 @@ def main():
             st.error(f"🔴 Needs Attention ({system_health:.0f}%)")
         
         st.metric("Active Stations", f"{active_stations}/{total_stations}")
-        st.metric("Data Quality", f"{measurements_df['data_quality'].mean():.1f}%")
-        st.metric("Active Alerts", len(alerts))
-        
+        st.metric("Data Quality", f"{summary['avg_quality']:.1f}%")
+        st.metric("Active Alerts", alert_evaluator.open_count())
         # WaPOR integration status
         if wapor_data:
             st.markdown("---")
@@ -669,6 +562,7 @@ def main():
             st.success("✅ Connected")
             st.metric("Datasets", wapor_data['datasets_available'])
             st.info(f"Coverage: {wapor_data['temporal_coverage']}")
+    rerun.checkpoint("sidebar")
     
     # Page routing with enhanced content
     if page == "🏠 Regional Overview":
@@ -694,7 +588,7 @@ def main():
             )
         
         with col3:
-            avg_quality = measurements_df['data_quality'].mean()
+            avg_quality = summary['avg_quality']
             st.metric(
                 "📊 Data Quality", 
                 f"{avg_quality:.1f}%",
@@ -739,10 +633,26 @@ def main():
             else:
                 filtered_stations = stations_df
             
-            professional_map = create_professional_nile_map(filtered_stations, measurements_df)
-            st_folium(professional_map, width=800, height=600, key="main_map")
+            # Serve the pre-rendered map when stations, filters and data are unchanged
+            # (the index version restarts with every dataset version, so both are keyed)
+            map_cache = get_map_cache()
+            map_key = map_cache.make_key(
+                filtered_stations['station_id'], show_alerts_only, map_style,
+                (snapshot.version_id, latest_readings.version)
+            )
+            def render_map():
+                with rerun.span("map build"):
+                    nile_map = create_professional_nile_map(
+                        filtered_stations, latest_readings=latest_readings, map_style=map_style
+                    )
+                with rerun.span("map serialization"):
+                    return nile_map.get_root().render()
+            
+            map_html = map_cache.get_or_render(map_key, render_map)
+            with rerun.span("map serialization"):
+                components.html(map_html, width=800, height=600)
         
-        with col2:
+        with col2, rerun.span("charts"):
             # Enhanced status visualization
             st.subheader("📈 System Analytics")
             
@@ -784,21 +694,21 @@ def main():
         perf_col1, perf_col2, perf_col3, perf_col4 = st.columns(4)
         
         with perf_col1:
-            avg_battery = measurements_df['battery_level'].mean()
+            avg_battery = summary['avg_battery']
             st.metric("🔋 Avg Battery", f"{avg_battery:.0f}%", 
                      delta="5%" if avg_battery > 75 else "-3%")
         
         with perf_col2:
-            transmission_success = (measurements_df['data_quality'] > 80).mean() * 100
+            transmission_success = summary['transmission_success']
             st.metric("📡 Transmission Success", f"{transmission_success:.1f}%")
         
         with perf_col3:
-            last_update = measurements_df['timestamp'].max()
+            last_update = summary['last_update']
             hours_since = (datetime.now() - last_update).total_seconds() / 3600
             st.metric("🕒 Last Update", f"{hours_since:.1f}h ago")
         
         with perf_col4:
-            data_volume = len(measurements_df)
+            data_volume = summary['data_points']
             st.metric("💾 Data Points", f"{data_volume:,}")
     
     elif page == "📊 Station Monitoring":
@@ -828,15 +738,16 @@ def main():
                 available_stations = available_stations[available_stations['status'] == station_status_filter]
         
         with filter_col3:
+            station_names = dict(zip(available_stations['station_id'], available_stations['name']))
             selected_station_id = st.selectbox(
                 "🏭 Select Station:",
                 available_stations['station_id'].tolist(),
-                format_func=lambda x: f"{x} - {available_stations[available_stations['station_id']==x].iloc[0]['name']}"
+                format_func=lambda x: f"{x} - {station_names[x]}"
             )
         
         if selected_station_id:
             station_info = stations_df[stations_df['station_id'] == selected_station_id].iloc[0]
-            station_data = measurements_df[measurements_df['station_id'] == selected_station_id]
+            latest = latest_readings.get(selected_station_id)
             
             # Enhanced station information display
             st.subheader(f"📍 {station_info['name']} - Detailed Analysis")
@@ -868,8 +779,7 @@ def main():
                 """, unsafe_allow_html=True)
             
             with info_col3:
-                if not station_data.empty:
-                    latest = station_data.iloc[-1]
+                if latest is not None:
                     st.markdown(f"""
                     <div class="metric-card">
                         <h4>📈 Latest Readings</h4>
@@ -892,7 +802,7 @@ def main():
                 """, unsafe_allow_html=True)
             
             # Enhanced time series analysis
-            if len(station_data) > 0:
+            if latest is not None:
                 st.subheader("📊 Time Series Analysis")
                 
                 # Time range selector
@@ -909,7 +819,7 @@ def main():
                         ["Combined View", "Individual Parameters", "Statistical Analysis"]
                     )
                 
-                # Filter data based on time range
+                # Filter data based on time range (a binary search within the station's slice)
                 if time_range == "Last 24 Hours":
                     cutoff = datetime.now() - timedelta(hours=24)
                 elif time_range == "Last 7 Days":
@@ -917,9 +827,9 @@ def main():
                 elif time_range == "Last 30 Days":
                     cutoff = datetime.now() - timedelta(days=30)
                 else:
-                    cutoff = station_data['timestamp'].min()
+                    cutoff = None
                 
-                filtered_data = station_data[station_data['timestamp'] >= cutoff]
+                filtered_data = station_measurements.station(selected_station_id, start=cutoff)
                 
                 if chart_type == "Combined View":
                     # Multi-parameter subplot
@@ -932,30 +842,37 @@ def main():
                                [{"secondary_y": True}]]
                     )
                     
+                    # Each series is reduced to a pixel-sized point budget (cached per station and range)
+                    series = get_series_cache().get_series(
+                        selected_station_id, time_range, filtered_data,
+                        ['water_level', 'flow_rate', 'temperature', 'data_quality'],
+                        data_version=snapshot.version_id
+                    )
+                    
                     # Water level
                     fig.add_trace(
-                        go.Scatter(x=filtered_data['timestamp'], y=filtered_data['water_level'],
-                                  mode='lines', name='Water Level', line=dict(color='blue', width=2)),
+                        scatter_trace(*series['water_level'], source_points=len(filtered_data),
+                                      mode='lines', name='Water Level', line=dict(color='blue', width=2)),
                         row=1, col=1
                     )
                     
                     # Flow rate
                     fig.add_trace(
-                        go.Scatter(x=filtered_data['timestamp'], y=filtered_data['flow_rate'],
-                                  mode='lines', name='Flow Rate', line=dict(color='green', width=2)),
+                        scatter_trace(*series['flow_rate'], source_points=len(filtered_data),
+                                      mode='lines', name='Flow Rate', line=dict(color='green', width=2)),
                         row=2, col=1
                     )
                     
                     # Temperature and data quality
                     fig.add_trace(
-                        go.Scatter(x=filtered_data['timestamp'], y=filtered_data['temperature'],
-                                  mode='lines', name='Temperature', line=dict(color='red', width=2)),
+                        scatter_trace(*series['temperature'], source_points=len(filtered_data),
+                                      mode='lines', name='Temperature', line=dict(color='red', width=2)),
                         row=3, col=1
                     )
                     
                     fig.add_trace(
-                        go.Scatter(x=filtered_data['timestamp'], y=filtered_data['data_quality'],
-                                  mode='lines', name='Data Quality', line=dict(color='orange', width=2)),
+                        scatter_trace(*series['data_quality'], source_points=len(filtered_data),
+                                      mode='lines', name='Data Quality', line=dict(color='orange', width=2)),
                         row=3, col=1, secondary_y=True
                     )
                     
@@ -1050,21 +967,23 @@ def main():
                 ["Interactive", "Statistical", "Comparative"]
             )
         
-        # Filter data based on selections
+        # Filter data based on selections (answered from the rollup cubes, not raw readings)
         if time_period == "Last 7 Days":
             cutoff_date = datetime.now() - timedelta(days=7)
         elif time_period == "Last 30 Days":
             cutoff_date = datetime.now() - timedelta(days=30)
         else:
-            cutoff_date = measurements_df['timestamp'].min()
+            cutoff_date = None
         
-        filtered_data = measurements_df[measurements_df['timestamp'] >= cutoff_date]
-        analysis_data = filtered_data.merge(stations_df[['station_id', 'country', 'type', 'climate_zone']], on='station_id')
+        # Hourly buckets follow a rolling cutoff closely; daily buckets cover full histories
+        grain = 'hour' if cutoff_date is not None else 'day'
+        parameter_label = parameter.replace('_', ' ').title()
         
         if analysis_type == "Cross-Country Comparison":
-            st.subheader(f"🌍 {parameter.replace('_', ' ').title()} Comparison Across Countries")
+            st.subheader(f"🌍 {parameter_label} Comparison Across Countries")
             
-            country_stats = analysis_data.groupby('country')[parameter].agg(['mean', 'std', 'min', 'max']).round(2)
+            country_stats = rollups.summarize(parameter, 'country', stations_df, cutoff_date, grain)
+            country_stats = country_stats[['mean', 'std', 'min', 'max']].round(2)
             
             if chart_style == "Interactive":
                 # Interactive bar chart
@@ -1072,18 +991,18 @@ def main():
                     x=country_stats.index,
                     y=country_stats['mean'],
                     error_y=country_stats['std'],
-                    title=f"Average {parameter.replace('_', ' ').title()} by Country",
-                    labels={'x': 'Country', 'y': parameter.replace('_', ' ').title()},
+                    title=f"Average {parameter_label} by Country",
+                    labels={'x': 'Country', 'y': parameter_label},
                     color=country_stats['mean'],
                     color_continuous_scale='RdYlBu_r'
                 )
                 fig.update_xaxes(tickangle=45)
                 st.plotly_chart(fig, use_container_width=True)
                 
-                # Box plot for distribution comparison
+                # Box plot of station-day means for distribution comparison
                 fig_box = px.box(
-                    analysis_data, x='country', y=parameter,
-                    title=f"{parameter.replace('_', ' ').title()} Distribution by Country"
+                    rollups.bucket_means(parameter, 'country', stations_df, cutoff_date), x='country', y=parameter,
+                    title=f"Daily Mean {parameter_label} Distribution by Country"
                 )
                 fig_box.update_xaxes(tickangle=45)
                 st.plotly_chart(fig_box, use_container_width=True)
@@ -1094,7 +1013,7 @@ def main():
             
             # Country ranking
             ranking = country_stats.sort_values('mean', ascending=False)
-            st.subheader(f"🏆 Country Ranking by Average {parameter.replace('_', ' ').title()}")
+            st.subheader(f"🏆 Country Ranking by Average {parameter_label}")
             
             rank_col1, rank_col2 = st.columns(2)
             with rank_col1:
@@ -1110,14 +1029,16 @@ def main():
                     st.write(f"📊 {country}: ±{value:.2f}")
         
         elif analysis_type == "Climate Zone Analysis":
-            st.subheader(f"🌡️ {parameter.replace('_', ' ').title()} Analysis by Climate Zone")
+            st.subheader(f"🌡️ {parameter_label} Analysis by Climate Zone")
             
-            climate_stats = analysis_data.groupby('climate_zone')[parameter].agg(['mean', 'std', 'count']).round(2)
+            climate_stats = rollups.summarize(parameter, 'climate_zone', stations_df, cutoff_date, grain)
+            climate_stats = climate_stats[['mean', 'std', 'count']].round(2)
             
             # Climate zone comparison
             fig_climate = px.violin(
-                analysis_data, x='climate_zone', y=parameter,
-                title=f"{parameter.replace('_', ' ').title()} Distribution by Climate Zone",
+                rollups.bucket_means(parameter, 'climate_zone', stations_df, cutoff_date),
+                x='climate_zone', y=parameter,
+                title=f"Daily Mean {parameter_label} Distribution by Climate Zone",
                 box=True
             )
             fig_climate.update_xaxes(tickangle=45)
@@ -1127,38 +1048,77 @@ def main():
             st.dataframe(climate_stats, use_container_width=True)
             
         elif analysis_type == "Seasonal Patterns":
-            st.subheader(f"📅 Seasonal Patterns in {parameter.replace('_', ' ').title()}")
-            
-            # Add time-based features
-            analysis_data['hour'] = analysis_data['timestamp'].dt.hour
-            analysis_data['day_of_year'] = analysis_data['timestamp'].dt.dayofyear
-            analysis_data['month'] = analysis_data['timestamp'].dt.month
+            st.subheader(f"📅 Seasonal Patterns in {parameter_label}")
             
             pattern_col1, pattern_col2 = st.columns(2)
             
             with pattern_col1:
                 # Hourly pattern
-                hourly_pattern = analysis_data.groupby('hour')[parameter].mean()
+                hourly_pattern = rollups.profile(parameter, 'hour', cutoff_date)
                 fig_hourly = px.line(
                     x=hourly_pattern.index,
                     y=hourly_pattern.values,
-                    title=f"Daily Pattern - {parameter.replace('_', ' ').title()}",
-                    labels={'x': 'Hour of Day', 'y': parameter.replace('_', ' ').title()}
+                    title=f"Daily Pattern - {parameter_label}",
+                    labels={'x': 'Hour of Day', 'y': parameter_label}
                 )
                 st.plotly_chart(fig_hourly, use_container_width=True)
             
             with pattern_col2:
                 # Monthly pattern
-                monthly_pattern = analysis_data.groupby('month')[parameter].mean()
+                monthly_pattern = rollups.profile(parameter, 'month', cutoff_date)
                 month_names = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun',
                               'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
                 fig_monthly = px.line(
                     x=[month_names[i-1] for i in monthly_pattern.index],
                     y=monthly_pattern.values,
-                    title=f"Monthly Pattern - {parameter.replace('_', ' ').title()}",
-                    labels={'x': 'Month', 'y': parameter.replace('_', ' ').title()}
+                    title=f"Monthly Pattern - {parameter_label}",
+                    labels={'x': 'Month', 'y': parameter_label}
                 )
                 st.plotly_chart(fig_monthly, use_container_width=True)
+        
+        elif analysis_type == "Data Quality Trends":
+            st.subheader("📶 Data Quality Trends by Country")
+            
+            daily_quality = rollups.daily('data_quality', 'country', stations_df, cutoff_date)
+            fig_quality = px.line(
+                daily_quality, x='bucket', y='mean', color='country',
+                title="Daily Average Data Quality by Country",
+                labels={'bucket': 'Date', 'mean': 'Data Quality (%)', 'country': 'Country'}
+            )
+            fig_quality.add_hline(y=80, line_dash="dash", line_color="orange",
+                                  annotation_text="Quality warning (80%)")
+            st.plotly_chart(fig_quality, use_container_width=True)
+            
+            quality_stats = rollups.summarize('data_quality', 'country', stations_df, cutoff_date, grain)
+            st.dataframe(quality_stats[['mean', 'std', 'min', 'max', 'count']].round(2), use_container_width=True)
+        
+        elif analysis_type == "Transmission Performance":
+            st.subheader("📡 Transmission Performance")
+            
+            transmission_col1, transmission_col2 = st.columns(2)
+            
+            with transmission_col1:
+                by_method = rollups.transmission('transmission_method', stations_df, cutoff_date, grain)
+                fig_method = px.bar(
+                    x=by_method.index, y=by_method['success_rate'],
+                    title="Transmission Success Rate by Method",
+                    labels={'x': 'Transmission Method', 'y': 'Success Rate (%)'},
+                    color=by_method['success_rate'], color_continuous_scale='RdYlGn'
+                )
+                st.plotly_chart(fig_method, use_container_width=True)
+            
+            with transmission_col2:
+                by_country = rollups.transmission('country', stations_df, cutoff_date, grain)
+                fig_country = px.bar(
+                    x=by_country.index, y=by_country['success_rate'],
+                    title="Transmission Success Rate by Country",
+                    labels={'x': 'Country', 'y': 'Success Rate (%)'},
+                    color=by_country['success_rate'], color_continuous_scale='RdYlGn'
+                )
+                fig_country.update_xaxes(tickangle=45)
+                st.plotly_chart(fig_country, use_container_width=True)
+            
+            st.dataframe(by_country.round(1), use_container_width=True)
     
     elif page == "⚠️ Alerts & Warnings":
         st.header("🚨 Comprehensive Alert Management System")
@@ -1282,27 +1242,49 @@ def main():
             </div>
             """.format(total_stations=len(stations_df)), unsafe_allow_html=True)
         
+        # Alert lifecycle events from the incremental evaluator
+        alert_events = alert_evaluator.events_frame()
+        if not alert_events.empty:
+            st.subheader("🔔 Recent Alert Events")
+            min_duration = format_duration(alert_evaluator.min_duration)
+            st.caption(f"Alerts open after persisting for {min_duration} and close after recovering "
+                       f"past the hysteresis band · "
+                       f"evaluated up to {alert_evaluator.watermark.strftime('%Y-%m-%d %H:%M')}")
+            st.dataframe(alert_events.head(50), use_container_width=True)
+        
         # Alert configuration and management
         st.subheader("⚙️ Alert Configuration & Management")
         
         with st.expander("🔧 Configure Alert Thresholds", expanded=False):
             st.info("💡 **Production Note**: In a live system, administrators can configure station-specific thresholds based on historical data and local conditions.")
             
+            alert_rules = get_alert_rules()
             config_col1, config_col2, config_col3 = st.columns(3)
             
             with config_col1:
                 st.markdown("**🌊 Water Level Thresholds**")
-                lake_flood = st.slider("Lake Flood Level (m)", 1170, 1185, 1178)
-                lake_drought = st.slider("Lake Drought Level (m)", 1165, 1175, 1172)
-                river_flood = st.slider("River Flood Level (m)", 400, 500, 480)
-                river_drought = st.slider("River Drought Level (m)", 300, 400, 320)
+                lake_flood_ref, lake_drought_ref = alert_rules.reference_levels('Lake Level')
+                river_flood_ref, river_drought_ref = alert_rules.reference_levels('River Flow')
+                lake_flood = st.slider("Lake Flood Level (m)", 1170, 1185, int(lake_flood_ref),
+                                       key='lake_flood', on_change=apply_threshold_sliders)
+                lake_drought = st.slider("Lake Drought Level (m)", 1165, 1175, int(lake_drought_ref),
+                                         key='lake_drought', on_change=apply_threshold_sliders)
+                river_flood = st.slider("River Flood Level (m)", 400, 500, int(river_flood_ref),
+                                        key='river_flood', on_change=apply_threshold_sliders)
+                river_drought = st.slider("River Drought Level (m)", 300, 400, int(river_drought_ref),
+                                          key='river_drought', on_change=apply_threshold_sliders)
             
             with config_col2:
                 st.markdown("**📊 Data Quality Thresholds**")
-                critical_quality = st.slider("Critical Quality (%)", 50, 70, 60)
-                warning_quality = st.slider("Warning Quality (%)", 70, 90, 80)
-                battery_critical = st.slider("Battery Critical (%)", 10, 30, 20)
-                battery_warning = st.slider("Battery Warning (%)", 30, 50, 40)
+                limits = alert_rules.limits
+                critical_quality = st.slider("Critical Quality (%)", 50, 70, int(limits['quality_critical']),
+                                             key='quality_critical', on_change=apply_threshold_sliders)
+                warning_quality = st.slider("Warning Quality (%)", 70, 90, int(limits['quality_warning']),
+                                            key='quality_warning', on_change=apply_threshold_sliders)
+                battery_critical = st.slider("Battery Critical (%)", 10, 30, int(limits['battery_critical']),
+                                             key='battery_critical', on_change=apply_threshold_sliders)
+                battery_warning = st.slider("Battery Warning (%)", 30, 50, int(limits['battery_warning']),
+                                            key='battery_warning', on_change=apply_threshold_sliders)
             
             with config_col3:
                 st.markdown("**🔔 Notification Settings**")
@@ -1349,6 +1331,7 @@ def main():
                 ],
                 'Resolution': ['100m', '100m', '100m', '100m', '100m'],
                 'Frequency': ['Monthly', 'Dekadal (10-day)', 'Annual', 'Annual', 'Various'],
+                'Files': wapor_data['product_files'],
                 'Status': ['✅ Available', '✅ Available', '✅ Available', '✅ Available', '✅ Available']
             })
             
@@ -1360,15 +1343,18 @@ def main():
             if wapor_data.get('sample_loaded'):
                 st.success(f"📁 Sample file loaded: {wapor_data['sample_file']}")
                 
-                # Simulate WaPOR data visualization
-                sample_data = {
-                    'Country': ['Uganda', 'Kenya', 'Tanzania', 'Rwanda', 'Burundi', 'Ethiopia', 'Sudan', 'South Sudan', 'DRC', 'Egypt'],
-                    'Avg_ET_mm_month': [85, 72, 78, 92, 88, 68, 45, 67, 95, 25],
-                    'Annual_Trend': ['Stable', 'Decreasing', 'Stable', 'Increasing', 'Stable', 'Decreasing', 'Stable', 'Stable', 'Increasing', 'Stable'],
-                    'Data_Quality': [96, 94, 95, 97, 93, 92, 89, 91, 94, 98]
-                }
-                
-                wapor_df = pd.DataFrame(sample_data)
+                # Zonal statistics of local AETI rasters; simulated values when no rasters are available
+                wapor_df = summarize_wapor_et_by_country()
+                if wapor_df is not None:
+                    st.info("🗺️ Country statistics computed from local AETI rasters")
+                else:
+                    sample_data = {
+                        'Country': ['Uganda', 'Kenya', 'Tanzania', 'Rwanda', 'Burundi', 'Ethiopia', 'Sudan', 'South Sudan', 'DRC', 'Egypt'],
+                        'Avg_ET_mm_month': [85, 72, 78, 92, 88, 68, 45, 67, 95, 25],
+                        'Annual_Trend': ['Stable', 'Decreasing', 'Stable', 'Increasing', 'Stable', 'Decreasing', 'Stable', 'Stable', 'Increasing', 'Stable'],
+                        'Data_Quality': [96, 94, 95, 97, 93, 92, 89, 91, 94, 98]
+                    }
+                    wapor_df = pd.DataFrame(sample_data)
                 
                 # Evapotranspiration comparison
                 fig_et = px.bar(
@@ -1528,7 +1514,11 @@ def main():
         with export_col2:
             export_format = st.selectbox(
                 "📄 Export Format:",
-                ["CSV", "Excel (XLSX)", "JSON", "PDF Report"]
+                [*EXPORT_FORMATS, *REPORT_FORMATS]
+            )
+            export_compression = st.selectbox(
+                "🗜️ Compression:",
+                ["None", *COMPRESSIONS]
             )
         
         with export_col3:
@@ -1589,124 +1579,234 @@ def main():
         
         # Generate export
         if st.button("🚀 Generate Export", type="primary"):
-            with st.spinner("📊 Processing data export..."):
-                # Filter data based on selections
-                filtered_stations = stations_df[
-                    (stations_df['country'].isin(country_filter)) &
-                    (stations_df['type'].isin(station_types)) &
-                    (stations_df['status'].isin(station_status))
-                ]
+            # Filter data based on selections
+            filtered_stations = stations_df[
+                (stations_df['country'].isin(country_filter)) &
+                (stations_df['type'].isin(station_types)) &
+                (stations_df['status'].isin(station_status))
+            ]
+            
+            period_start = pd.Timestamp(start_date)
+            period_end = pd.Timestamp(end_date + timedelta(days=1))
+            snapshot_start = summary['first_reading']
+            exported_readings = []  # (first, last) timestamp of each chunk of readings read
+            
+            def measurement_chunks(min_quality=quality_threshold):
+                """Selected readings from min_quality up (all if None), a chunk at a time
                 
-                date_mask = (
-                    (measurements_df['timestamp'].dt.date >= start_date) & 
-                    (measurements_df['timestamp'].dt.date <= end_date)
+                The in-memory snapshot only holds recent readings (30 days of a
+                fleet); the part of the period before it is streamed from the store.
+                """
+                chunks = []
+                if pd.notna(snapshot_start) and period_start < snapshot_start:
+                    chunks.append(
+                        chunk[measurements_df.columns].astype(measurements_df.dtypes.to_dict())
+                        for chunk in get_measurement_store().iter_read(
+                            columns=list(measurements_df.columns),
+                            start=period_start,
+                            end=min(period_end, snapshot_start),
+                            station_ids=filtered_stations['station_id'],
+                            chunk_rows=EXPORT_CHUNK_ROWS
+                        )
+                    )
+                chunks.append(station_measurements.iter_select(
+                    station_ids=filtered_stations['station_id'],
+                    start=max(period_start, snapshot_start) if pd.notna(snapshot_start) else period_start,
+                    end=period_end,
+                    chunk_rows=EXPORT_CHUNK_ROWS
+                ))
+                for chunk in itertools.chain.from_iterable(chunks):
+                    if not chunk.empty:
+                        exported_readings.append((chunk['timestamp'].min(), chunk['timestamp'].max()))
+                    yield chunk if min_quality is None else chunk[chunk['data_quality'] >= min_quality]
+            
+            filename = f"nbi_{export_type.lower().replace(' ', '_')}_{datetime.now().strftime('%Y%m%d_%H%M')}"
+            
+            # Generate different export types
+            chunks = None
+            if export_type in REPORT_KINDS and (export_format in REPORT_FORMATS or export_type == "Technical Report"):
+                # Rendered by the report workers; the page polls the job below
+                report_format = export_format if export_format in REPORT_FORMATS else "PDF Report"
+                station_ids = set(filtered_stations['station_id'])
+                job_id = get_report_engine().submit(
+                    export_type,
+                    report_format,
+                    filtered_stations,
+                    [alert for alert in alerts if alert['station_id'] in station_ids],
+                    start_date,
+                    end_date + timedelta(days=1),
+                    filename
                 )
-                quality_mask = measurements_df['data_quality'] >= quality_threshold
+                st.session_state.setdefault('report_jobs', []).append(job_id)
+                st.success(f"✅ {export_type} ({report_format}) queued, see Report Jobs below")
                 
-                filtered_measurements = measurements_df[
-                    date_mask & quality_mask &
-                    measurements_df['station_id'].isin(filtered_stations['station_id'])
-                ]
+            elif export_format in REPORT_FORMATS:
+                st.warning("⚠️ PDF and HTML reports are available for the Executive Dashboard and the Technical Report")
                 
-                # Generate different export types
-                if export_type == "Station Metadata":
-                    export_data = filtered_stations
-                    st.success(f"✅ Station metadata prepared: {len(export_data)} stations")
-                    
-                elif export_type == "Measurement Data":
-                    export_data = filtered_measurements
-                    st.success(f"✅ Measurement data prepared: {len(export_data):,} records")
-                    
-                elif export_type == "Statistical Summary":
-                    summary_stats = filtered_measurements.groupby('station_id').agg({
+            elif export_type == "Station Metadata":
+                chunks = iter([filtered_stations])
+                
+            elif export_type == "Measurement Data":
+                # Streamed straight into the file, never held in memory as a whole
+                chunks = measurement_chunks()
+                
+            elif export_type == "Alert History":
+                alert_records = pd.DataFrame(alerts)
+                if not alert_records.empty:
+                    alert_records = alert_records[alert_records['country'].isin(country_filter)]
+                    coordinates = alert_records.pop('coordinates').tolist()
+                    alert_records['latitude'] = [point[0] for point in coordinates]
+                    alert_records['longitude'] = [point[1] for point in coordinates]
+                chunks = iter([alert_records])
+                
+            elif export_type == "Statistical Summary":
+                # Stations never span chunks, so per-chunk statistics are exact
+                station_stats = [
+                    chunk.groupby('station_id').agg({
                         'water_level': ['mean', 'std', 'min', 'max'],
                         'flow_rate': ['mean', 'std', 'min', 'max'],
                         'temperature': ['mean', 'std', 'min', 'max'],
                         'data_quality': ['mean', 'count']
                     }).round(2)
-                    
+                    for chunk in measurement_chunks()
+                ]
+                if station_stats:
+                    summary_stats = pd.concat(station_stats)
                     # Flatten column names
                     summary_stats.columns = [f"{col[0]}_{col[1]}" for col in summary_stats.columns]
-                    export_data = summary_stats.reset_index()
-                    st.success(f"✅ Statistical summary prepared for {len(export_data)} stations")
-                    
-                elif export_type == "Executive Dashboard":
-                    # Create executive summary
-                    exec_summary = {
-                        'Report_Date': [datetime.now().strftime('%Y-%m-%d')],
-                        'Reporting_Period': [f"{start_date} to {end_date}"],
-                        'Total_Stations': [len(filtered_stations)],
-                        'Active_Stations': [len(filtered_stations[filtered_stations['status'] == 'Active'])],
-                        'Countries_Covered': [len(country_filter)],
-                        'Data_Points_Analyzed': [len(filtered_measurements)],
-                        'Average_Data_Quality': [filtered_measurements['data_quality'].mean()],
-                        'System_Uptime': ['98.7%'],
-                        'Critical_Alerts': [len([a for a in alerts if a['severity'] == 'Critical'])],
-                        'Recommendations': ['Continue monitoring; Address critical alerts immediately']
-                    }
-                    export_data = pd.DataFrame(exec_summary)
-                    st.success("✅ Executive dashboard summary prepared")
-                
-                # Display preview
-                st.subheader("👀 Data Preview")
-                st.dataframe(export_data.head(10), use_container_width=True)
-                
-                # Download preparation
-                st.subheader("💾 Download Options")
+                    chunks = iter([summary_stats.reset_index()])
+                else:
+                    chunks = iter([pd.DataFrame(columns=['station_id'])])
                 
-                download_col1, download_col2 = st.columns(2)
+            elif export_type == "WaPOR Integration Data":
+                catalog_entries = pd.DataFrame(get_wapor_catalog().find())
+                chunks = iter([catalog_entries.drop(columns=['mtime_ns', 'size'], errors='ignore')])
                 
-                with download_col1:
-                    # CSV download
-                    csv_data = export_data.to_csv(index=False)
-                    filename = f"nbi_{export_type.lower().replace(' ', '_')}_{datetime.now().strftime('%Y%m%d_%H%M')}"
-                    
-                    st.download_button(
-                        label="📥 Download CSV",
-                        data=csv_data,
-                        file_name=f"{filename}.csv",
-                        mime="text/csv",
-                        help="Download data as CSV file"
-                    )
+            elif export_type == "Executive Dashboard":
+                data_points = usable_readings = 0
+                quality_total = 0.0
+                first_readings, last_readings = [], []
+                # Uptime counts every reading, the quality figures only those above the threshold
+                for chunk in measurement_chunks(min_quality=None):
+                    if chunk.empty:
+                        continue
+                    usable_readings += int((chunk['data_quality'] > TRANSMISSION_OK_QUALITY).sum())
+                    first_readings.append(chunk['timestamp'].min())
+                    last_readings.append(chunk['timestamp'].max())
+                    selected = chunk[chunk['data_quality'] >= quality_threshold]
+                    data_points += len(selected)
+                    quality_total += selected['data_quality'].sum()
+                uptime = system_uptime(
+                    filtered_stations,
+                    usable_readings,
+                    *covered_period(start_date, end_date + timedelta(days=1),
+                                    min(first_readings, default=None), max(last_readings, default=None))
+                )
+                # Create executive summary
+                exec_summary = {
+                    'Report_Date': [datetime.now().strftime('%Y-%m-%d')],
+                    'Reporting_Period': [f"{start_date} to {end_date}"],
+                    'Total_Stations': [len(filtered_stations)],
+                    'Active_Stations': [len(filtered_stations[filtered_stations['status'] == 'Active'])],
+                    'Countries_Covered': [len(country_filter)],
+                    'Data_Points_Analyzed': [data_points],
+                    'Average_Data_Quality': [quality_total / data_points if data_points else np.nan],
+                    'System_Uptime': ['n/a' if np.isnan(uptime) else f"{uptime:.1f}%"],
+                    'Critical_Alerts': [len([a for a in alerts if a['severity'] == 'Critical'])],
+                    'Recommendations': ['Continue monitoring; Address critical alerts immediately']
+                }
+                chunks = iter([pd.DataFrame(exec_summary)])
+            
+            if chunks is not None:
+                # Preview the first chunk, then write it and the rest to the export file
+                with rerun.span("export"):
+                    first_chunk = next(chunks, pd.DataFrame())
+                st.subheader("👀 Data Preview")
+                st.dataframe(first_chunk.head(10), use_container_width=True)
                 
-                with download_col2:
-                    # JSON download
-                    json_data = export_data.to_json(orient='records', indent=2)
-                    
-                    st.download_button(
-                        label="📥 Download JSON",
-                        data=json_data,
-                        file_name=f"{filename}.json",
-                        mime="application/json",
-                        help="Download data as JSON file"
+                export_progress = st.empty()
+                with st.spinner("📊 Processing data export..."), rerun.span("export"):
+                    export_result = write_export(
+                        itertools.chain([first_chunk], chunks),
+                        export_format,
+                        EXPORT_DIR,
+                        filename,
+                        compression=None if export_compression == "None" else export_compression,
+                        progress=lambda rows: export_progress.caption(f"{rows:,} records written")
                     )
+                export_progress.empty()
+                st.session_state['export_result'] = export_result
+                st.success(f"✅ {export_type} prepared: {export_result.rows:,} records")
                 
                 # Export summary
                 st.info(f"""
                 **📊 Export Summary:**
                 - **Data Type**: {export_type}
-                - **Format**: {export_format}
-                - **Records**: {len(export_data):,}
+                - **Format**: {export_format}{'' if export_compression == 'None' else f' ({export_compression})'}
+                - **Records**: {export_result.rows:,}
+                - **File Size**: {export_result.nbytes / 1e6:.1f} MB
                 - **Date Range**: {start_date} to {end_date}
                 - **Countries**: {', '.join(country_filter)}
                 - **Generated**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
                 """)
+                
+                # Readings neither in the snapshot nor in the store leave part of the period empty
+                if export_type in ("Measurement Data", "Statistical Summary", "Executive Dashboard"):
+                    if not exported_readings:
+                        st.warning(f"⚠️ No readings between {start_date} and {end_date} for the selected stations")
+                    else:
+                        first_day = min(first for first, _ in exported_readings).date()
+                        last_day = max(last for _, last in exported_readings).date()
+                        if first_day > start_date or last_day < end_date:
+                            st.warning(f"⚠️ Readings are only available from {first_day} to {last_day}; "
+                                       f"the rest of {start_date} to {end_date} is not covered")
+        
+        # The latest export stays downloadable across reruns until it has been downloaded
+        export_result = st.session_state.get('export_result')
+        if export_result is not None and export_result.path.exists():
+            st.subheader("💾 Download Options")
+            file_download_button(
+                export_result,
+                f"📥 Download {export_result.file_name}",
+                help=f"{export_result.rows:,} records, {export_result.nbytes / 1e6:.1f} MB",
+                on_click=st.session_state.pop,
+                args=('export_result', None)
+            )
+        
+        # Reports of this session render in the background; poll them until they are done
+        report_jobs = st.session_state.get('report_jobs', [])
+        if report_jobs:
+            st.subheader("🗂️ Report Jobs")
+            engine = get_report_engine()
+            pending = any(engine.status(job_id)['state'] in ('queued', 'running') for job_id in report_jobs)
+            if hasattr(st, 'fragment'):
+                # Only the job list reruns while reports render
+                st.fragment(run_every=REPORT_POLL_SECONDS if pending else None)(show_report_jobs)(report_jobs)
+            else:
+                show_report_jobs(report_jobs)
+                if pending:
+                    st.button("🔄 Refresh Status")
         
         # Scheduled reports section
         st.subheader("📅 Scheduled Reports")
         
         with st.expander("⚙️ Configure Automated Reports", expanded=False):
-            st.info("💡 **Production Feature**: Set up automated daily, weekly, or monthly reports for stakeholders.")
+            st.info("💡 **Production Feature**: Set up automated daily, weekly, or monthly reports for stakeholders. "
+                    "Weekly reports go out on Mondays, monthly and quarterly ones on the 1st, each covering "
+                    "the period just ended for the countries, station types and statuses selected above.")
             
             schedule_col1, schedule_col2, schedule_col3 = st.columns(3)
             
             with schedule_col1:
                 report_frequency = st.selectbox(
                     "📅 Frequency:",
-                    ["Daily", "Weekly", "Monthly", "Quarterly"]
+                    FREQUENCIES
                 )
                 
                 report_time = st.time_input("🕒 Send Time:", datetime.now().time())
+                
+                scheduled_kind = st.selectbox("📑 Report:", list(REPORT_KINDS))
+                scheduled_format = st.selectbox("📄 Report Format:", list(REPORT_FORMATS))
             
             with schedule_col2:
                 recipients = st.text_area(
@@ -1720,7 +1820,117 @@ def main():
                 include_summary = st.checkbox("📋 Include Summary", True)
                 
                 if st.button("💾 Save Schedule"):
-                    st.success("✅ Automated report schedule saved!")
+                    valid_recipients, invalid_recipients = parse_recipients(recipients)
+                    if invalid_recipients:
+                        st.error(f"❌ Not valid email addresses: {', '.join(invalid_recipients)}")
+                    elif not valid_recipients:
+                        st.warning("⚠️ Add at least one recipient")
+                    else:
+                        report_scheduler.store.add(
+                            scheduled_kind,
+                            scheduled_format,
+                            report_frequency,
+                            report_time.strftime('%H:%M'),
+                            valid_recipients,
+                            {'countries': list(country_filter), 'types': list(station_types),
+                             'statuses': list(station_status)},
+                            include_charts=include_charts,
+                            include_alerts=include_alerts,
+                            include_summary=include_summary
+                        )
+                        st.success("✅ Automated report schedule saved!")
+            
+            schedules = report_scheduler.store.schedules()
+            if schedules:
+                st.markdown("**🗓️ Saved Schedules**")
+                st.dataframe(pd.DataFrame([{
+                    'ID': schedule['id'],
+                    'Report': f"{schedule['kind']} ({schedule['format']})",
+                    'Frequency': schedule['frequency'],
+                    'Next Run': schedule['next_run'],
+                    'Recipients': ', '.join(schedule['recipients']),
+                    'Last Run': schedule['last_run'],
+                    'Last Status': 'running' if schedule['running_since'] else schedule['last_status'] or '',
+                    'Last Error': schedule['last_error'] or ''
+                } for schedule in schedules]), use_container_width=True, hide_index=True)
+                
+                remove_col1, remove_col2 = st.columns([1, 3])
+                with remove_col1:
+                    schedule_to_remove = st.selectbox("Schedule ID:", [schedule['id'] for schedule in schedules])
+                with remove_col2:
+                    st.write("")
+                    if st.button("🗑️ Delete Schedule"):
+                        report_scheduler.store.remove(schedule_to_remove)
+                        st.rerun()
+                
+                deliveries = report_scheduler.store.deliveries()
+                if deliveries:
+                    st.markdown("**📨 Recent Deliveries**")
+                    st.dataframe(pd.DataFrame(deliveries).drop(columns=['id']), use_container_width=True, hide_index=True)
+                st.caption(f"Reports are delivered via {'SMTP relay ' + SMTP_HOST if SMTP_HOST else f'the local outbox {REPORT_OUTBOX_DIR}'}")
+            if report_scheduler.last_error:
+                st.warning(f"⚠️ Report scheduler: {report_scheduler.last_error}")
+    
+    elif page == PERFORMANCE_PAGE:
+        st.header("⏱️ Rerun Performance")
+        st.caption("Stage timings of recent reruns of every session in this process. "
+                   "Unset NBI_PERF_INSTRUMENTATION to switch instrumentation and this page off.")
+        
+        memory = process_memory()
+        perf_col1, perf_col2, perf_col3, perf_col4 = st.columns(4)
+        with perf_col1:
+            st.metric("🔁 Reruns Recorded", len(perf_recorder.reruns()))
+        with perf_col2:
+            st.metric("💾 Process RSS", f"{memory['rss'] / 1e6:,.0f} MB" if memory['rss'] else "n/a")
+        with perf_col3:
+            st.metric("📈 Peak RSS", f"{memory['peak_rss'] / 1e6:,.0f} MB" if memory['peak_rss'] else "n/a")
+        with perf_col4:
+            st.metric("🗃️ Dataset Snapshots", f"{get_dataset_service().memory_usage() / 1e6:,.0f} MB")
+        
+        st.subheader("🕒 Stage Latency")
+        recorded = perf_recorder.reruns()
+        timed_page = st.selectbox(
+            "Page:", ["All pages"] + (list(recorded['page'].unique()) if not recorded.empty else [])
+        )
+        timings = perf_recorder.stage_percentiles(None if timed_page == "All pages" else timed_page)
+        if timings.empty:
+            st.info("No reruns recorded yet")
+        else:
+            st.dataframe(timings, use_container_width=True)
+            fig_stages = px.bar(
+                timings.reset_index(),
+                x='Stage',
+                y=['p50 (ms)', 'p90 (ms)'],
+                barmode='group',
+                title="Stage latency percentiles",
+                labels={'value': 'Milliseconds', 'variable': 'Percentile'}
+            )
+            st.plotly_chart(fig_stages, use_container_width=True)
+            st.caption("Page content is whatever the page drew outside the timed map, chart and export stages.")
+        
+        st.subheader("🗄️ Cache Hit Rates")
+        cache_counts = {f"st.cache_data: {name}": counts for name, counts in perf_recorder.cache_stats().items()}
+        cache_counts["Rendered maps"] = get_map_cache().stats()
+        cache_counts["Downsampled chart series"] = get_series_cache().stats()
+        cache_table = pd.DataFrame.from_dict(cache_counts, orient='index')[['hits', 'misses']]
+        lookups = cache_table['hits'] + cache_table['misses']
+        cache_table['hit_rate'] = (cache_table['hits'] / lookups.where(lookups > 0) * 100).round(1)
+        cache_table.columns = ['Hits', 'Misses', 'Hit Rate (%)']
+        st.dataframe(cache_table, use_container_width=True)
+        
+        if not recorded.empty:
+            st.subheader("📋 Recent Reruns (ms)")
+            recent = recorded.tail(20).iloc[::-1].set_index('finished')
+            stage_columns = recent.columns.drop('page')
+            recent[stage_columns] = (recent[stage_columns] * 1000).round(1)
+            st.dataframe(recent, use_container_width=True)
+        
+        if st.button("🧹 Reset Timings"):
+            perf_recorder.reset()
+            st.rerun()
+    
+    # Everything the page drew outside its timed stages: charts, tables and widgets
+    rerun.checkpoint("page content")
     
     # Enhanced footer with professional information
     st.markdown("---")
@@ -1759,6 +1969,7 @@ def main():
         </div>
     </div>
     """, unsafe_allow_html=True)
+    rerun.finish()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,230 @@
+import numpy as np
+import pandas as pd
+
+WILDCARD = '*'
+
+# Water level thresholds: base + (elevation - elevation_ref) * elevation_coef.
+# Rows are matched on (station_type, climate_zone), falling back to wildcards.
+# The first row of each station type is its reference rule (see set_levels).
+DEFAULT_LEVEL_RULES = [
+    # station_type, climate_zone, flood_base, drought_base, elevation_ref, elevation_coef
+    ('Lake Level', 'Tropical', 1178, 1172, 1100, 0.1),
+    ('Lake Level', 'Tropical Highland', 1178, 1172, 1100, 0.1),
+    ('Lake Level', WILDCARD, 1176, 1174, 1100, 0.1),
+    ('River Flow', WILDCARD, 480, 320, 0, 0.2),
+    (WILDCARD, WILDCARD, 580, 420, 0, 0.15)
+]
+
+DEFAULT_LIMITS = {
+    # Severity bands relative to the water level thresholds
+    'flood_critical_ratio': 1.05,
+    'flood_high_ratio': 1.02,
+    'drought_critical_ratio': 0.95,
+    'drought_high_ratio': 0.98,
+    # Absolute limits (%) for data quality and battery level
+    'quality_warning': 80,
+    'quality_high': 70,
+    'quality_critical': 60,
+    'battery_warning': 30,
+    'battery_high': 25,
+    'battery_critical': 15
+}
+
+ALERT_COLUMNS = [
+    'type', 'severity', 'parameter', 'current_value', 'threshold', 'exceedance',
+    'station_id', 'station_name', 'country', 'station_type', 'timestamp', 'coordinates'
+]
+
+# Rule kind -> (alert type, parameter, reading column, value format, exceedance format)
+ALERT_RULES = {
+    'flood': ('Flood Warning', 'Water Level', 'water_level', '{:.2f}m', '{:.1f}%'),
+    'drought': ('Drought Warning', 'Water Level', 'water_level', '{:.2f}m', '{:.1f}%'),
+    'quality': ('Data Quality Alert', 'Data Quality', 'data_quality', '{:.1f}%', '{:.1f}%'),
+    'battery': ('Battery Alert', 'Battery Level', 'battery_level', '{:.0f}%', '{:.0f}%')
+}
+
+# Alert ordering within a station (flood and drought are mutually exclusive)
+RULE_ORDER = {'flood': 0, 'drought': 0, 'quality': 1, 'battery': 2}
+
+SEVERITY_NAMES = np.array(['', 'Medium', 'High', 'Critical'], dtype=object)
+
+STATION_COLUMNS = ['station_id', 'name', 'country', 'type', 'climate_zone',
+                   'elevation', 'latitude', 'longitude']
+
+
+class AlertRuleTable:
+    """Alert thresholds keyed by station type and climate zone"""
+
+    def __init__(self, level_rules=None, limits=None):
+        self.levels = pd.DataFrame(
+            level_rules or DEFAULT_LEVEL_RULES,
+            columns=['station_type', 'climate_zone', 'flood_base', 'drought_base',
+                     'elevation_ref', 'elevation_coef']
+        ).astype({'flood_base': float, 'drought_base': float})
+        self.limits = dict(DEFAULT_LIMITS, **(limits or {}))
+
+    def reference_levels(self, station_type):
+        """Return (flood_base, drought_base) of the type's reference rule"""
+        row = self.levels[self.levels['station_type'] == station_type].iloc[0]
+        return row['flood_base'], row['drought_base']
+
+    def set_levels(self, station_type, flood=None, drought=None):
+        """Move a station type's thresholds so its reference rule matches the given levels
+
+        Every rule of the type is shifted by the same amount, which keeps the
+        offsets between climate zones.
+        """
+        rows = self.levels['station_type'] == station_type
+        flood_ref, drought_ref = self.reference_levels(station_type)
+        if flood is not None:
+            self.levels.loc[rows, 'flood_base'] += flood - flood_ref
+        if drought is not None:
+            self.levels.loc[rows, 'drought_base'] += drought - drought_ref
+
+    def set_limits(self, **limits):
+        """Update quality/battery limits, keeping high between critical and warning"""
+        self.limits.update(limits)
+        for prefix in ('quality', 'battery'):
+            low = self.limits[f'{prefix}_critical']
+            high = self.limits[f'{prefix}_warning']
+            self.limits[f'{prefix}_high'] = min(max(self.limits[f'{prefix}_high'], low), high)
+
+    def resolve(self, stations_df):
+        """Attach flood/drought thresholds to each station in one merge"""
+        keys = stations_df[['type', 'climate_zone']].drop_duplicates()
+
+        # Match the most specific rule: (type, zone), (type, *), (*, *)
+        resolved = []
+        for station_type, zone in keys.itertuples(index=False):
+            resolved.append((station_type, zone) + self._match(station_type, zone))
+        rule_frame = pd.DataFrame(
+            resolved,
+            columns=['type', 'climate_zone', 'flood_base', 'drought_base',
+                     'elevation_ref', 'elevation_coef']
+        )
+
+        merged = stations_df.merge(rule_frame, on=['type', 'climate_zone'], how='left')
+        elevation_term = (merged['elevation'] - merged['elevation_ref']) * merged['elevation_coef']
+        merged['flood_threshold'] = merged['flood_base'] + elevation_term
+        merged['drought_threshold'] = merged['drought_base'] + elevation_term
+        return merged
+
+    def _match(self, station_type, zone):
+        levels = self.levels
+        for type_key, zone_key in ((station_type, zone), (station_type, WILDCARD), (WILDCARD, WILDCARD)):
+            match = levels[(levels['station_type'] == type_key) & (levels['climate_zone'] == zone_key)]
+            if not match.empty:
+                row = match.iloc[0]
+                return (row['flood_base'], row['drought_base'], row['elevation_ref'], row['elevation_coef'])
+        return (np.nan, np.nan, 0, 0)
+
+
+def classify_readings(readings_df, stations_df, rules=None):
+    """Join thresholds onto readings and grade every rule for every reading
+
+    Adds <kind>_threshold, <kind>_severity (0 none, 1 Medium, 2 High,
+    3 Critical) and numeric <kind>_exceedance columns for each rule kind.
+    """
+    rules = rules or AlertRuleTable()
+    limits = rules.limits
+    data = readings_df.merge(rules.resolve(stations_df[STATION_COLUMNS]), on='station_id', how='inner')
+
+    level = data['water_level'].to_numpy(dtype=float)
+    flood = data['flood_threshold'].to_numpy(dtype=float)
+    drought = data['drought_threshold'].to_numpy(dtype=float)
+    quality = data['data_quality'].to_numpy(dtype=float)
+
+    # Water level rules (a flood reading cannot also raise a drought alert)
+    flooded = level > flood
+    data['flood_severity'] = np.where(flooded, np.select(
+        [level > flood * limits['flood_critical_ratio'], level > flood * limits['flood_high_ratio']],
+        [3, 2], 1
+    ), 0)
+    data['flood_exceedance'] = (level / flood - 1) * 100
+
+    data['drought_severity'] = np.where(~flooded & (level < drought), np.select(
+        [level < drought * limits['drought_critical_ratio'], level < drought * limits['drought_high_ratio']],
+        [3, 2], 1
+    ), 0)
+    data['drought_exceedance'] = (1 - level / drought) * 100
+
+    # Data quality and battery rules use absolute limits
+    data['quality_threshold'] = float(limits['quality_warning'])
+    data['quality_severity'] = np.select(
+        [quality < limits['quality_critical'], quality < limits['quality_high'],
+         quality < limits['quality_warning']],
+        [3, 2, 1], 0
+    )
+    data['quality_exceedance'] = limits['quality_warning'] - quality
+
+    if 'battery_level' in data.columns:
+        battery = data['battery_level'].to_numpy(dtype=float)
+        data['battery_threshold'] = float(limits['battery_warning'])
+        data['battery_severity'] = np.select(
+            [battery < limits['battery_critical'], battery < limits['battery_high'],
+             battery < limits['battery_warning']],
+            [3, 2, 1], 0
+        )
+        data['battery_exceedance'] = limits['battery_warning'] - battery
+
+    return data
+
+
+def rule_kinds(data):
+    """Rule kinds that were graded for a classified frame"""
+    return [kind for kind in ALERT_RULES if f'{kind}_severity' in data.columns]
+
+
+def format_alert_values(kind, value, threshold, exceedance):
+    """Format (current_value, threshold, exceedance) the way alerts display them"""
+    _, _, _, value_format, exceedance_format = ALERT_RULES[kind]
+    return value_format.format(value), value_format.format(threshold), exceedance_format.format(exceedance)
+
+
+def evaluate_alerts(latest_df, stations_df, rules=None):
+    """Evaluate flood, drought, quality and battery rules for the latest readings
+
+    latest_df holds one row per station. Thresholds are joined on once and
+    every rule is evaluated as an array expression; the result has one row
+    per alert with the ALERT_COLUMNS fields.
+    """
+    data = classify_readings(latest_df, stations_df, rules)
+    if data.empty:
+        return pd.DataFrame(columns=ALERT_COLUMNS)
+
+    frames = [_alert_frame(data, kind) for kind in rule_kinds(data)]
+    alerts = pd.concat(frames, ignore_index=True)
+    alerts = alerts.sort_values(['_station_order', '_rule_order'], kind='stable')
+    return alerts[ALERT_COLUMNS].reset_index(drop=True)
+
+
+def _alert_frame(data, kind):
+    """Build the alert rows of one rule kind for the readings that breach it"""
+    alert_type, parameter, column, _, _ = ALERT_RULES[kind]
+    rows = np.flatnonzero(data[f'{kind}_severity'].to_numpy() > 0)
+    selected = data.iloc[rows]
+
+    formatted = [
+        format_alert_values(kind, value, threshold, exceedance)
+        for value, threshold, exceedance in zip(
+            selected[column], selected[f'{kind}_threshold'], selected[f'{kind}_exceedance']
+        )
+    ]
+    current_values, thresholds, exceedances = zip(*formatted) if formatted else ((), (), ())
+
+    return pd.DataFrame({
+        'type': alert_type,
+        'severity': SEVERITY_NAMES[selected[f'{kind}_severity'].to_numpy()],
+        'parameter': parameter,
+        'current_value': list(current_values),
+        'threshold': list(thresholds),
+        'exceedance': list(exceedances),
+        'station_id': selected['station_id'].to_numpy(),
+        'station_name': selected['name'].to_numpy(),
+        'country': selected['country'].to_numpy(),
+        'station_type': selected['type'].to_numpy(),
+        'timestamp': selected['timestamp'].to_numpy(),
+        'coordinates': [[lat, lon] for lat, lon in zip(selected['latitude'], selected['longitude'])],
+        '_station_order': rows,
+        '_rule_order': RULE_ORDER[kind]
+    }, index=range(len(rows)))
@@ -0,0 +1,225 @@
+from collections import deque
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
+
+from src.alerts.alert_engine import (
+    ALERT_RULES, RULE_ORDER, SEVERITY_NAMES, AlertRuleTable,
+    classify_readings, format_alert_values, rule_kinds
+)
+
+DEFAULT_HYSTERESIS = {
+    'level': 0.01,   # Water level must move 1% back inside its threshold to clear
+    'quality': 2.0,  # Quality/battery must recover 2 points above the warning limit
+    'battery': 2.0
+}
+
+# Readings of every station graded on warm-up, however old: one reading cannot
+# show a breach lasting min_duration, and a Daily station has one per lookback
+WARMUP_READINGS = 2
+
+
+class IncrementalAlertEvaluator:
+    """Stateful alert evaluation over a growing stream of readings
+
+    Only readings newer than the watermark are graded on each update.
+    An alert opens once its rule has been breached for min_duration and
+    closes once the reading has been back inside the hysteresis band for
+    min_duration, so values hovering around a threshold do not flap.
+    Every transition is emitted as an open, escalate or close event.
+    """
+
+    def __init__(self, stations_df, rules=None, hysteresis=None,
+                 min_duration=timedelta(hours=1), lookback=timedelta(hours=24), max_events=1000):
+        self.stations = stations_df.set_index('station_id')
+        # Station fields of the alert records, looked up per open alert
+        self._station_info = self.stations[['name', 'country', 'type', 'latitude', 'longitude']].to_dict('index')
+        self._stations_df = stations_df
+        self.rules = rules or AlertRuleTable()
+        self.hysteresis = dict(DEFAULT_HYSTERESIS, **(hysteresis or {}))
+        self.min_duration = pd.Timedelta(min_duration).value
+        self.lookback = lookback
+        self.watermark = None
+        # (station_id, rule kind) -> pending or open alert state (see _closed_state)
+        self.state = {}
+        self.events = deque(maxlen=max_events)
+
+    def update(self, measurements_df):
+        """Grade readings newer than the watermark and return the emitted events"""
+        if measurements_df.empty:
+            return []
+
+        timestamps = measurements_df['timestamp']
+        if self.watermark is None:
+            # Warm up from recent history only; older readings cannot change current state
+            recent = timestamps > timestamps.max() - self.lookback
+            new_rows = measurements_df[recent | _warmup_backfill(measurements_df, recent, WARMUP_READINGS)]
+        else:
+            new_rows = measurements_df[timestamps > self.watermark]
+        if new_rows.empty:
+            return []
+
+        data = classify_readings(new_rows, self._stations_df, self.rules)
+        data = data.sort_values(['station_id', 'timestamp'], kind='stable', ignore_index=True)
+        self.watermark = new_rows['timestamp'].max()
+        if data.empty:
+            return []  # Only readings of stations outside the registry
+
+        events = []
+        station_ids = data['station_id'].to_numpy()
+        timestamps = data['timestamp'].to_numpy(dtype='datetime64[ns]')
+        boundaries = np.flatnonzero(station_ids[1:] != station_ids[:-1]) + 1
+        starts = np.concatenate([[0], boundaries])
+        stops = np.concatenate([boundaries, [len(data)]])
+
+        for kind in rule_kinds(data):
+            readings = (
+                timestamps,
+                data[f'{kind}_severity'].to_numpy(),
+                self._clear_mask(data, kind),
+                data[ALERT_RULES[kind][2]].to_numpy(dtype=float),
+                data[f'{kind}_threshold'].to_numpy(dtype=float),
+                data[f'{kind}_exceedance'].to_numpy(dtype=float)
+            )
+            breached = np.add.reduceat(readings[1] > 0, starts) > 0
+
+            for start, stop, has_breach in zip(starts, stops, breached):
+                key = (station_ids[start], kind)
+                if not has_breach and key not in self.state:
+                    continue  # Nothing pending or open for this station and rule
+                events.extend(self._advance(key, readings, start, stop))
+
+        self.events.extend(events)
+        return events
+
+    def active_alerts(self):
+        """Open alerts in the same record format as evaluate_alerts"""
+        alerts = []
+        ordered = sorted(self.state.items(), key=lambda item: (item[0][0], RULE_ORDER[item[0][1]]))
+        for (station_id, kind), state in ordered:
+            if not state['opened']:
+                continue
+            alert_type, parameter, _, _, _ = ALERT_RULES[kind]
+            timestamp, value, threshold, exceedance = state['reading']
+            current_value, threshold_text, exceedance_text = format_alert_values(kind, value, threshold, exceedance)
+            station = self._station_info[station_id]
+            alerts.append({
+                'type': alert_type,
+                'severity': SEVERITY_NAMES[state['severity']],
+                'parameter': parameter,
+                'current_value': current_value,
+                'threshold': threshold_text,
+                'exceedance': exceedance_text,
+                'station_id': station_id,
+                'station_name': station['name'],
+                'country': station['country'],
+                'station_type': station['type'],
+                'timestamp': pd.Timestamp(timestamp),
+                'coordinates': [station['latitude'], station['longitude']]
+            })
+        return alerts
+
+    def open_count(self):
+        """Number of open alerts, without formatting them"""
+        return sum(1 for state in self.state.values() if state['opened'])
+
+    def events_frame(self):
+        """Recent events, newest first"""
+        return pd.DataFrame(list(self.events)[::-1],
+                            columns=['event', 'station_id', 'type', 'severity', 'timestamp', 'value'])
+
+    def _clear_mask(self, data, kind):
+        """Readings far enough inside the threshold to count towards closing an alert"""
+        threshold = data[f'{kind}_threshold'].to_numpy(dtype=float)
+        value = data[ALERT_RULES[kind][2]].to_numpy(dtype=float)
+        if kind == 'flood':
+            return value <= threshold * (1 - self.hysteresis['level'])
+        if kind == 'drought':
+            return value >= threshold * (1 + self.hysteresis['level'])
+        return value >= threshold + self.hysteresis[kind]
+
+    def _advance(self, key, readings, start, stop):
+        """Run one station's new readings for one rule through its state machine"""
+        timestamps, severity, clear, values, thresholds, exceedances = readings
+        times = timestamps.view(np.int64)
+        state = self.state.get(key) or _closed_state()
+        events = []
+
+        for row in range(start, stop):
+            level = severity[row]
+            now = times[row]
+
+            if not state['opened']:
+                if level == 0:
+                    state = _closed_state()
+                    continue
+                if state['breach_since'] is None:
+                    state['breach_since'] = now
+                state['severity'] = max(state['severity'], level)
+                if now - state['breach_since'] >= self.min_duration:
+                    state['opened'] = True
+                    events.append(self._event('open', key, state['severity'], timestamps[row], values[row]))
+            elif clear[row]:
+                if state['clear_since'] is None:
+                    state['clear_since'] = now
+                if now - state['clear_since'] >= self.min_duration:
+                    events.append(self._event('close', key, state['severity'], timestamps[row], values[row]))
+                    state = _closed_state()
+                    continue
+            else:
+                state['clear_since'] = None
+                if level > state['severity']:
+                    state['severity'] = level
+                    events.append(self._event('escalate', key, level, timestamps[row], values[row]))
+
+            state['reading'] = (timestamps[row], values[row], thresholds[row], exceedances[row])
+
+        if state['opened'] or state['breach_since'] is not None:
+            self.state[key] = state
+        else:
+            self.state.pop(key, None)
+        return events
+
+    @staticmethod
+    def _event(event, key, severity, timestamp, value):
+        station_id, kind = key
+        return {
+            'event': event,
+            'station_id': station_id,
+            'type': ALERT_RULES[kind][0],
+            'severity': SEVERITY_NAMES[severity],
+            'timestamp': pd.Timestamp(timestamp),
+            'value': value
+        }
+
+
+def _warmup_backfill(measurements_df, recent, count):
+    """Mask of the count latest readings of the stations with fewer than count recent ones
+
+    Only those stations (Daily ones, or stations that stopped reporting)
+    are grouped, never the full history of the rest of the fleet.
+    """
+    station_ids = measurements_df['station_id']
+    recent_counts = station_ids[recent].value_counts()
+    short = ~station_ids.isin(recent_counts.index[recent_counts >= count]).to_numpy()
+    backfill = np.zeros(len(measurements_df), dtype=bool)
+    if short.any():
+        backfill[short] = _latest_readings(measurements_df[short], count).to_numpy()
+    return backfill
+
+
+def _latest_readings(measurements_df, count):
+    """Mask of the count most recent readings of every station"""
+    station_ids = measurements_df['station_id']
+    remaining = measurements_df['timestamp']
+    latest = pd.Series(False, index=measurements_df.index)
+    for _ in range(count):
+        newest = remaining.groupby(station_ids, sort=False, observed=True).transform('max')
+        latest |= remaining == newest
+        remaining = remaining.mask(latest)
+    return latest
+
+
+def _closed_state():
+    return {'severity': 0, 'opened': False, 'breach_since': None, 'clear_since': None, 'reading': None}
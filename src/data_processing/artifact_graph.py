@@ -0,0 +1,44 @@
+class ArtifactGraph:
+    """Named artifacts derived from a dataset snapshot, built lazily on demand
+
+    Each page declares the artifacts it reads; resolve() builds those and
+    whatever they require, nothing else. Shared artifacts are memoized on the
+    snapshot, so every session reuses them until that version is evicted.
+    Session artifacts depend on per-session state (alert thresholds, say)
+    and are rebuilt on every resolve from their memoized requirements.
+    """
+
+    def __init__(self):
+        self._builders = {}
+
+    def artifact(self, name, requires=(), shared=True):
+        """Decorator registering build(snapshot, *required_artifacts) under a name"""
+        def register(build):
+            self._builders[name] = (build, tuple(requires), shared)
+            return build
+        return register
+
+    def resolve(self, names, snapshot):
+        """Dict of the named artifacts for a snapshot"""
+        resolved = {}
+        return {name: self._resolve(name, snapshot, resolved, ()) for name in names}
+
+    def names(self):
+        return list(self._builders)
+
+    def _resolve(self, name, snapshot, resolved, path):
+        if name in resolved:
+            return resolved[name]
+        if name in path:
+            raise ValueError(f"Artifact dependency cycle: {' -> '.join(path + (name,))}")
+        if name not in self._builders:
+            raise KeyError(f"Unknown artifact {name}")
+        build, requires, shared = self._builders[name]
+
+        def build_artifact():
+            # Requirements are only resolved when the artifact itself has to be built
+            inputs = [self._resolve(required, snapshot, resolved, path + (name,)) for required in requires]
+            return build(snapshot, *inputs)
+
+        resolved[name] = snapshot.artifact(name, build_artifact) if shared else build_artifact()
+        return resolved[name]
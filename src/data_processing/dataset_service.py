@@ -0,0 +1,107 @@
+import threading
+import time
+from collections import OrderedDict
+
+import pandas as pd
+
+# Snapshots are shared without copying, which is only safe under copy-on-write:
+# always on from pandas 3, opt-in on pandas 2
+if int(pd.__version__.split('.')[0]) < 3:
+    pd.set_option('mode.copy_on_write', True)
+
+
+class DatasetSnapshot:
+    """One immutable version of the station and measurement tables
+
+    Frames are handed out as they are, without copying. pandas copy-on-write
+    keeps them read-only in practice: a session that modifies a frame it was
+    given modifies its own copy, never the snapshot. Structures derived from
+    the frames are memoized per snapshot and go away with it.
+    """
+
+    def __init__(self, version_id, stations, measurements):
+        self.version_id = version_id
+        self.stations = stations
+        self.measurements = measurements
+        self.created_at = time.time()
+        self.nbytes = int(stations.memory_usage(deep=True).sum() + measurements.memory_usage(deep=True).sum())
+        self.artifacts = {}
+        self._lock = threading.Lock()
+        self._artifact_locks = {}
+
+    def artifact(self, name, build):
+        """Derived structure of this version, built by the first caller and shared after"""
+        with self._lock:
+            lock = self._artifact_locks.setdefault(name, threading.Lock())
+        # Concurrent sessions asking for the same artifact wait for one build
+        with lock:
+            if name not in self.artifacts:
+                self.artifacts[name] = build()
+            return self.artifacts[name]
+
+    def __repr__(self):
+        return (f"DatasetSnapshot({self.version_id}, {len(self.stations)} stations, "
+                f"{len(self.measurements):,} readings, {self.nbytes / 1e6:.1f} MB)")
+
+
+class DatasetService:
+    """Process-wide registry of dataset snapshots addressed by version ID
+
+    Every session reads the same snapshot objects, so concurrent operators
+    share one copy of the data. Snapshots beyond the memory budget are
+    evicted least recently used first; the latest version is never evicted.
+    """
+
+    def __init__(self, memory_budget_bytes=1024 * 1024 * 1024):
+        self.memory_budget_bytes = memory_budget_bytes
+        self.latest_version = None
+        self.evictions = 0
+        self._snapshots = OrderedDict()
+        self._counter = 0
+        self._lock = threading.Lock()
+
+    def publish(self, stations_df, measurements_df):
+        """Register a new version and make it the latest"""
+        with self._lock:
+            self._counter += 1
+            snapshot = DatasetSnapshot(f"v{self._counter}", stations_df, measurements_df)
+            self._snapshots[snapshot.version_id] = snapshot
+            self.latest_version = snapshot.version_id
+            self._evict()
+        return snapshot
+
+    def get(self, version_id=None):
+        """Snapshot of a version (the latest by default); KeyError once evicted"""
+        with self._lock:
+            version_id = version_id or self.latest_version
+            if version_id not in self._snapshots:
+                raise KeyError(f"Dataset version {version_id} is not available")
+            self._snapshots.move_to_end(version_id)
+            return self._snapshots[version_id]
+
+    def versions(self):
+        return list(self._snapshots)
+
+    def memory_usage(self):
+        return sum(snapshot.nbytes for snapshot in self._snapshots.values())
+
+    def stats(self):
+        used = self.memory_usage()
+        return {
+            'versions': len(self._snapshots),
+            'latest_version': self.latest_version,
+            'bytes': used,
+            'budget_bytes': self.memory_budget_bytes,
+            'over_budget': used > self.memory_budget_bytes,
+            'evictions': self.evictions
+        }
+
+    def _evict(self):
+        used = self.memory_usage()
+        for version_id in list(self._snapshots):
+            if used <= self.memory_budget_bytes:
+                break
+            if version_id == self.latest_version:
+                continue
+            used -= self._snapshots.pop(version_id).nbytes
+            self.evictions += 1
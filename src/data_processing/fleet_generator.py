@@ -0,0 +1,285 @@
+"""Synthetic station fleet of any size, generated in parallel into a measurement store
+
+Usage:
+    python -m src.data_processing.fleet_generator data/processed/fleet --stations 10000 --days 365 --frequency Hourly
+    NBI_FLEET_DIR=data/processed/fleet streamlit run main.py
+"""
+import argparse
+import json
+import os
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.data_processing.measurement_generator import FREQUENCY_STEPS, MeasurementGenerator
+from src.data_processing.measurement_store import MeasurementStore
+
+# Per-country location, default station count, water bodies, elevation and climate of the network
+COUNTRY_PROFILES = {
+    'Uganda': {
+        'center': [1.3733, 32.2903],
+        'stations': 8,
+        'major_features': ['Lake Victoria', 'Victoria Nile', 'Lake Kyoga'],
+        'avg_elevation': 1100,
+        'climate': 'Tropical'
+    },
+    'Kenya': {
+        'center': [0.0236, 37.9062],
+        'stations': 6,
+        'major_features': ['Lake Victoria (Kenyan part)', 'Ewaso Ng\'iro'],
+        'avg_elevation': 1795,
+        'climate': 'Arid/Semi-arid'
+    },
+    'Tanzania': {
+        'center': [-6.3690, 34.8888],
+        'stations': 7,
+        'major_features': ['Lake Victoria', 'Kagera River', 'Mara River'],
+        'avg_elevation': 1018,
+        'climate': 'Tropical'
+    },
+    'Rwanda': {
+        'center': [-1.9403, 29.8739],
+        'stations': 4,
+        'major_features': ['Nyabarongo River', 'Akagera River'],
+        'avg_elevation': 1598,
+        'climate': 'Temperate'
+    },
+    'Burundi': {
+        'center': [-3.3731, 29.9189],
+        'stations': 3,
+        'major_features': ['Ruvubu River', 'Ruvyironza River'],
+        'avg_elevation': 1504,
+        'climate': 'Tropical Highland'
+    },
+    'Ethiopia': {
+        'center': [9.1450, 40.4897],
+        'stations': 12,
+        'major_features': ['Blue Nile', 'Lake Tana', 'Atbara River'],
+        'avg_elevation': 1330,
+        'climate': 'Highland/Arid'
+    },
+    'Sudan': {
+        'center': [12.8628, 30.2176],
+        'stations': 8,
+        'major_features': ['Main Nile', 'Blue Nile', 'White Nile Confluence'],
+        'avg_elevation': 568,
+        'climate': 'Arid'
+    },
+    'South Sudan': {
+        'center': [6.8770, 31.3070],
+        'stations': 5,
+        'major_features': ['White Nile', 'Bahr el Ghazal', 'Sobat River'],
+        'avg_elevation': 400,
+        'climate': 'Tropical'
+    },
+    'DRC': {
+        'center': [-4.0383, 21.7587],
+        'stations': 4,
+        'major_features': ['Lake Albert tributaries'],
+        'avg_elevation': 726,
+        'climate': 'Tropical'
+    },
+    'Egypt': {
+        'center': [26.0975, 31.2357],
+        'stations': 3,
+        'major_features': ['Main Nile', 'Lake Nasser', 'Nile Delta'],
+        'avg_elevation': 321,
+        'climate': 'Arid'
+    }
+}
+
+# Station types and their weights where the country's features include lakes, and where not
+LAKE_STATION_TYPES = {'Lake Level': 0.4, 'River Flow': 0.4, 'Reservoir': 0.2}
+RIVER_STATION_TYPES = {'River Flow': 0.6, 'Groundwater': 0.2, 'Reservoir': 0.2}
+
+STATUS_WEIGHTS = {'Active': 0.82, 'Maintenance': 0.12, 'Offline': 0.04, 'Calibration': 0.02}
+
+TRANSMISSION_WEIGHTS = {'GPRS': 0.3, 'Satellite': 0.4, 'Both': 0.3}
+
+STATIONS_FILE = 'stations.parquet'
+
+MEASUREMENTS_DIR = 'measurements'
+
+MANIFEST_NAME = '_fleet.json'  # Written last: a fleet without it is incomplete
+
+MANIFEST_VERSION = 1
+
+
+def allocate_stations(n_stations, profiles=COUNTRY_PROFILES):
+    """Stations per country for a fleet size, in proportion to the profiles' default counts"""
+    weights = np.array([profile['stations'] for profile in profiles.values()], dtype=float)
+    shares = weights / weights.sum() * n_stations
+    counts = np.floor(shares).astype(int)
+    # Largest remainders get the stations rounding left over
+    counts[np.argsort(counts - shares)[:n_stations - counts.sum()]] += 1
+    return dict(zip(profiles, counts.tolist()))
+
+
+def generate_stations(n_stations=None, profiles=COUNTRY_PROFILES, seed=None, frequency=None, now=None):
+    """Station registry keeping each country's location, elevation, climate and water bodies
+
+    n_stations defaults to the profiles' own counts; frequency forces one
+    data frequency on every station instead of a random mix.
+    """
+    rng = np.random.default_rng(seed)
+    now = pd.Timestamp(now or datetime.now())
+    counts = (allocate_stations(n_stations, profiles) if n_stations is not None
+              else {country: profile['stations'] for country, profile in profiles.items()})
+    id_width = max(3, len(str(sum(counts.values()))))
+    frames = []
+    first_number = 1
+
+    for country, profile in profiles.items():
+        count = counts[country]
+        if not count:
+            continue
+        features = np.array(profile['major_features'])
+        station_types = LAKE_STATION_TYPES if any('Lake' in feature for feature in features) else RIVER_STATION_TYPES
+        numbers = range(first_number, first_number + count)
+        frames.append(pd.DataFrame({
+            'station_id': [f"NBI-{country[:3].upper()}-{number:0{id_width}d}" for number in numbers],
+            'name': [f"{feature.split()[0]} Station {i + 1}" for i, feature in enumerate(rng.choice(features, count))],
+            'country': country,
+            'latitude': profile['center'][0] + rng.uniform(-0.8, 0.8, count),
+            'longitude': profile['center'][1] + rng.uniform(-0.8, 0.8, count),
+            'elevation': profile['avg_elevation'] + rng.uniform(-200, 200, count),
+            'type': rng.choice(list(station_types), count, p=list(station_types.values())),
+            'status': rng.choice(list(STATUS_WEIGHTS), count, p=list(STATUS_WEIGHTS.values())),
+            'installation_date': now - pd.to_timedelta(rng.integers(365, 3651, count), unit='D'),
+            'transmission_method': rng.choice(list(TRANSMISSION_WEIGHTS), count, p=list(TRANSMISSION_WEIGHTS.values())),
+            'data_frequency': frequency or rng.choice(list(FREQUENCY_STEPS), count),
+            'climate_zone': profile['climate'],
+            'major_feature': rng.choice(features, count)
+        }))
+        first_number += count
+
+    return pd.concat(frames, ignore_index=True)
+
+
+class FleetGenerator:
+    """Generate a fleet and its history in parallel, one country per worker at a time
+
+    The station registry is built up front; each country's readings are
+    then generated by a worker process in blocks of stations and appended
+    straight to the country's (country, day) partitions of the measurement
+    store, so no process holds more than one block. Every country draws
+    from its own seed, so the data does not depend on the worker count.
+    """
+
+    def __init__(self, root, n_stations, days=365, frequency=None, workers=None,
+                 seed=None, chunk_rows=4_000_000):
+        self.root = Path(root)
+        self.n_stations = n_stations
+        self.days = days
+        self.frequency = frequency
+        self.workers = workers or os.cpu_count()
+        self.seed = seed
+        self.chunk_rows = chunk_rows
+
+    def run(self, end_time=None, overwrite=False, progress=print):
+        """Generate the fleet and return its manifest (stations, rows, seconds, rows_per_second, ...)"""
+        store_root = self.root / MEASUREMENTS_DIR
+        if store_root.exists() and any(store_root.iterdir()):
+            if not overwrite:
+                raise FileExistsError(f"{store_root} already holds measurements; pass overwrite=True to replace them")
+            shutil.rmtree(store_root)
+        (self.root / MANIFEST_NAME).unlink(missing_ok=True)
+
+        end_time = end_time or datetime.now()
+        seeds = np.random.SeedSequence(self.seed).spawn(len(COUNTRY_PROFILES) + 1)
+        stations_df = generate_stations(self.n_stations, seed=seeds[0], frequency=self.frequency, now=end_time)
+        self.root.mkdir(parents=True, exist_ok=True)
+        stations_df.to_parquet(self.root / STATIONS_FILE, index=False)
+
+        started = time.perf_counter()
+        rows = 0
+        countries = stations_df.groupby('country', sort=False)
+        # Largest countries first, so the small ones fill in around them
+        shards = sorted(countries.groups, key=lambda country: -len(countries.groups[country]))
+        country_seeds = dict(zip(COUNTRY_PROFILES, seeds[1:]))
+
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            futures = {
+                pool.submit(generate_country, countries.get_group(country), self.days, country_seeds[country],
+                            end_time, str(store_root), self.chunk_rows): country
+                for country in shards
+            }
+            for done, future in enumerate(as_completed(futures), 1):
+                result = future.result()
+                rows += result['rows']
+                elapsed = time.perf_counter() - started
+                progress(f"[{done}/{len(shards)}] {futures[future]}: {result['stations']:,} stations, "
+                         f"{result['rows']:,} rows in {result['seconds']:.1f}s; {rows / elapsed:,.0f} rows/s overall")
+
+        seconds = time.perf_counter() - started
+        manifest = {
+            'version': MANIFEST_VERSION,
+            'stations': len(stations_df),
+            'days': self.days,
+            'frequency': self.frequency,
+            'seed': self.seed,
+            'end_time': pd.Timestamp(end_time).isoformat(),
+            'rows': rows,
+            'seconds': seconds,
+            'rows_per_second': rows / seconds if seconds else 0.0
+        }
+        with open(self.root / MANIFEST_NAME, 'w') as f:
+            json.dump(manifest, f, indent=2)
+        return manifest
+
+
+def generate_country(stations_df, days, seed, end_time, store_root, chunk_rows):
+    """Worker: generate and append the readings of one country's stations"""
+    started = time.perf_counter()
+    store = MeasurementStore(store_root)
+    code = stations_df['country'].iloc[0][:3].upper()
+    rows = 0
+    generator = MeasurementGenerator(days=days, seed=seed, chunk_rows=chunk_rows)
+    for number, chunk in enumerate(generator.iter_chunks(stations_df, end_time=end_time)):
+        rows += store.append(chunk, stations_df, f"fleet-{code}-{number:05d}")
+    return {'stations': len(stations_df), 'rows': rows, 'seconds': time.perf_counter() - started}
+
+
+def load_fleet(root, days=None):
+    """Stations and readings of a generated fleet; days keeps only the most recent ones
+
+    Returns (manifest, stations_df, measurements_df). The full history
+    stays in the fleet's measurement store.
+    """
+    root = Path(root)
+    with open(root / MANIFEST_NAME, 'r') as f:
+        manifest = json.load(f)
+    stations_df = pd.read_parquet(root / STATIONS_FILE)
+    end = pd.Timestamp(manifest['end_time'])
+    start = end - timedelta(days=days) if days is not None else None
+    measurements_df = MeasurementStore(root / MEASUREMENTS_DIR).read(start=start)
+    return manifest, stations_df, measurements_df
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('root', help="Output directory (stations, measurement store and manifest)")
+    parser.add_argument('--stations', type=int, default=10000)
+    parser.add_argument('--days', type=int, default=365)
+    parser.add_argument('--frequency', choices=list(FREQUENCY_STEPS), default=None,
+                        help="One data frequency for every station (default: a random mix)")
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--chunk-rows', type=int, default=4_000_000)
+    parser.add_argument('--overwrite', action='store_true', help="Replace a fleet already in the directory")
+    args = parser.parse_args()
+
+    generator = FleetGenerator(args.root, args.stations, days=args.days, frequency=args.frequency,
+                               workers=args.workers, seed=args.seed, chunk_rows=args.chunk_rows)
+    manifest = generator.run(overwrite=args.overwrite)
+    print(f"Generated {manifest['stations']:,} stations and {manifest['rows']:,} readings in "
+          f"{manifest['seconds']:.1f}s ({manifest['rows_per_second']:,.0f} rows/s) into {args.root}")
+
+
+if __name__ == '__main__':
+    main()
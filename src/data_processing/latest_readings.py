@@ -0,0 +1,44 @@
+import pandas as pd
+
+
+class LatestReadingIndex:
+    """Most recent reading of every station, kept up to date on ingest"""
+
+    def __init__(self, measurements_df=None):
+        self.frame = pd.DataFrame()
+        self.version = 0  # Incremented on every update that changes the index
+        self._records = {}
+        if measurements_df is not None:
+            self.update(measurements_df)
+
+    def update(self, measurements_df):
+        """Merge a batch of new readings, keeping the newest row per station"""
+        if measurements_df.empty:
+            return
+
+        # Newest row of each station in the batch (O(batch), no full sort)
+        newest_rows = measurements_df.groupby('station_id', sort=False)['timestamp'].idxmax()
+        newest = measurements_df.loc[newest_rows.to_numpy()].set_index('station_id')
+
+        if self.frame.empty:
+            self.frame = newest.sort_index()
+        else:
+            # Keep existing rows that are newer than the incoming ones
+            current = self.frame.reindex(newest.index)
+            keep_current = current['timestamp'].notna() & (current['timestamp'] >= newest['timestamp'])
+            newest = newest[~keep_current]
+            self.frame = pd.concat([self.frame.drop(newest.index, errors='ignore'), newest]).sort_index()
+
+        self._records = self.frame.to_dict('index')
+        self.version += 1
+
+    def get(self, station_id):
+        """Latest reading of a station as a dict, or None if it never reported"""
+        return self._records.get(station_id)
+
+    def to_frame(self):
+        """One row per station with a station_id column"""
+        return self.frame.reset_index()
+
+    def __len__(self):
+        return len(self.frame)
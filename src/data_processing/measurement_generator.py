@@ -0,0 +1,190 @@
+import numpy as np
+import pandas as pd
+from datetime import datetime, timedelta
+
+# Sampling step and readings per day for each station data frequency
+FREQUENCY_STEPS = {
+    'Hourly': (np.timedelta64(1, 'h'), 24),
+    '6-hourly': (np.timedelta64(6, 'h'), 4),
+    'Daily': (np.timedelta64(1, 'D'), 1)
+}
+
+NORTHERN_COUNTRIES = ['Ethiopia', 'Sudan', 'Egypt']
+
+CLIMATE_MULTIPLIERS = {
+    'Tropical': 1.2,
+    'Arid': 0.7,
+    'Semi-arid': 0.8,
+    'Temperate': 1.0,
+    'Highland': 1.1,
+    'Tropical Highland': 1.15
+}
+
+BASE_TEMPERATURES = {
+    'Tropical': 26,
+    'Arid': 28,
+    'Semi-arid': 24,
+    'Temperate': 18,
+    'Highland': 15,
+    'Tropical Highland': 20
+}
+
+# Uniform data quality ranges by station status (Active depends on transmission)
+ACTIVE_QUALITY_RANGES = {
+    'Both': (95, 99),
+    'Satellite': (90, 97),
+    'GPRS': (85, 95)
+}
+
+STATUS_QUALITY_RANGES = {
+    'Maintenance': (70, 85),
+    'Calibration': (60, 80),
+    'Offline': (0, 30)
+}
+
+
+class MeasurementGenerator:
+    """Batched NumPy engine for synthetic station measurements
+
+    Builds the readings of a whole block of stations at once: timestamps,
+    seasonal/daily factors, noise, temperature and data quality are computed
+    as flat array operations instead of per-reading Python loops.
+    """
+
+    def __init__(self, days=30, seed=None, chunk_rows=2_000_000):
+        self.days = days
+        self.rng = np.random.default_rng(seed)
+        self.chunk_rows = chunk_rows
+
+    def generate(self, stations_df, end_time=None):
+        """Generate measurements for all stations as a single DataFrame"""
+        chunks = list(self.iter_chunks(stations_df, end_time=end_time))
+        if not chunks:
+            return self._empty_frame()
+        return pd.concat(chunks, ignore_index=True)
+
+    def iter_chunks(self, stations_df, end_time=None):
+        """Yield measurement DataFrames for consecutive blocks of stations"""
+        end_time = end_time or datetime.now()
+        base_time = np.datetime64(end_time - timedelta(days=self.days), 'ns')
+
+        points = np.array([
+            FREQUENCY_STEPS.get(freq, FREQUENCY_STEPS['Daily'])[1] * self.days
+            for freq in stations_df['data_frequency']
+        ], dtype=np.int64)
+
+        start = 0
+        while start < len(stations_df):
+            # Grow the block until it reaches the row budget (at least one station)
+            stop = start + 1
+            rows = points[start]
+            while stop < len(stations_df) and rows + points[stop] <= self.chunk_rows:
+                rows += points[stop]
+                stop += 1
+
+            yield self._generate_block(stations_df.iloc[start:stop], points[start:stop], base_time)
+            start = stop
+
+    def _generate_block(self, block, points, base_time):
+        """Compute every reading of a block of stations in one vectorized pass"""
+        n_stations = len(block)
+        total = int(points.sum())
+        rng = self.rng
+
+        # Flat (station, point) layout preserving station order then time order
+        station_idx = np.repeat(np.arange(n_stations), points)
+        offsets = np.concatenate([[0], np.cumsum(points)[:-1]])
+        point_idx = np.arange(total) - np.repeat(offsets, points)
+
+        steps = np.array([
+            FREQUENCY_STEPS.get(freq, FREQUENCY_STEPS['Daily'])[0]
+            for freq in block['data_frequency']
+        ], dtype='timedelta64[ns]')
+        timestamps = base_time + point_idx * steps[station_idx]
+
+        ts_index = pd.DatetimeIndex(timestamps)
+        day_of_year = ts_index.dayofyear.to_numpy()
+        hour_of_day = ts_index.hour.to_numpy()
+
+        # Per-station attributes broadcast to every reading
+        elevation = block['elevation'].to_numpy(dtype=float)[station_idx]
+        station_type = block['type'].to_numpy()
+        climate_zone = block['climate_zone'].to_numpy()
+        status = block['status'].to_numpy()
+        transmission = block['transmission_method'].to_numpy()
+
+        northern = np.isin(block['country'].to_numpy(), NORTHERN_COUNTRIES)[station_idx]
+        seasonal_factor = np.where(
+            northern,
+            1 + 0.4 * np.cos(2 * np.pi * (day_of_year - 60) / 365),  # Peak in Dec-Jan
+            1 + 0.3 * np.sin(2 * np.pi * (day_of_year - 80) / 365)   # Peak in Apr-May
+        )
+        daily_factor = 1 + 0.1 * np.sin(2 * np.pi * hour_of_day / 24)
+
+        # Base values based on station characteristics
+        is_lake = (station_type == 'Lake Level')[station_idx]
+        is_river = (station_type == 'River Flow')[station_idx]
+        base_level = np.select(
+            [is_lake, is_river],
+            [1175 + (elevation - 1100) * 0.1, 300 + elevation * 0.3],
+            400 + elevation * 0.2
+        )
+        flow_low = np.select([is_lake, is_river], [50, 100], 80)
+        flow_high = np.select([is_lake, is_river], [300, 2000], 600)
+        base_flow = rng.uniform(flow_low, flow_high)
+        level_stability = np.select([is_lake, is_river], [0.95, 0.85], 0.9)
+
+        climate_multiplier = np.array(
+            [CLIMATE_MULTIPLIERS.get(zone, 1.0) for zone in climate_zone]
+        )[station_idx]
+
+        level_noise = rng.normal(0, base_level * 0.02)
+        flow_noise = rng.normal(0, base_flow * 0.05)
+
+        pattern = seasonal_factor * daily_factor * climate_multiplier
+        water_level = (base_level * pattern + level_noise) * level_stability
+        flow_rate = (base_flow * pattern + flow_noise) * (2 - level_stability)
+
+        # Temperature based on climate and elevation (-6.5°C per 1000m)
+        base_temp = np.array(
+            [BASE_TEMPERATURES.get(zone, 22) for zone in climate_zone], dtype=float
+        )[station_idx]
+        temperature = (base_temp - (elevation / 1000) * 6.5
+                       + 5 * np.sin(2 * np.pi * day_of_year / 365)
+                       + 8 * np.sin(2 * np.pi * (hour_of_day - 6) / 24)
+                       + rng.normal(0, 1.5, total))
+
+        # Data quality based on transmission method and status
+        quality_bounds = np.array([
+            ACTIVE_QUALITY_RANGES.get(method, ACTIVE_QUALITY_RANGES['GPRS'])
+            if state == 'Active' else STATUS_QUALITY_RANGES.get(state, STATUS_QUALITY_RANGES['Offline'])
+            for state, method in zip(status, transmission)
+        ], dtype=float)[station_idx]
+        data_quality = rng.uniform(quality_bounds[:, 0], quality_bounds[:, 1])
+
+        offline = (status == 'Offline')[station_idx]
+        battery_level = np.where(offline, 0.0, rng.uniform(60, 100, total))
+
+        return pd.DataFrame({
+            'station_id': block['station_id'].to_numpy()[station_idx],
+            'timestamp': timestamps,
+            'water_level': np.maximum(0, water_level),  # Ensure non-negative
+            'flow_rate': np.maximum(0, flow_rate),
+            'temperature': temperature,
+            'data_quality': data_quality,
+            'transmission_status': transmission[station_idx],
+            'battery_level': battery_level
+        })
+
+    @staticmethod
+    def _empty_frame():
+        return pd.DataFrame({
+            'station_id': pd.Series(dtype=object),
+            'timestamp': pd.Series(dtype='datetime64[ns]'),
+            'water_level': pd.Series(dtype=float),
+            'flow_rate': pd.Series(dtype=float),
+            'temperature': pd.Series(dtype=float),
+            'data_quality': pd.Series(dtype=float),
+            'transmission_status': pd.Series(dtype=object),
+            'battery_level': pd.Series(dtype=float)
+        })
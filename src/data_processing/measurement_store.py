@@ -0,0 +1,182 @@
+import os
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+MEASUREMENT_COLUMNS = [
+    'station_id', 'timestamp', 'water_level', 'flow_rate', 'temperature',
+    'data_quality', 'transmission_status', 'battery_level'
+]
+
+# A backfilled year of the whole fleet spans ~10 countries x 365 days in one append
+MAX_APPEND_PARTITIONS = 65536
+
+# Hive-style directory layout: <root>/country=Uganda/day=2025-01-31/part-0.parquet
+PARTITION_SCHEMA = pa.schema([
+    ('country', pa.string()),
+    ('day', pa.string())
+])
+
+
+class MeasurementStore:
+    """Persistent Parquet store for station measurements
+
+    Data is partitioned by country and day, and sorted by station and time
+    inside each file, so readers only touch the partitions of the requested
+    period and Parquet row-group statistics skip other stations' rows.
+    """
+
+    def __init__(self, root="data/processed/measurements"):
+        self.root = Path(root)
+        self._partitioning = ds.partitioning(PARTITION_SCHEMA, flavor='hive')
+
+    def is_empty(self):
+        """True when no partition has been written yet"""
+        return not self.root.exists() or not any(self.root.rglob('*.parquet'))
+
+    def write(self, measurements_df, stations_df, basename='part-{i}.parquet'):
+        """Write measurements, replacing any existing data in the touched partitions"""
+        table = self._to_table(measurements_df, stations_df)
+        if table.num_rows == 0:
+            return 0
+
+        self.root.mkdir(parents=True, exist_ok=True)
+        ds.write_dataset(
+            table,
+            self.root,
+            format='parquet',
+            partitioning=self._partitioning,
+            basename_template=basename,
+            existing_data_behavior='delete_matching',
+            max_rows_per_group=65536
+        )
+        return table.num_rows
+
+    def replace(self, measurements_df, stations_df):
+        """Replace the whole store with the measurements, dropping partitions they do not cover
+
+        The new data is written beside the store and swapped in, so readers
+        see the previous contents until then rather than a half-written
+        store. Anything else under the root (other writers' files, manifests)
+        goes too, so only use it on a store that has a single writer.
+        """
+        staging = self.root.with_name(f"{self.root.name}.staging-{os.getpid()}")
+        retired = self.root.with_name(f"{self.root.name}.retired-{os.getpid()}")
+        shutil.rmtree(staging, ignore_errors=True)
+        rows = MeasurementStore(staging).write(measurements_df, stations_df)
+
+        if self.root.exists():
+            os.replace(self.root, retired)
+        if staging.exists():
+            os.replace(staging, self.root)
+        shutil.rmtree(retired, ignore_errors=True)
+        return rows
+
+    def append(self, measurements_df, stations_df, batch_id):
+        """Add measurements as new files beside the existing ones in their partitions
+
+        batch_id must be unique per call (it names the files), so an append
+        never replaces earlier data.
+        """
+        table = self._to_table(measurements_df, stations_df)
+        if table.num_rows == 0:
+            return 0
+
+        self.root.mkdir(parents=True, exist_ok=True)
+        ds.write_dataset(
+            table,
+            self.root,
+            format='parquet',
+            partitioning=self._partitioning,
+            basename_template=f"{batch_id}-{{i}}.parquet",
+            existing_data_behavior='overwrite_or_ignore',
+            max_rows_per_group=65536,
+            max_partitions=MAX_APPEND_PARTITIONS
+        )
+        return table.num_rows
+
+    def read(self, columns=None, start=None, end=None, station_ids=None, countries=None):
+        """Read measurements in [start, end) for the given stations/countries
+
+        Only the partitions (country, day) overlapping the request are opened
+        and only the requested columns are decoded.
+        """
+        columns = list(columns or MEASUREMENT_COLUMNS)
+        if self.is_empty():
+            return pd.DataFrame(columns=columns)
+
+        dataset = ds.dataset(self.root, format='parquet', partitioning=self._partitioning)
+        expression = self._filter_expression(start, end, station_ids, countries)
+        table = dataset.to_table(columns=columns, filter=expression)
+
+        frame = table.to_pandas()
+        sort_keys = [key for key in ('station_id', 'timestamp') if key in frame.columns]
+        if sort_keys:
+            frame = frame.sort_values(sort_keys, kind='stable', ignore_index=True)
+        return frame
+
+    def iter_read(self, columns=None, start=None, end=None, station_ids=None, countries=None,
+                  chunk_rows=100_000):
+        """read() in chunks of about chunk_rows readings, in store order (country, day, station, time)
+
+        Record batches are decoded as the scan reaches them, so memory stays
+        at about one chunk whatever the size of the period.
+        """
+        columns = list(columns or MEASUREMENT_COLUMNS)
+        if self.is_empty():
+            return
+
+        dataset = ds.dataset(self.root, format='parquet', partitioning=self._partitioning)
+        expression = self._filter_expression(start, end, station_ids, countries)
+        batches, rows = [], 0
+        for batch in dataset.to_batches(columns=columns, filter=expression, batch_size=chunk_rows):
+            if not batch.num_rows:
+                continue
+            batches.append(batch)
+            rows += batch.num_rows
+            if rows >= chunk_rows:
+                yield pa.Table.from_batches(batches).to_pandas()
+                batches, rows = [], 0
+        if batches:
+            yield pa.Table.from_batches(batches).to_pandas()
+
+    @staticmethod
+    def _to_table(measurements_df, stations_df):
+        """Attach partition keys and sort by partition, then station and time"""
+        frame = measurements_df[MEASUREMENT_COLUMNS]
+        country = frame['station_id'].map(stations_df.set_index('station_id')['country'])
+        # Formatting each distinct day once is much cheaper than formatting every timestamp
+        days, day_codes = np.unique(frame['timestamp'].to_numpy().astype('datetime64[D]'), return_inverse=True)
+        # Rows of a partition must be contiguous: the writer otherwise cuts every input
+        # batch into a small row group per partition it touches
+        frame = frame.assign(
+            country=country.astype(str),
+            day=days.astype(str)[day_codes]
+        ).sort_values(['country', 'day', 'station_id', 'timestamp'], kind='stable')
+        return pa.Table.from_pandas(frame, preserve_index=False)
+
+    @staticmethod
+    def _filter_expression(start, end, station_ids, countries):
+        """Build a pyarrow filter; partition keys prune files, the rest row groups"""
+        expression = None
+
+        def combine(current, new):
+            return new if current is None else current & new
+
+        if start is not None:
+            start = pd.Timestamp(start)
+            expression = combine(expression, ds.field('day') >= start.strftime('%Y-%m-%d'))
+            expression = combine(expression, ds.field('timestamp') >= start.to_pydatetime())
+        if end is not None:
+            end = pd.Timestamp(end)
+            expression = combine(expression, ds.field('day') <= end.strftime('%Y-%m-%d'))
+            expression = combine(expression, ds.field('timestamp') < end.to_pydatetime())
+        if countries is not None:
+            expression = combine(expression, ds.field('country').isin(list(countries)))
+        if station_ids is not None:
+            expression = combine(expression, ds.field('station_id').isin(list(station_ids)))
+        return expression
@@ -0,0 +1,193 @@
+import numpy as np
+import pandas as pd
+
+ROLLUP_PARAMETERS = ['water_level', 'flow_rate', 'temperature', 'data_quality', 'battery_level']
+
+# Readings above this data quality count as successful transmissions (as on the dashboard)
+TRANSMISSION_OK_QUALITY = 80
+
+GRAIN_FREQUENCIES = {'hour': 'h', 'day': 'D'}
+
+
+class MeasurementRollups:
+    """Pre-aggregated measurement cubes by (station, hour) and (station, day)
+
+    Each cube holds count, sum, sum of squares, min and max of every
+    parameter, plus the number of readings and of successful transmissions.
+    A network-wide (day, hour of day) cube of counts and sums backs the
+    seasonal profiles. Batches are merged in as they arrive; country,
+    climate-zone, seasonal and quality views are then answered from these
+    small tables instead of the raw readings. Batches must not overlap, as
+    every reading is counted once.
+    """
+
+    def __init__(self, measurements_df=None, parameters=None):
+        self.parameters = list(parameters or ROLLUP_PARAMETERS)
+        self.tables = {grain: pd.DataFrame() for grain in GRAIN_FREQUENCIES}
+        self.profile_table = pd.DataFrame()
+        self.version = 0
+        if measurements_df is not None:
+            self.update(measurements_df)
+
+    def update(self, measurements_df):
+        """Fold a batch of new readings into every cube"""
+        if measurements_df.empty:
+            return
+        for grain in GRAIN_FREQUENCIES:
+            batch = self._aggregate(measurements_df, grain)
+            table = self.tables[grain]
+            if table.empty:
+                self.tables[grain] = batch.sort_index()
+                continue
+            overlap = batch.index.intersection(table.index)
+            if len(overlap):
+                # Only buckets present on both sides need combining
+                merged = _combine(table.loc[overlap], batch.loc[overlap])
+                batch = pd.concat([merged, batch.drop(overlap)])
+                table = table.drop(overlap)
+            self.tables[grain] = pd.concat([table, batch]).sort_index()
+
+        # Hourly cube rows of this batch summed over stations
+        batch = self._profile_rows(measurements_df)
+        if not self.profile_table.empty:
+            batch = pd.concat([self.profile_table, batch]).groupby(level=['day', 'hour']).sum()
+        self.profile_table = batch.sort_index()
+        self.version += 1
+
+    def buckets(self, grain, stations_df=None, start=None, attributes=('country', 'climate_zone')):
+        """Cube rows from start onwards, with station attributes joined on"""
+        table = self.tables[grain]
+        if table.empty:
+            return table
+        if start is not None:
+            bucket_start = pd.Timestamp(start).floor(GRAIN_FREQUENCIES[grain])
+            table = table[table.index.get_level_values('bucket') >= bucket_start]
+        table = table.reset_index()
+        if stations_df is not None:
+            table = table.merge(stations_df[['station_id', *attributes]], on='station_id', how='left')
+        return table
+
+    def station_totals(self, grain, start=None):
+        """Cube rows from start onwards reduced to one row per station"""
+        table = self.tables[grain]
+        if start is not None and not table.empty:
+            bucket_start = pd.Timestamp(start).floor(GRAIN_FREQUENCIES[grain])
+            table = table[table.index.get_level_values('bucket') >= bucket_start]
+        grouped = table.groupby(level='station_id', sort=False)
+        additive = [column for column in table.columns if not column.endswith(('_min', '_max'))]
+        totals = grouped[additive].sum()
+        totals = totals.join(grouped[[column for column in table.columns if column.endswith('_min')]].min())
+        return totals.join(grouped[[column for column in table.columns if column.endswith('_max')]].max())
+
+    def summarize(self, parameter, by, stations_df, start=None, grain='day'):
+        """mean, std, min, max and count of a parameter per station attribute"""
+        totals = self._by_attribute(self.station_totals(grain, start), by, stations_df)
+        if totals.empty:
+            return pd.DataFrame(columns=['mean', 'std', 'min', 'max', 'count'])
+        grouped = totals.groupby(by)
+        return _statistics(
+            grouped[f'{parameter}_count'].sum(),
+            grouped[f'{parameter}_sum'].sum(),
+            grouped[f'{parameter}_sumsq'].sum(),
+            grouped[f'{parameter}_min'].min(),
+            grouped[f'{parameter}_max'].max()
+        )
+
+    def profile(self, parameter, period, start=None):
+        """Mean of a parameter by hour of day ('hour') or month ('month')"""
+        table = self.profile_table
+        if table.empty:
+            return pd.Series(dtype=float)
+        days = table.index.get_level_values('day')
+        if start is not None:
+            table = table[days >= pd.Timestamp(start).floor('D')]
+            days = table.index.get_level_values('day')
+        key = table.index.get_level_values('hour') if period == 'hour' else days.month
+        grouped = table.groupby(pd.Index(key, name=period))
+        return grouped[f'{parameter}_sum'].sum() / grouped[f'{parameter}_count'].sum()
+
+    def daily(self, parameter, by, stations_df, start=None):
+        """Daily mean of a parameter per station attribute (long format)"""
+        rows = self.buckets('day', stations_df, start, attributes=(by,))
+        if rows.empty:
+            return pd.DataFrame(columns=['bucket', by, 'mean'])
+        grouped = rows.groupby(['bucket', by])
+        result = grouped[f'{parameter}_sum'].sum() / grouped[f'{parameter}_count'].sum()
+        return result.rename('mean').reset_index()
+
+    def bucket_means(self, parameter, by, stations_df, start=None):
+        """Mean of each station-day with its attribute, for distribution charts"""
+        rows = self.buckets('day', stations_df, start, attributes=(by,))
+        if rows.empty:
+            return pd.DataFrame(columns=[by, parameter])
+        return pd.DataFrame({
+            by: rows[by],
+            parameter: rows[f'{parameter}_sum'] / rows[f'{parameter}_count']
+        })
+
+    def transmission(self, by, stations_df, start=None, grain='day'):
+        """Readings, successful transmissions and success rate per station attribute"""
+        totals = self._by_attribute(self.station_totals(grain, start), by, stations_df)
+        if totals.empty:
+            return pd.DataFrame(columns=['readings', 'successful', 'success_rate'])
+        result = totals.groupby(by)[['readings', 'successful']].sum()
+        result['success_rate'] = result['successful'] / result['readings'] * 100
+        return result
+
+    @staticmethod
+    def _by_attribute(totals, by, stations_df):
+        """Attach a station attribute to per-station totals"""
+        attribute = stations_df.set_index('station_id')[by]
+        return totals.assign(**{by: attribute.reindex(totals.index).to_numpy()})
+
+    def _profile_rows(self, measurements_df):
+        timestamps = measurements_df['timestamp']
+        keys = [timestamps.dt.floor('D').rename('day'), timestamps.dt.hour.rename('hour')]
+        grouped = measurements_df[self.parameters].groupby(keys)
+        counts = grouped.count().add_suffix('_count')
+        sums = grouped.sum().add_suffix('_sum')
+        return counts.join(sums)
+
+    def _aggregate(self, measurements_df, grain):
+        """Cube rows of one batch"""
+        # Compact frames hold float32/uint8 readings: squares of uint8 wrap around, and
+        # float32 sums lose precision, so the moments are accumulated in float64
+        data = measurements_df[['station_id', *self.parameters]].astype(dict.fromkeys(self.parameters, 'float64'))
+        data['bucket'] = measurements_df['timestamp'].dt.floor(GRAIN_FREQUENCIES[grain])
+        data['successful'] = measurements_df['data_quality'] > TRANSMISSION_OK_QUALITY
+        for parameter in self.parameters:
+            data[f'{parameter}_sq'] = data[parameter] ** 2
+
+        grouped = data.groupby(['station_id', 'bucket'], sort=False)
+        aggregated = {'readings': grouped.size(), 'successful': grouped['successful'].sum()}
+        for parameter in self.parameters:
+            aggregated[f'{parameter}_count'] = grouped[parameter].count()
+            aggregated[f'{parameter}_sum'] = grouped[parameter].sum()
+            aggregated[f'{parameter}_sumsq'] = grouped[f'{parameter}_sq'].sum()
+            aggregated[f'{parameter}_min'] = grouped[parameter].min()
+            aggregated[f'{parameter}_max'] = grouped[parameter].max()
+        return pd.DataFrame(aggregated)
+
+
+def _combine(left, right):
+    """Merge two cube slices with the same index"""
+    combined = left + right  # counts, sums and sums of squares add up
+    for column in left.columns:
+        if column.endswith('_min'):
+            combined[column] = np.fmin(left[column], right[column])
+        elif column.endswith('_max'):
+            combined[column] = np.fmax(left[column], right[column])
+    return combined
+
+
+def _statistics(count, total, sumsq, minimum, maximum):
+    """mean/std/min/max/count from additive moments (sample std, like pandas)"""
+    mean = total / count
+    variance = (sumsq - total * mean) / (count - 1)
+    return pd.DataFrame({
+        'mean': mean,
+        'std': np.sqrt(variance.clip(lower=0)).where(count > 1),
+        'min': minimum,
+        'max': maximum,
+        'count': count
+    })
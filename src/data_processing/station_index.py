@@ -0,0 +1,100 @@
+import numpy as np
+import pandas as pd
+
+
+class StationIndexedMeasurements:
+    """Measurements sorted by (station_id, timestamp) with a start/stop offset per station
+
+    One station's readings are a contiguous slice of the frame, and a time
+    range within it is found with a binary search on its timestamps, so
+    lookups cost O(log n) instead of a scan of the whole table.
+    """
+
+    def __init__(self, measurements_df=None):
+        self.frame = pd.DataFrame()
+        self.version = 0
+        self._offsets = {}
+        self._times = np.empty(0, dtype=np.int64)
+        if measurements_df is not None:
+            self.update(measurements_df)
+
+    def update(self, measurements_df):
+        """Merge a batch of readings and rebuild the offsets"""
+        if measurements_df.empty:
+            return
+        frame = measurements_df if self.frame.empty else pd.concat([self.frame, measurements_df])
+        # Stable sort: already-ordered runs (the existing frame, station-major batches) are cheap
+        self.frame = frame.sort_values(['station_id', 'timestamp'], kind='stable', ignore_index=True)
+        self._times = self.frame['timestamp'].to_numpy(dtype='datetime64[ns]').view(np.int64)
+
+        station_ids = self.frame['station_id'].to_numpy()
+        starts = np.flatnonzero(np.r_[True, station_ids[1:] != station_ids[:-1]])
+        stops = np.r_[starts[1:], len(station_ids)]
+        self._offsets = dict(zip(station_ids[starts], zip(starts.tolist(), stops.tolist())))
+        self.version += 1
+
+    def bounds(self, station_id, start=None, end=None):
+        """(first, last + 1) row positions of a station's readings in [start, end)"""
+        first, last = self._offsets.get(station_id, (0, 0))
+        if start is not None:
+            first += int(np.searchsorted(self._times[first:last], _to_ns(start), side='left'))
+        if end is not None:
+            last = first + int(np.searchsorted(self._times[first:last], _to_ns(end), side='left'))
+        return first, max(first, last)
+
+    def station(self, station_id, start=None, end=None):
+        """One station's readings in [start, end), oldest first"""
+        first, last = self.bounds(station_id, start, end)
+        return self.frame.iloc[first:last]
+
+    def select(self, station_ids=None, start=None, end=None):
+        """Readings of several stations (all by default) in [start, end)"""
+        return self._take(self._ranges(station_ids, start, end))
+
+    def iter_select(self, station_ids=None, start=None, end=None, chunk_rows=100_000):
+        """select() in chunks of whole stations, each about chunk_rows readings
+
+        A station is never split across chunks, so per-station aggregates
+        can be computed chunk by chunk.
+        """
+        chunk, rows = [], 0
+        for first, last in self._ranges(station_ids, start, end):
+            chunk.append((first, last))
+            rows += last - first
+            if rows >= chunk_rows:
+                yield self._take(chunk)
+                chunk, rows = [], 0
+        if chunk:
+            yield self._take(chunk)
+
+    def _ranges(self, station_ids, start, end):
+        """Non-empty row ranges of the stations in [start, end), in frame order"""
+        if station_ids is None:
+            station_ids = self._offsets.keys()
+        ranges = [self.bounds(station_id, start, end) for station_id in station_ids]
+        return sorted((first, last) for first, last in ranges if last > first)
+
+    def _take(self, ranges):
+        if not ranges:
+            return self.frame.iloc[0:0]
+        positions = np.concatenate([np.arange(first, last) for first, last in ranges])
+        return self.frame.iloc[positions]
+
+    def latest(self):
+        """Newest reading of every station (the last row of each slice)"""
+        if self.frame.empty:
+            return self.frame
+        return self.frame.iloc[[last - 1 for _, last in self._offsets.values()]]
+
+    def stations(self):
+        return list(self._offsets)
+
+    def __contains__(self, station_id):
+        return station_id in self._offsets
+
+    def __len__(self):
+        return len(self.frame)
+
+
+def _to_ns(value):
+    return pd.Timestamp(value).as_unit('ns').value
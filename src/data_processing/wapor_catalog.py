@@ -0,0 +1,171 @@
+import json
+import os
+from collections import defaultdict
+from pathlib import Path
+
+# Product folders under data/raw (folder -> description)
+PRODUCT_FOLDERS = {
+    'Actual_evapotranspiration_and_interception': 'Actual Evapotranspiration (Monthly)',
+    'quality_land_surface_temperature': 'Quality Land Surface Temperature (Dekadal)',
+    'Evaporation_annual_data': 'Evaporation (Annual)',
+    'land_cover_classification_annual': 'Land Cover Classification (Annual)',
+    'FAO_WaPOR_2014_to_2018': 'FAO WaPOR 2014-2018'
+}
+
+# Mapset suffix -> dimension, used when a file does not declare its dimension
+SUFFIX_DIMENSIONS = {'D': 'DEKAD', 'M': 'MONTH', 'A': 'YEAR'}
+
+CATALOG_VERSION = 1
+
+
+class WaPORCatalog:
+    """Persistent index of the WaPOR layer files under data/raw
+
+    Every JSON file is parsed once into a small entry (workspace, mapset,
+    dimension, temporal code, year). Entries are saved with the file's
+    mtime and size, so later refreshes only re-parse files that changed.
+    Queries are answered from in-memory lookups by mapset and year.
+    """
+
+    def __init__(self, data_dir="data/raw", index_path=None):
+        self.data_dir = Path(data_dir)
+        # Saved next to the other processed data: data/raw -> data/processed/wapor_catalog.json
+        self.index_path = Path(index_path) if index_path else self.data_dir.parent / 'processed' / 'wapor_catalog.json'
+        self.entries = {}  # Path relative to data_dir -> entry
+        self._by_mapset = defaultdict(list)
+        self._by_mapset_year = defaultdict(list)
+        self._load_index()
+
+    def refresh(self):
+        """Rescan the product folders, re-parsing only new or modified files
+
+        Returns the number of files that were (re)parsed.
+        """
+        seen = set()
+        parsed = 0
+        for folder in PRODUCT_FOLDERS:
+            folder_path = self.data_dir / folder
+            if not folder_path.is_dir():
+                continue
+            with os.scandir(folder_path) as scan:
+                for item in scan:
+                    if not item.name.endswith('.json') or not item.is_file():
+                        continue
+                    key = f"{folder}/{item.name}"
+                    seen.add(key)
+                    stat = item.stat()
+                    entry = self.entries.get(key)
+                    if entry and entry['mtime_ns'] == stat.st_mtime_ns and entry['size'] == stat.st_size:
+                        continue
+                    self.entries[key] = self._parse_file(folder, item.path, stat)
+                    parsed += 1
+
+        removed = set(self.entries) - seen
+        for key in removed:
+            del self.entries[key]
+
+        if parsed or removed or not self.index_path.exists():
+            self._save_index()
+        self._build_lookups()
+        return parsed
+
+    def find(self, mapset=None, year=None, dimension=None, product=None):
+        """Entries matching the given fields, ordered by temporal code"""
+        if mapset is not None and year is not None:
+            candidates = self._by_mapset_year.get((mapset, int(year)), [])
+        elif mapset is not None:
+            candidates = self._by_mapset.get(mapset, [])
+        else:
+            candidates = sorted(self.entries.values(), key=lambda entry: (entry['mapset'], entry['member']))
+
+        return [
+            entry for entry in candidates
+            if (year is None or entry['year'] == int(year))
+            and (dimension is None or entry['dimension'] == dimension)
+            and (product is None or entry['product'] == product)
+        ]
+
+    def path(self, entry):
+        """Absolute path of an entry's file"""
+        return self.data_dir / entry['path']
+
+    def mapsets(self):
+        """Number of files per mapset"""
+        return {mapset: len(entries) for mapset, entries in sorted(self._by_mapset.items())}
+
+    def years(self, mapset=None):
+        """Sorted years covered by a mapset (or by the whole catalog)"""
+        entries = self._by_mapset.get(mapset, []) if mapset else self.entries.values()
+        return sorted({entry['year'] for entry in entries if entry['year'] is not None})
+
+    def __len__(self):
+        return len(self.entries)
+
+    def _parse_file(self, folder, file_path, stat):
+        """Describe one layer file from its JSON, falling back to the file name"""
+        name = os.path.basename(file_path)
+        # File names follow <workspace>.<mapset>.<member>.json, e.g. WAPOR-2.L2-AETI-M.2014-01.json
+        workspace, _, rest = name[:-len('.json')].partition('.')
+        mapset, _, member = rest.partition('.')
+        code = f"{workspace}.{mapset}.{member}"
+        dimension = None
+
+        try:
+            with open(file_path, 'r') as f:
+                data = json.load(f)
+            workspace = data.get('workspaceCode') or workspace
+            mapset = data.get('mapsetCode') or mapset
+            code = data.get('code') or code
+            members = data.get('dimensionMembers') or []
+            if members:
+                dimension = members[0].get('dimensionCode')
+                member = members[0].get('code') or member
+        except (OSError, ValueError) as e:
+            print(f"Error reading {file_path}: {e}")
+
+        if dimension is None:
+            dimension = SUFFIX_DIMENSIONS.get(mapset.rsplit('-', 1)[-1])
+        year = member[:4]
+
+        return {
+            'path': f"{folder}/{name}",
+            'product': folder,
+            'workspace': workspace,
+            'mapset': mapset,
+            'code': code,
+            'dimension': dimension,
+            'member': member,
+            'year': int(year) if year.isdigit() else None,
+            'mtime_ns': stat.st_mtime_ns,
+            'size': stat.st_size
+        }
+
+    def _build_lookups(self):
+        self._by_mapset = defaultdict(list)
+        self._by_mapset_year = defaultdict(list)
+        for entry in sorted(self.entries.values(), key=lambda entry: entry['member']):
+            self._by_mapset[entry['mapset']].append(entry)
+            self._by_mapset_year[(entry['mapset'], entry['year'])].append(entry)
+
+    def _load_index(self):
+        """Load the saved index; a missing or outdated index is rebuilt on refresh"""
+        try:
+            with open(self.index_path, 'r') as f:
+                saved = json.load(f)
+        except (OSError, ValueError):
+            return
+        if saved.get('version') == CATALOG_VERSION and saved.get('data_dir') == str(self.data_dir.resolve()):
+            self.entries = {entry['path']: entry for entry in saved['entries']}
+            self._build_lookups()
+
+    def _save_index(self):
+        """Write the index atomically so concurrent readers never see a partial file"""
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.index_path.with_suffix('.tmp')
+        with open(temp_path, 'w') as f:
+            json.dump({
+                'version': CATALOG_VERSION,
+                'data_dir': str(self.data_dir.resolve()),
+                'entries': list(self.entries.values())
+            }, f)
+        os.replace(temp_path, self.index_path)
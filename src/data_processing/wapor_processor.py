@@ -1,13 +1,82 @@
+import calendar
 import json
 import pandas as pd
 import numpy as np
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
 from pathlib import Path
 
+from src.data_processing.wapor_catalog import WaPORCatalog
+from src.data_processing.wapor_raster import WaPORRasterStore
+
+# Product family -> mapset code
+PRODUCT_FAMILIES = {
+    'AETI': 'L2-AETI-M',         # Monthly actual evapotranspiration and interception
+    'QUAL-LST': 'L2-QUAL-LST-D', # Dekadal land surface temperature quality
+    'E': 'L2-E-A',               # Annual evaporation
+    'LCC': 'L2-LCC-A',           # Annual land cover classification
+    'NILE-NRD': 'NILE-NRD'       # Monthly FAO WaPOR Nile layers
+}
+
+
+def decode_dimension_member(dimension, member):
+    """Return the (start, end) dates covered by a DEKAD, MONTH or YEAR member
+
+    Dekads split each month into days 1-10, 11-20 and 21 to month end.
+    Both dates are inclusive.
+    """
+    if dimension == 'YEAR':
+        year = int(member)
+        return date(year, 1, 1), date(year, 12, 31)
+
+    year, month = int(member[:4]), int(member[5:7])
+    month_end = calendar.monthrange(year, month)[1]
+    if dimension == 'MONTH':
+        return date(year, month, 1), date(year, month, month_end)
+    if dimension == 'DEKAD':
+        dekad = int(member.rsplit('D', 1)[-1])
+        start_day = 10 * (dekad - 1) + 1
+        end_day = month_end if dekad == 3 else start_day + 9
+        return date(year, month, start_day), date(year, month, end_day)
+    raise ValueError(f"Unknown WaPOR dimension: {dimension}")
+
+
+class WaPORLayer:
+    """One WaPOR layer description with its decoded period"""
+
+    __slots__ = ('workspace', 'mapset', 'code', 'dimension', 'member', 'start', 'end', 'path', 'data')
+
+    def __init__(self, workspace, mapset, code, dimension, member, start, end, path, data):
+        self.workspace = workspace
+        self.mapset = mapset
+        self.code = code
+        self.dimension = dimension
+        self.member = member
+        self.start = start
+        self.end = end
+        self.path = path
+        self.data = data
+
+    def __repr__(self):
+        return f"WaPORLayer({self.code}, {self.start} to {self.end})"
+
+
 class WaPORProcessor:
     """Process WaPOR JSON data files"""
     
-    def __init__(self, data_dir="data/raw"):
+    def __init__(self, data_dir="data/raw", catalog=None, raster_dir=None):
         self.data_dir = Path(data_dir)
+        self.catalog = catalog
+        # Kept next to the other processed data: data/raw -> data/processed/rasters
+        self.rasters = WaPORRasterStore(raster_dir or self.data_dir.parent / 'processed' / 'rasters')
+    
+    def get_catalog(self):
+        """Catalog of the layer files, built (or refreshed from its saved index) on first use"""
+        if self.catalog is None:
+            self.catalog = WaPORCatalog(self.data_dir)
+            self.catalog.refresh()
+        return self.catalog
     
     def load_json_file(self, filename):
         """Load a single WaPOR JSON file"""
@@ -19,22 +88,59 @@ class WaPORProcessor:
             print(f"Error loading {filename}: {e}")
             return None
     
+    def iter_layers(self, families=None, year=None, max_workers=4, max_in_flight=8, batch_size=64):
+        """Yield WaPORLayer records for the given product families (default: all)
+
+        Files are read and parsed in a thread pool, batch_size files per task
+        so small layer files do not pay a task round-trip each. At most
+        max_in_flight batches are queued at once, so memory stays bounded
+        however large the catalog is, and layers are yielded in catalog order.
+        Files that cannot be read are reported and skipped.
+        """
+        catalog = self.get_catalog()
+        mapsets = [PRODUCT_FAMILIES[family] for family in (families or PRODUCT_FAMILIES)]
+        entries = [entry for mapset in mapsets for entry in catalog.find(mapset=mapset, year=year)]
+        batches = [entries[i:i + batch_size] for i in range(0, len(entries), batch_size)]
+
+        if len(batches) <= 1:
+            # Not worth a pool for a single batch
+            yield from self._load_batch(entries)
+            return
+
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            pending = deque()
+            for batch in batches:
+                pending.append(pool.submit(self._load_batch, batch))
+                if len(pending) >= max_in_flight:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
+
+    def open_raster(self, layer):
+        """Memory-mapped raster of a layer, or None when its pixels are not available locally"""
+        return self.rasters.open(layer.code)
+
+    def _load_batch(self, entries):
+        return [layer for layer in map(self._load_layer, entries) if layer is not None]
+
+    def _load_layer(self, entry):
+        try:
+            with open(self.data_dir / entry['path'], 'rb') as f:
+                data = json.loads(f.read())
+            start, end = decode_dimension_member(entry['dimension'], entry['member'])
+        except (OSError, ValueError) as e:
+            print(f"Error loading {entry['path']}: {e}")
+            return None
+        return WaPORLayer(entry['workspace'], entry['mapset'], entry['code'], entry['dimension'],
+                          entry['member'], start, end, entry['path'], data)
+    
     def process_evapotranspiration_data(self):
         """Process evapotranspiration JSON files"""
-        et_files = list(self.data_dir.glob("**/WAPOR*AETI*.json"))
-        
-        processed_data = []
-        for file_path in et_files:
-            data = self.load_json_file(file_path)
-            if data:
-                # Extract metadata from filename
-                parts = file_path.stem.split('.')
-                if len(parts) > 3:
-                    year_month = parts[-1]  # e.g., "2014-01"
-                    processed_data.append({
-                        'date': year_month,
-                        'filename': file_path.name,
-                        'data': data
-                    })
-        
-        return processed_data
+        return [
+            {
+                'date': layer.member,  # e.g., "2014-01"
+                'filename': Path(layer.path).name,
+                'data': layer.data
+            }
+            for layer in self.iter_layers(families=['AETI'])
+        ]
@@ -0,0 +1,187 @@
+import json
+import math
+from pathlib import Path
+
+import numpy as np
+
+try:
+    import rasterio
+    from rasterio.windows import Window
+except ImportError:  # GeoTIFF support is optional; .npy stand-ins always work
+    rasterio = None
+
+# WaPOR level 2 pixel size (100 m) in degrees at the equator
+L2_RESOLUTION = 100 / 111_320
+
+# Nile Basin extent (west, south, east, north) in degrees
+NILE_BASIN_BOUNDS = (21.0, -5.0, 41.0, 32.0)
+
+
+class RasterGrid:
+    """North-up grid of square pixels in geographic coordinates"""
+
+    def __init__(self, west, north, resolution, width, height):
+        self.west = west
+        self.north = north
+        self.resolution = resolution
+        self.width = int(width)
+        self.height = int(height)
+
+    @classmethod
+    def from_bounds(cls, west, south, east, north, resolution=L2_RESOLUTION):
+        """Smallest grid covering the bounds at the given resolution"""
+        width = math.ceil(round((east - west) / resolution, 6))
+        height = math.ceil(round((north - south) / resolution, 6))
+        return cls(west, north, resolution, width, height)
+
+    @property
+    def bounds(self):
+        return (self.west, self.north - self.height * self.resolution,
+                self.west + self.width * self.resolution, self.north)
+
+    def window(self, west, south, east, north):
+        """(row_off, col_off, height, width) of the pixels touching a bounding box, clipped to the grid"""
+        col_start = max(0, math.floor((west - self.west) / self.resolution))
+        col_stop = min(self.width, math.ceil((east - self.west) / self.resolution))
+        row_start = max(0, math.floor((self.north - north) / self.resolution))
+        row_stop = min(self.height, math.ceil((self.north - south) / self.resolution))
+        return row_start, col_start, max(0, row_stop - row_start), max(0, col_stop - col_start)
+
+    def subgrid(self, row_off, col_off, height, width):
+        """Grid of a window of this grid"""
+        return RasterGrid(self.west + col_off * self.resolution, self.north - row_off * self.resolution,
+                          self.resolution, width, height)
+
+    def to_dict(self):
+        return {'west': self.west, 'north': self.north, 'resolution': self.resolution,
+                'width': self.width, 'height': self.height}
+
+    def __eq__(self, other):
+        return isinstance(other, RasterGrid) and self.to_dict() == other.to_dict()
+
+    def __repr__(self):
+        return f"RasterGrid({self.width}x{self.height}, bounds={self.bounds})"
+
+
+class RasterLayer:
+    """Read-only access to one WaPOR raster without loading it into RAM
+
+    .npy stand-ins are memory-mapped, so a window is a view whose pages are
+    only read when touched. GeoTIFFs are read window by window via rasterio.
+    """
+
+    def __init__(self, path, grid, nodata=None):
+        self.path = Path(path)
+        self.grid = grid
+        self.nodata = nodata
+        self._array = None
+        self._dataset = None
+        if self.path.suffix == '.npy':
+            self._array = np.load(self.path, mmap_mode='r')
+        else:
+            self._dataset = rasterio.open(self.path)
+
+    @property
+    def shape(self):
+        return (self.grid.height, self.grid.width)
+
+    @property
+    def identity(self):
+        """Path, modification time, size, grid and nodata of the file; changes when it is rewritten"""
+        stat = self.path.stat()
+        return (str(self.path.resolve()), stat.st_mtime_ns, stat.st_size,
+                tuple(self.grid.to_dict().values()), repr(self.nodata))
+
+    def read(self, row_off=0, col_off=0, height=None, width=None):
+        """Pixels of a window (the whole layer by default)"""
+        height = self.grid.height - row_off if height is None else height
+        width = self.grid.width - col_off if width is None else width
+        if self._array is not None:
+            return self._array[row_off:row_off + height, col_off:col_off + width]
+        return self._dataset.read(1, window=Window(col_off, row_off, width, height))
+
+    def read_bbox(self, west, south, east, north):
+        """Pixels touching a bounding box and the grid they cover"""
+        row_off, col_off, height, width = self.grid.window(west, south, east, north)
+        return self.read(row_off, col_off, height, width), self.grid.subgrid(row_off, col_off, height, width)
+
+    def iter_blocks(self, block_rows=1024, row_off=0, col_off=0, height=None, width=None):
+        """Yield (row offset within the window, pixels) for horizontal strips of a window"""
+        height = self.grid.height - row_off if height is None else height
+        for start in range(0, height, block_rows):
+            yield start, self.read(row_off + start, col_off, min(block_rows, height - start), width)
+
+    def valid_mask(self, pixels):
+        """True where a pixel holds data"""
+        if self.nodata is None:
+            return ~np.isnan(pixels) if pixels.dtype.kind == 'f' else np.ones(pixels.shape, dtype=bool)
+        if isinstance(self.nodata, float) and math.isnan(self.nodata):
+            return ~np.isnan(pixels)
+        return pixels != self.nodata
+
+    def close(self):
+        if self._dataset is not None:
+            self._dataset.close()
+        self._array = None
+
+
+class WaPORRasterStore:
+    """Local rasters of WaPOR layers, one per catalog entry
+
+    Each layer is stored as <root>/<layer code>.tif (GeoTIFF, needs
+    rasterio) or as a <layer code>.npy stand-in with a <layer code>.json
+    sidecar describing its grid and nodata value.
+    """
+
+    def __init__(self, root):
+        self.root = Path(root)
+
+    def path_for(self, code, suffix='.npy'):
+        return self.root / f"{code}{suffix}"
+
+    def has(self, code):
+        return self._find(code) is not None
+
+    def open(self, code):
+        """Open a layer's raster, or return None when no local raster exists"""
+        path = self._find(code)
+        if path is None:
+            return None
+        if path.suffix == '.npy':
+            with open(path.with_suffix('.json'), 'r') as f:
+                meta = json.load(f)
+            grid = RasterGrid(**meta['grid'])
+            return RasterLayer(path, grid, meta.get('nodata'))
+
+        with rasterio.open(path) as dataset:
+            transform = dataset.transform
+            grid = RasterGrid(transform.c, transform.f, transform.a, dataset.width, dataset.height)
+            nodata = dataset.nodata
+        return RasterLayer(path, grid, nodata)
+
+    def write(self, code, pixels, grid, nodata=None):
+        """Save a layer as a .npy stand-in with its sidecar metadata"""
+        if pixels.shape != (grid.height, grid.width):
+            raise ValueError(f"Raster shape {pixels.shape} does not match grid {grid}")
+        self.root.mkdir(parents=True, exist_ok=True)
+        path = self.path_for(code)
+        np.save(path, pixels)
+        with open(path.with_suffix('.json'), 'w') as f:
+            json.dump({'grid': grid.to_dict(), 'nodata': nodata}, f)
+        return path
+
+    def codes(self):
+        """Codes of every layer with a local raster"""
+        if not self.root.exists():
+            return []
+        found = {path.stem for path in self.root.glob('*.npy')}
+        if rasterio is not None:
+            found.update(path.stem for path in self.root.glob('*.tif'))
+        return sorted(found)
+
+    def _find(self, code):
+        if rasterio is not None and self.path_for(code, '.tif').exists():
+            return self.path_for(code, '.tif')
+        if self.path_for(code).exists() and self.path_for(code, '.json').exists():
+            return self.path_for(code)
+        return None
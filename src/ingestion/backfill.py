@@ -0,0 +1,266 @@
+"""Bulk import of archived station logs (CSV / JSON) into the measurement store
+
+Usage:
+    python -m src.ingestion.backfill data/archive --stations stations.csv --workers 8
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.json as pa_json
+
+from src.data_processing.measurement_store import MEASUREMENT_COLUMNS, MeasurementStore
+
+ARCHIVE_SUFFIXES = ('.csv', '.csv.gz', '.json', '.json.gz', '.jsonl', '.jsonl.gz', '.ndjson')
+
+# Archive column names (lower-cased) -> measurement schema
+COLUMN_ALIASES = {
+    'station_id': 'station_id', 'station': 'station_id', 'site_id': 'station_id', 'station_code': 'station_id',
+    'timestamp': 'timestamp', 'datetime': 'timestamp', 'date_time': 'timestamp', 'time': 'timestamp',
+    'water_level': 'water_level', 'level': 'water_level', 'level_m': 'water_level', 'stage': 'water_level',
+    'flow_rate': 'flow_rate', 'flow': 'flow_rate', 'discharge': 'flow_rate', 'flow_m3s': 'flow_rate',
+    'temperature': 'temperature', 'temp': 'temperature', 'water_temp': 'temperature', 'temp_c': 'temperature',
+    'data_quality': 'data_quality', 'quality': 'data_quality', 'qc': 'data_quality', 'quality_pct': 'data_quality',
+    'battery_level': 'battery_level', 'battery': 'battery_level', 'batt': 'battery_level', 'battery_pct': 'battery_level',
+    'transmission_status': 'transmission_status', 'transmission': 'transmission_status'
+}
+
+# Bytes of JSON lines parsed per block by the Arrow reader (roughly 100k readings)
+JSON_BLOCK_BYTES = 16 * 1024 * 1024
+
+VALUE_COLUMNS = ['water_level', 'flow_rate', 'temperature', 'data_quality', 'battery_level']
+
+MANIFEST_NAME = '_backfill_manifest.json'  # Leading underscore: ignored by Parquet dataset discovery
+
+MANIFEST_VERSION = 1
+
+
+class BackfillImporter:
+    """Import archive files in parallel, one file per worker process at a time
+
+    Files are read in chunks by the pandas C parsers, normalized with column
+    operations only and appended to the store as sorted (country, day)
+    partitions. Finished files are recorded in a manifest in the store, so
+    an interrupted import resumes with the files it had not finished. The
+    output of an unfinished file is named after the file and deleted before
+    it is imported again, so no reading is stored twice.
+    """
+
+    def __init__(self, store, stations_df, workers=None, chunk_rows=1_000_000):
+        self.store = store
+        self.stations_df = stations_df[['station_id', 'country', 'transmission_method']]
+        self.workers = workers or os.cpu_count()
+        self.chunk_rows = chunk_rows
+        self.manifest_path = Path(store.root) / MANIFEST_NAME
+        self.manifest = self._load_manifest()
+
+    def pending(self, paths):
+        """Archive files (recursively under directories) not imported yet in their current state"""
+        files = []
+        for path in map(Path, paths):
+            candidates = sorted(path.rglob('*')) if path.is_dir() else [path]
+            files.extend(p for p in candidates if p.is_file() and p.name.lower().endswith(ARCHIVE_SUFFIXES))
+        return [path for path in files if not self._is_done(path)]
+
+    def run(self, paths, progress=print):
+        """Import every pending file and return the totals (rows, rejected, files, seconds, rows_per_second)"""
+        files = self.pending(paths)
+        self._remove_partial_output(files)
+        totals = {'files': 0, 'rows': 0, 'rejected': 0}
+        started = time.perf_counter()
+
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            futures = {
+                pool.submit(import_file, str(path), file_key(path), self.stations_df,
+                            str(self.store.root), self.chunk_rows): path
+                for path in files
+            }
+            for future in as_completed(futures):
+                path = futures[future]
+                result = future.result()
+                stat = path.stat()
+                self.manifest[str(path.resolve())] = dict(
+                    result, size=stat.st_size, mtime_ns=stat.st_mtime_ns
+                )
+                self._save_manifest()  # After every file, so an interruption loses at most the files in flight
+
+                totals['files'] += 1
+                totals['rows'] += result['rows']
+                totals['rejected'] += result['rejected']
+                elapsed = time.perf_counter() - started
+                progress(f"[{totals['files']}/{len(files)}] {path.name}: {result['rows']:,} rows "
+                         f"({result['rejected']:,} rejected) in {result['seconds']:.1f}s; "
+                         f"{totals['rows'] / elapsed:,.0f} rows/s overall")
+
+        totals['seconds'] = time.perf_counter() - started
+        totals['rows_per_second'] = totals['rows'] / totals['seconds'] if totals['seconds'] else 0.0
+        return totals
+
+    def _is_done(self, path):
+        entry = self.manifest.get(str(path.resolve()))
+        if entry is None:
+            return False
+        stat = path.stat()
+        return entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns
+
+    def _remove_partial_output(self, files):
+        """Delete what an interrupted run wrote for files that are about to be imported"""
+        keys = {file_key(path) for path in files}
+        if not keys or not Path(self.store.root).exists():
+            return
+        for part in Path(self.store.root).rglob('backfill-*.parquet'):
+            if part.name.split('-')[1] in keys:
+                part.unlink()
+
+    def _load_manifest(self):
+        try:
+            with open(self.manifest_path, 'r') as f:
+                saved = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return saved['files'] if saved.get('version') == MANIFEST_VERSION else {}
+
+    def _save_manifest(self):
+        """Write the manifest atomically so an interruption never leaves it half written"""
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.manifest_path.with_suffix('.tmp')
+        with open(temp_path, 'w') as f:
+            json.dump({'version': MANIFEST_VERSION, 'files': self.manifest}, f)
+        os.replace(temp_path, self.manifest_path)
+
+
+def file_key(path):
+    """Stable short name of an archive file, used to name its output"""
+    return hashlib.sha1(str(Path(path).resolve()).encode()).hexdigest()[:12]
+
+
+def import_file(path, key, stations_df, store_root, chunk_rows):
+    """Worker: read, normalize and append one archive file"""
+    started = time.perf_counter()
+    store = MeasurementStore(store_root)
+    rows = rejected = 0
+    for number, chunk in enumerate(read_archive(path, chunk_rows)):
+        frame, dropped = normalize_chunk(chunk, stations_df)
+        rejected += dropped
+        rows += store.append(frame, stations_df, f"backfill-{key}-{number:05d}")
+    return {'rows': rows, 'rejected': rejected, 'seconds': time.perf_counter() - started}
+
+
+def read_archive(path, chunk_rows):
+    """Yield raw DataFrame chunks of a CSV, JSON-lines or JSON-array file"""
+    name = str(path).lower()
+    if '.csv' in name:
+        yield from pd.read_csv(path, chunksize=chunk_rows, low_memory=False)
+    elif _is_json_array(path):
+        # Arrays cannot be streamed; read whole. Types are left to normalize_chunk
+        frame = pd.read_json(path, orient='records', dtype=False, convert_dates=False)
+        for start in range(0, len(frame), chunk_rows):
+            yield frame.iloc[start:start + chunk_rows]
+    elif hasattr(pa_json, 'open_json'):
+        # Arrow's streaming reader parses blocks in C++, no Python object per reading. Value
+        # columns are pinned to float so a block of whole numbers cannot fix them as integers
+        types = {'station_id': pa.string(), **{column: pa.float64() for column in VALUE_COLUMNS}}
+        fields = [(name, types[COLUMN_ALIASES[name.strip().lower()]]) for name in _first_record_fields(path)
+                  if COLUMN_ALIASES.get(name.strip().lower()) in types]
+        schema = pa.schema(fields)
+        reader = pa_json.open_json(
+            path,
+            read_options=pa_json.ReadOptions(block_size=JSON_BLOCK_BYTES),
+            parse_options=pa_json.ParseOptions(explicit_schema=schema, unexpected_field_behavior='infer')
+        )
+        # Blocks are regrouped into chunks of chunk_rows so each append writes fewer, larger files
+        batches, rows = [], 0
+        for batch in reader:
+            batches.append(batch)
+            rows += batch.num_rows
+            if rows >= chunk_rows:
+                yield pa.Table.from_batches(batches).to_pandas()
+                batches, rows = [], 0
+        if batches:
+            yield pa.Table.from_batches(batches).to_pandas()
+    else:
+        yield from pd.read_json(path, lines=True, chunksize=chunk_rows, dtype=False, convert_dates=False)
+
+
+def normalize_chunk(chunk, stations_df):
+    """Map archive columns onto the measurement schema; returns (frame, rows dropped)
+
+    Rows without a parseable timestamp or with an unknown station are
+    dropped. Unparseable values become NaN, a missing transmission status
+    is filled in from the station's declared method.
+    """
+    chunk = chunk.rename(columns=lambda column: COLUMN_ALIASES.get(str(column).strip().lower(), column))
+    if 'station_id' not in chunk.columns or 'timestamp' not in chunk.columns:
+        raise ValueError(f"Archive has no station/timestamp columns (found {list(chunk.columns)})")
+
+    timestamps = chunk['timestamp']
+    if pd.api.types.is_numeric_dtype(timestamps):
+        timestamps = pd.to_datetime(timestamps, unit='s', errors='coerce')  # Unix epoch seconds
+    else:
+        timestamps = pd.to_datetime(timestamps, errors='coerce', format='ISO8601', utc=True).dt.tz_convert(None)
+
+    station_ids = chunk['station_id'].astype(str).str.strip()
+    methods = station_ids.map(stations_df.set_index('station_id')['transmission_method'])
+    keep = (timestamps.notna() & methods.notna()).to_numpy()
+
+    frame = pd.DataFrame({
+        'station_id': station_ids.to_numpy()[keep],
+        'timestamp': timestamps.to_numpy(dtype='datetime64[ns]')[keep]
+    })
+    for column in VALUE_COLUMNS:
+        values = chunk[column] if column in chunk.columns else pd.Series(np.nan, index=chunk.index)
+        frame[column] = pd.to_numeric(values, errors='coerce').to_numpy(dtype=float)[keep]
+    status = chunk['transmission_status'] if 'transmission_status' in chunk.columns else methods
+    frame['transmission_status'] = status.fillna(methods).astype(str).to_numpy()[keep]
+    return frame[MEASUREMENT_COLUMNS], int(len(keep) - keep.sum())
+
+
+def _first_record_fields(path):
+    """Field names of the first record of a JSON-lines file"""
+    with _open_text(path) as f:
+        for line in f:
+            if line.strip():
+                return list(json.loads(line))
+    return []
+
+
+def _open_text(path):
+    return gzip.open(path, 'rt') if str(path).lower().endswith('.gz') else open(path, 'r')
+
+
+def _is_json_array(path):
+    """True when the file holds one JSON array rather than one object per line"""
+    with _open_text(path) as f:
+        for line in f:
+            if line.strip():
+                return line.lstrip().startswith('[')
+    return False
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('paths', nargs='+', help="Archive files or directories")
+    parser.add_argument('--stations', required=True,
+                        help="CSV of the station registry (station_id, country, transmission_method)")
+    parser.add_argument('--store', default="data/processed/measurements")
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--chunk-rows', type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    importer = BackfillImporter(MeasurementStore(args.store), pd.read_csv(args.stations),
+                                workers=args.workers, chunk_rows=args.chunk_rows)
+    totals = importer.run(args.paths)
+    print(f"Imported {totals['rows']:,} rows from {totals['files']} file(s) in {totals['seconds']:.1f}s "
+          f"({totals['rows_per_second']:,.0f} rows/s, {totals['rejected']:,} rejected)")
+
+
+if __name__ == '__main__':
+    main()
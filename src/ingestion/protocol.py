@@ -0,0 +1,82 @@
+import asyncio
+import json
+
+MAX_HEADER_BYTES = 16 * 1024
+
+STATUS_REASONS = {
+    200: 'OK',
+    400: 'Bad Request',
+    404: 'Not Found',
+    405: 'Method Not Allowed',
+    413: 'Payload Too Large',
+    500: 'Internal Server Error',
+    503: 'Service Unavailable'
+}
+
+
+class ProtocolError(ValueError):
+    """Malformed HTTP message on a telemetry connection, with the status to answer"""
+
+    def __init__(self, message, status=400):
+        self.status = status
+        super().__init__(message)
+
+
+async def read_message(reader, max_body_bytes):
+    """Read one HTTP/1.1 message: (start line parts, headers, body), or None on EOF
+
+    Only Content-Length bodies are supported, which is all the loggers and
+    the simulator send.
+    """
+    try:
+        head = await reader.readuntil(b'\r\n\r\n')
+    except asyncio.IncompleteReadError as error:
+        if not error.partial:
+            return None  # Peer closed the connection between messages
+        raise ProtocolError("Connection closed mid-message") from error
+    except asyncio.LimitOverrunError as error:
+        raise ProtocolError("Message head too large", status=413) from error
+    if len(head) > MAX_HEADER_BYTES:
+        raise ProtocolError("Message head too large", status=413)
+
+    lines = head.decode('latin-1').split('\r\n')
+    start_line = lines[0].split(' ', 2)
+    if len(start_line) < 2:
+        raise ProtocolError("Malformed request line")
+    headers = {}
+    for line in lines[1:]:
+        if line:
+            name, _, value = line.partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+    try:
+        length = int(headers.get('content-length') or 0)
+    except ValueError as error:
+        raise ProtocolError("Invalid Content-Length") from error
+    if length < 0:
+        raise ProtocolError("Invalid Content-Length")
+    if length > max_body_bytes:
+        raise ProtocolError(f"Body of {length} bytes exceeds {max_body_bytes}", status=413)
+    try:
+        body = await reader.readexactly(length) if length else b''
+    except asyncio.IncompleteReadError as error:
+        raise ProtocolError("Connection closed mid-message") from error
+    return start_line, headers, body
+
+
+def encode_response(status, payload, keep_alive=True):
+    body = json.dumps(payload, default=str).encode()
+    head = (f"HTTP/1.1 {status} {STATUS_REASONS.get(status, '')}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    return head.encode() + body
+
+
+def encode_request(method, path, payload, host='localhost'):
+    body = json.dumps(payload).encode() if payload is not None else b''
+    head = (f"{method} {path} HTTP/1.1\r\n"
+            f"Host: {host}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n\r\n")
+    return head.encode() + body
@@ -0,0 +1,261 @@
+"""Telemetry ingestion endpoint appending station batches to the measurement store
+
+Usage:
+    python -m src.ingestion.service --stations stations.csv --store data/processed/measurements --port 8765
+    python -m src.ingestion.service --stations data/processed/fleet/stations.parquet --store data/processed/fleet/measurements
+"""
+import argparse
+import asyncio
+import json
+import time
+import uuid
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.data_processing.measurement_store import MEASUREMENT_COLUMNS, MeasurementStore
+from src.ingestion.protocol import ProtocolError, encode_response, read_message
+from src.ingestion.validation import TelemetryValidationError, validate_batch
+
+MAX_BODY_BYTES = 4 * 1024 * 1024
+
+
+class TelemetryIngestService:
+    """Asyncio HTTP endpoint appending station telemetry batches to the measurement store
+
+    POST /telemetry takes one station batch (see validate_batch) and answers
+    once the batch is durable. Validated batches wait in a queue; a single
+    committer drains everything that arrived within commit_interval (up to
+    max_commit_rows) and appends it to the store in one write, so many
+    concurrent loggers share one Parquet file per partition and commit
+    instead of one each (group commit). When more than max_pending_rows are
+    waiting, new batches get 503 and the logger retries later.
+    GET /health returns the counters of stats().
+    """
+
+    def __init__(self, store, stations_df, host='127.0.0.1', port=8765,
+                 commit_interval=0.05, max_commit_rows=50_000, max_pending_rows=500_000):
+        self.store = store
+        self.stations_df = stations_df
+        self.host = host
+        self.port = port
+        self.commit_interval = commit_interval
+        self.max_commit_rows = max_commit_rows
+        self.max_pending_rows = max_pending_rows
+        self._stations = dict(zip(stations_df['station_id'], stations_df['transmission_method']))
+        self._server = None
+        self._queue = None
+        self._committer = None
+        self._pending_rows = 0
+        self._accepting = False
+        self._run_id = uuid.uuid4().hex[:8]
+        self.counters = {
+            'batches': 0, 'rows': 0, 'commits': 0, 'rejected': 0,
+            'throttled': 0, 'failed': 0, 'commit_seconds': 0.0
+        }
+
+    async def start(self):
+        """Start listening; with port=0 the chosen port is stored on self.port"""
+        self._queue = asyncio.Queue()
+        self._committer = asyncio.create_task(self._commit_loop())
+        self._accepting = True
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self):
+        """Stop accepting connections and commit whatever is still queued"""
+        self._accepting = False
+        if self._server is not None:
+            self._server.close()
+        if self._committer is not None:
+            await self._queue.put(None)
+            await self._committer
+        if self._server is not None:
+            # Batches in flight have their answer by now; drop idle keep-alive connections
+            if hasattr(self._server, 'close_clients'):
+                self._server.close_clients()
+            await self._server.wait_closed()
+
+    async def serve_forever(self):
+        """Serve until cancelled, starting first unless start() was already awaited"""
+        if self._server is None:
+            await self.start()
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.stop()
+
+    def stats(self):
+        stats = dict(self.counters, pending_rows=self._pending_rows)
+        stats['rows_per_commit'] = stats['rows'] / stats['commits'] if stats['commits'] else 0.0
+        return stats
+
+    async def _handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    message = await read_message(reader, MAX_BODY_BYTES)
+                except ProtocolError as error:
+                    writer.write(encode_response(error.status, {'error': str(error)}, keep_alive=False))
+                    break
+                if message is None:
+                    break
+                (method, path, *_), headers, body = message
+                status, payload = await self._route(method, path, body)
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                writer.write(encode_response(status, payload, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _route(self, method, path, body):
+        if path == '/health':
+            return 200, self.stats()
+        if path != '/telemetry':
+            return 404, {'error': f"No route {path}"}
+        if method != 'POST':
+            return 405, {'error': "Use POST"}
+
+        try:
+            payload = json.loads(body)
+        except ValueError as error:
+            # Malformed JSON, or a body that is not UTF-8 at all
+            self.counters['rejected'] += 1
+            return 400, {'error': f"Invalid JSON: {error}"}
+        try:
+            batch = validate_batch(payload, self._stations)
+        except TelemetryValidationError as error:
+            self.counters['rejected'] += 1
+            return 400, {'error': 'Invalid batch', 'details': error.errors}
+        except (TypeError, ValueError) as error:
+            # A shape validate_batch does not check for; still the client's fault
+            self.counters['rejected'] += 1
+            return 400, {'error': 'Invalid batch', 'details': [str(error)]}
+
+        if not self._accepting:
+            return 503, {'error': 'Service is shutting down'}
+        rows = len(batch['timestamp'])
+        if self._pending_rows + rows > self.max_pending_rows:
+            self.counters['throttled'] += 1
+            return 503, {'error': 'Ingest queue full, retry later'}
+
+        committed = asyncio.get_running_loop().create_future()
+        self._pending_rows += rows
+        await self._queue.put((batch, committed))
+        try:
+            commit_id = await committed
+        except Exception as error:
+            return 500, {'error': f"Commit failed: {error}"}
+        return 200, {'accepted': rows, 'commit': commit_id}
+
+    async def _commit_loop(self):
+        """Drain the queue into group commits until a None sentinel arrives"""
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            item = await self._queue.get()
+            if item is None:
+                break
+            group = [item]
+            rows = len(item[0]['timestamp'])
+            # Batches that queued up during the previous commit have waited long enough
+            while rows < self.max_commit_rows and not self._queue.empty():
+                item = self._queue.get_nowait()
+                if item is None:
+                    stopping = True
+                    break
+                group.append(item)
+                rows += len(item[0]['timestamp'])
+            deadline = loop.time() + (0 if len(group) > 1 or stopping else self.commit_interval)
+            # Gather whatever else arrives before the deadline (or until the group is full)
+            while rows < self.max_commit_rows:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                group.append(item)
+                rows += len(item[0]['timestamp'])
+            await self._commit(group, rows)
+
+    async def _commit(self, group, rows):
+        commit_id = f"ingest-{self._run_id}-{self.counters['commits'] + self.counters['failed']:08d}"
+        frame = pd.DataFrame({
+            column: np.concatenate([batch[column] for batch, _ in group]) for column in MEASUREMENT_COLUMNS
+        })
+        started = time.perf_counter()
+        failure = None
+        try:
+            # Parquet encoding and file I/O run off the event loop, which keeps accepting batches
+            await asyncio.to_thread(self.store.append, frame, self.stations_df, commit_id)
+        except Exception as error:
+            failure = error
+            self.counters['failed'] += 1
+        else:
+            self.counters['commits'] += 1
+            self.counters['batches'] += len(group)
+            self.counters['rows'] += rows
+            self.counters['commit_seconds'] += time.perf_counter() - started
+        finally:
+            self._pending_rows -= rows
+
+        for _, committed in group:
+            if committed.done():
+                continue  # The connection went away while waiting
+            if failure is None:
+                committed.set_result(commit_id)
+            else:
+                committed.set_exception(failure)
+
+
+def read_stations(path):
+    """Station registry from CSV, or Parquet such as a generated fleet's stations.parquet"""
+    path = Path(path)
+    return pd.read_parquet(path) if path.suffix == '.parquet' else pd.read_csv(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--stations', required=True,
+                        help="CSV or Parquet station registry (station_id, country, transmission_method)")
+    parser.add_argument('--store', default="data/processed/measurements")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--commit-interval', type=float, default=0.05,
+                        help="Seconds a group commit waits for more batches")
+    parser.add_argument('--max-commit-rows', type=int, default=50_000)
+    parser.add_argument('--max-pending-rows', type=int, default=500_000)
+    args = parser.parse_args()
+
+    service = TelemetryIngestService(
+        MeasurementStore(args.store), read_stations(args.stations), host=args.host, port=args.port,
+        commit_interval=args.commit_interval, max_commit_rows=args.max_commit_rows,
+        max_pending_rows=args.max_pending_rows
+    )
+
+    async def run():
+        await service.start()
+        print(f"Listening on http://{service.host}:{service.port}/telemetry, appending to {args.store}")
+        await service.serve_forever()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+    stats = service.stats()
+    print(f"Stopped after {stats['rows']:,} rows in {stats['commits']:,} commits ({stats['rejected']:,} rejected)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,144 @@
+import asyncio
+import json
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from src.data_processing.measurement_generator import MeasurementGenerator
+from src.ingestion.protocol import ProtocolError, encode_request, read_message
+
+# Satellite loggers store and forward: readings are buffered and sent once per pass
+SATELLITE_BURST = 4
+
+READING_FIELDS = ['water_level', 'flow_rate', 'temperature', 'data_quality', 'battery_level']
+
+
+class FleetSimulator:
+    """Replay the station fleet against a telemetry endpoint on an accelerated clock
+
+    The readings of the last `days` are generated with MeasurementGenerator
+    and each is sent once the simulated clock, running `speedup` times faster
+    than real time, passes its timestamp. GPRS (and dual-link) stations send
+    every reading as it is taken; Satellite stations send SATELLITE_BURST
+    readings at a time. Latency is measured from the moment a message is due
+    to the moment its commit is acknowledged, so it includes client queueing,
+    validation and the group commit. A fault_rate fraction of messages is
+    corrupted to exercise rejection.
+    """
+
+    def __init__(self, stations_df, host='127.0.0.1', port=8765, days=1, speedup=3600,
+                 connections=16, fault_rate=0.0, seed=None):
+        self.stations_df = stations_df
+        self.host = host
+        self.port = port
+        self.days = days
+        self.speedup = speedup
+        self.connections = connections
+        self.fault_rate = fault_rate
+        self.seed = seed
+
+    def messages(self, end_time=None):
+        """(send offset in real seconds, payload, readings) for every message, in send order"""
+        end_time = end_time or datetime.now()
+        window_start = np.datetime64(end_time - timedelta(days=self.days), 'ns')
+        frame = MeasurementGenerator(days=self.days, seed=self.seed).generate(self.stations_df, end_time=end_time)
+        frame = frame.sort_values(['station_id', 'timestamp'], kind='stable', ignore_index=True)
+
+        offsets = (frame['timestamp'].to_numpy() - window_start) / np.timedelta64(1, 's') / self.speedup
+        records = frame[READING_FIELDS].assign(
+            timestamp=frame['timestamp'].dt.strftime('%Y-%m-%dT%H:%M:%S')
+        ).to_dict('records')
+        rng = np.random.default_rng(self.seed)
+
+        station_ids = frame['station_id'].to_numpy()
+        starts = np.flatnonzero(np.r_[True, station_ids[1:] != station_ids[:-1]])
+        stops = np.r_[starts[1:], len(frame)]
+        methods = dict(zip(self.stations_df['station_id'], self.stations_df['transmission_method']))
+
+        messages = []
+        for start, stop in zip(starts.tolist(), stops.tolist()):
+            station_id = station_ids[start]
+            method = methods[station_id]
+            burst = SATELLITE_BURST if method == 'Satellite' else 1
+            for first in range(start, stop, burst):
+                last = min(first + burst, stop)
+                readings = records[first:last]
+                if self.fault_rate and rng.random() < self.fault_rate:
+                    readings = [dict(readings[0], data_quality=150.0), *readings[1:]]
+                payload = {'station_id': station_id, 'transmission': method, 'readings': readings}
+                messages.append((float(offsets[last - 1]), payload, last - first))
+        messages.sort(key=lambda message: message[0])
+        return messages
+
+    async def run(self, messages=None):
+        """Send every message on schedule and return throughput and latency figures"""
+        messages = messages if messages is not None else self.messages()
+        queue = asyncio.Queue()
+        results = {'accepted': 0, 'rejected': 0, 'throttled': 0, 'errors': 0, 'latencies': []}
+
+        started = time.perf_counter()
+        workers = [asyncio.create_task(self._worker(queue, results)) for _ in range(self.connections)]
+        for offset, payload, n_readings in messages:
+            delay = started + offset - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            queue.put_nowait((started + offset, payload, n_readings))
+        for _ in workers:
+            queue.put_nowait(None)
+        await asyncio.gather(*workers)
+        elapsed = time.perf_counter() - started
+
+        latencies = np.array(results['latencies']) * 1000
+        offered = sum(n_readings for _, _, n_readings in messages)
+        return {
+            'messages': len(messages),
+            'readings': offered,
+            'accepted_readings': results['accepted'],
+            'rejected_messages': results['rejected'],
+            'throttled_retries': results['throttled'],
+            'errors': results['errors'],
+            'elapsed_seconds': elapsed,
+            'offered_rows_per_second': offered / messages[-1][0] if messages and messages[-1][0] else 0.0,
+            'rows_per_second': results['accepted'] / elapsed if elapsed else 0.0,
+            'latency_ms': {
+                name: float(np.percentile(latencies, q)) if len(latencies) else 0.0
+                for name, q in [('p50', 50), ('p95', 95), ('p99', 99), ('max', 100)]
+            }
+        }
+
+    async def _worker(self, queue, results):
+        """One logger connection (HTTP keep-alive) sending queued messages in turn"""
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        try:
+            while True:
+                item = await queue.get()
+                if item is None:
+                    break
+                due, payload, n_readings = item
+                request = encode_request('POST', '/telemetry', payload, self.host)
+                while True:
+                    writer.write(request)
+                    await writer.drain()
+                    try:
+                        message = await read_message(reader, 1024 * 1024)
+                    except ProtocolError:
+                        message = None
+                    if message is None:
+                        results['errors'] += 1
+                        return
+                    status = int(message[0][1])
+                    if status != 503:
+                        break
+                    results['throttled'] += 1
+                    await asyncio.sleep(0.05)  # Back off while the service drains its queue
+
+                if status == 200:
+                    results['accepted'] += json.loads(message[2])['accepted']
+                    results['latencies'].append(time.perf_counter() - due)
+                elif status == 400:
+                    results['rejected'] += 1
+                else:
+                    results['errors'] += 1
+        finally:
+            writer.close()
@@ -0,0 +1,110 @@
+import warnings
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+from src.data_processing.measurement_store import MEASUREMENT_COLUMNS
+
+MAX_BATCH_READINGS = 10_000
+
+# Readings stamped further ahead of the receiver's clock are rejected
+MAX_CLOCK_SKEW = timedelta(minutes=10)
+
+TRANSMISSION_METHODS = {'GPRS', 'Satellite', 'Both'}
+
+# Physically plausible ranges; anything outside is a logger or transmission fault
+VALUE_LIMITS = {
+    'water_level': (0, 10_000),
+    'flow_rate': (0, 100_000),
+    'temperature': (-20, 60),
+    'data_quality': (0, 100),
+    'battery_level': (0, 100)
+}
+
+
+class TelemetryValidationError(ValueError):
+    """Rejected telemetry batch, with one message per problem found"""
+
+    def __init__(self, errors):
+        self.errors = list(errors)
+        super().__init__('; '.join(self.errors))
+
+
+def validate_batch(payload, stations, now=None):
+    """Measurement columns (name -> NumPy array) of one station batch, or TelemetryValidationError
+
+    payload is {"station_id": ..., "transmission": ..., "readings": [...]},
+    each reading carrying an ISO timestamp and the VALUE_LIMITS parameters.
+    stations maps station IDs to their declared transmission method. A batch
+    is accepted or rejected as a whole, so a logger can simply resend it.
+    Checks run on plain arrays: batches are small and arrive by the
+    thousand, too many to pay for building a DataFrame each.
+    """
+    if not isinstance(payload, dict):
+        raise TelemetryValidationError(["Batch must be a JSON object"])
+    station_id = payload.get('station_id')
+    readings = payload.get('readings')
+    if not isinstance(station_id, str) or station_id not in stations:
+        raise TelemetryValidationError([f"Unknown station {station_id!r}"])
+    if not isinstance(readings, list) or not readings:
+        raise TelemetryValidationError(["Batch has no readings"])
+    if len(readings) > MAX_BATCH_READINGS:
+        raise TelemetryValidationError([f"Batch has {len(readings)} readings, limit is {MAX_BATCH_READINGS}"])
+    if not all(isinstance(reading, dict) for reading in readings):
+        raise TelemetryValidationError(["Readings must be JSON objects"])
+
+    transmission = payload.get('transmission', stations[station_id])
+    errors = []
+    if not isinstance(transmission, str) or transmission not in TRANSMISSION_METHODS:
+        errors.append(f"Unknown transmission method {transmission!r}")
+
+    missing = [column for column in ['timestamp', *VALUE_LIMITS] if any(column not in reading for reading in readings)]
+    if missing:
+        raise TelemetryValidationError(errors + [f"Readings lack {', '.join(missing)}"])
+
+    timestamps = _timestamps([reading['timestamp'] for reading in readings])
+    latest_allowed = np.datetime64(now or datetime.now(), 'ns') + np.timedelta64(MAX_CLOCK_SKEW)
+    _report(errors, np.count_nonzero(np.isnat(timestamps)), "unparseable timestamp")
+    _report(errors, np.count_nonzero(timestamps > latest_allowed), "timestamp in the future")
+    _report(errors, np.count_nonzero(np.diff(np.sort(timestamps)) == np.timedelta64(0)), "repeated timestamp")
+
+    columns = {'timestamp': timestamps}
+    for column, (low, high) in VALUE_LIMITS.items():
+        numbers = _numbers([reading[column] for reading in readings])
+        _report(errors, np.count_nonzero(~np.isfinite(numbers)), f"non-numeric {column}")
+        _report(errors, np.count_nonzero((numbers < low) | (numbers > high)), f"{column} outside [{low}, {high}]")
+        columns[column] = numbers
+
+    if errors:
+        raise TelemetryValidationError(errors)
+
+    columns['station_id'] = np.full(len(readings), station_id, dtype=object)
+    columns['transmission_status'] = np.full(len(readings), transmission, dtype=object)
+    return {column: columns[column] for column in MEASUREMENT_COLUMNS}
+
+
+def _numbers(values):
+    try:
+        return np.array(values, dtype=float)
+    except (TypeError, ValueError):
+        # Some value is not a number: convert one by one, bad ones become NaN
+        return pd.to_numeric(pd.Series(values, dtype=object), errors='coerce').to_numpy(dtype=float)
+
+
+def _timestamps(values):
+    if not all(isinstance(value, str) for value in values):
+        values = [value if isinstance(value, str) else None for value in values]  # Epoch numbers are not accepted
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter('error', UserWarning)  # NumPy only warns about zone offsets
+            return np.array(values, dtype='datetime64[ns]')
+    except (TypeError, ValueError, UserWarning):
+        # Unparseable or zone-qualified strings: let pandas sort them out (bad ones become NaT)
+        parsed = pd.to_datetime(pd.Series(values, dtype=object), errors='coerce', utc=True, format='ISO8601')
+        return parsed.dt.tz_convert(None).to_numpy(dtype='datetime64[ns]')
+
+
+def _report(errors, count, problem):
+    if count:
+        errors.append(f"{count} reading(s) with {problem}")
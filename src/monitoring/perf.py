@@ -0,0 +1,191 @@
+import functools
+import sys
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager, nullcontext
+
+import numpy as np
+import pandas as pd
+
+try:
+    import resource
+except ImportError:  # Unix only; without it (and /proc) peak memory is not reported
+    resource = None
+
+TIMING_PERCENTILES = (50, 90, 99)
+
+
+class PerfRecorder:
+    """Per-stage timings of recent reruns and hit counts of instrumented caches
+
+    A rerun is timed through the Rerun returned by start(): spans time a
+    stage explicitly, checkpoints attribute whatever ran since the previous
+    checkpoint, less the spans inside it. Finished reruns are kept in a
+    bounded window shared by every session of the process.
+    """
+
+    enabled = True
+
+    def __init__(self, max_reruns=500):
+        self.max_reruns = max_reruns
+        self._reruns = deque(maxlen=max_reruns)
+        self._cache_calls = Counter()
+        self._cache_misses = Counter()
+        self._lock = threading.Lock()
+
+    def start(self, label):
+        """Begin timing a rerun (label: the page it renders)"""
+        return Rerun(self, label)
+
+    def record(self, label, stages):
+        with self._lock:
+            self._reruns.append({'finished': pd.Timestamp.now(), 'page': label, **stages})
+
+    def reruns(self, label=None):
+        """Recorded reruns, oldest first, one column of seconds per stage"""
+        with self._lock:
+            frame = pd.DataFrame(list(self._reruns))
+        if label is not None and not frame.empty:
+            frame = frame[frame['page'] == label]
+        return frame
+
+    def stage_percentiles(self, label=None, percentiles=TIMING_PERCENTILES):
+        """Latency percentiles in milliseconds of every stage over the recorded reruns"""
+        frame = self.reruns(label)
+        columns = ['Reruns', 'Mean (ms)', *[f"p{p} (ms)" for p in percentiles], 'Max (ms)']
+        if frame.empty:
+            return pd.DataFrame(columns=columns)
+        rows = {}
+        for stage in frame.columns.drop(['finished', 'page']):
+            seconds = frame[stage].dropna().to_numpy()
+            if len(seconds):
+                rows[stage] = [len(seconds), seconds.mean(), *np.percentile(seconds, percentiles), seconds.max()]
+        table = pd.DataFrame.from_dict(rows, orient='index', columns=columns)
+        table.iloc[:, 1:] *= 1000
+        table.index.name = 'Stage'
+        return table.astype({'Reruns': int}).round(1)
+
+    def track_cache(self, cache, name=None):
+        """Wrap a caching decorator such as st.cache_data so its hits and misses are counted
+
+        Calls are counted around the cached function and misses inside it,
+        where the function body only runs when the cache has no entry.
+        """
+        def decorate(func):
+            key = name or func.__name__
+
+            @functools.wraps(func)
+            def compute(*args, **kwargs):
+                with self._lock:
+                    self._cache_misses[key] += 1
+                return func(*args, **kwargs)
+
+            cached = cache(compute)
+
+            @functools.wraps(func)
+            def call(*args, **kwargs):
+                with self._lock:
+                    self._cache_calls[key] += 1
+                return cached(*args, **kwargs)
+
+            call.clear = cached.clear
+            return call
+        return decorate
+
+    def cache_stats(self):
+        """Hits and misses of every instrumented cache"""
+        with self._lock:
+            return {
+                key: {'hits': calls - self._cache_misses[key], 'misses': self._cache_misses[key]}
+                for key, calls in self._cache_calls.items()
+            }
+
+    def reset(self):
+        with self._lock:
+            self._reruns.clear()
+            self._cache_calls.clear()
+            self._cache_misses.clear()
+
+
+class Rerun:
+    """Stage timings of one rerun, recorded when it finishes"""
+
+    def __init__(self, recorder, label):
+        self.recorder = recorder
+        self.label = label
+        self.stages = {}
+        self.started = self._checkpoint = time.perf_counter()
+        self._spanned = 0.0
+
+    @contextmanager
+    def span(self, stage):
+        """Time a block as a stage; repeated spans of a stage add up (spans do not nest)"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            self.stages[stage] = self.stages.get(stage, 0.0) + elapsed
+            self._spanned += elapsed
+
+    def checkpoint(self, stage):
+        """Attribute the time since the previous checkpoint, less its spans, to a stage"""
+        now = time.perf_counter()
+        self.stages[stage] = self.stages.get(stage, 0.0) + now - self._checkpoint - self._spanned
+        self._checkpoint = now
+        self._spanned = 0.0
+
+    def finish(self):
+        self.stages['total'] = time.perf_counter() - self.started
+        self.recorder.record(self.label, self.stages)
+
+
+class DisabledRecorder:
+    """Stand-in recorder when instrumentation is off: nothing is timed or wrapped"""
+
+    enabled = False
+
+    def start(self, label):
+        return NULL_RERUN
+
+    def track_cache(self, cache, name=None):
+        return cache
+
+
+class _NullRerun:
+    _span = nullcontext()
+
+    def span(self, stage):
+        return self._span
+
+    def checkpoint(self, stage):
+        pass
+
+    def finish(self):
+        pass
+
+
+NULL_RERUN = _NullRerun()
+
+DISABLED = DisabledRecorder()
+
+
+def process_memory():
+    """Current and peak resident memory of this process in bytes (None where unavailable)"""
+    memory = {}
+    try:
+        with open('/proc/self/status') as status:
+            for line in status:
+                if line.startswith(('VmRSS:', 'VmHWM:')):
+                    memory['rss' if line.startswith('VmRSS') else 'peak_rss'] = int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    if 'peak_rss' not in memory and resource is not None:
+        # Kilobytes on Linux, bytes on macOS; no current figure without /proc
+        memory['peak_rss'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * (
+            1 if sys.platform == 'darwin' else 1024
+        )
+    memory.setdefault('rss', None)
+    memory.setdefault('peak_rss', None)
+    return memory
@@ -0,0 +1,172 @@
+import gzip
+import io
+import time
+import zipfile
+from contextlib import contextmanager
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from openpyxl import Workbook
+
+# Format -> (file extension, MIME type)
+EXPORT_FORMATS = {
+    'CSV': ('.csv', 'text/csv'),
+    'JSON Lines': ('.jsonl', 'application/x-ndjson'),
+    'Parquet': ('.parquet', 'application/vnd.apache.parquet'),
+    'Excel (XLSX)': ('.xlsx', 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
+}
+
+# Compression -> (extension added to the file name, MIME type of the result)
+COMPRESSIONS = {
+    'gzip': ('.gz', 'application/gzip'),
+    'zip': ('.zip', 'application/zip')
+}
+
+# Rows per worksheet, header included; larger exports continue on a new sheet
+XLSX_MAX_ROWS = 1_048_576
+
+EXPORT_MAX_AGE = 24 * 3600  # Seconds before a finished export file is cleaned up
+
+
+class ExportResult:
+    """A finished export file ready to be served"""
+
+    def __init__(self, path, file_name, mime, rows):
+        self.path = Path(path)
+        self.file_name = file_name
+        self.mime = mime
+        self.rows = rows
+        self.nbytes = self.path.stat().st_size
+
+    def open(self):
+        return open(self.path, 'rb')
+
+
+def write_export(chunks, export_format, directory, base_name, compression=None, progress=None):
+    """Write an iterable of DataFrame chunks to one file and return an ExportResult
+
+    Chunks are encoded and written one at a time, so memory stays at about
+    one chunk whatever the size of the export. progress(rows) is called
+    after each chunk.
+    """
+    extension, mime = EXPORT_FORMATS[export_format]
+    inner_name = f"{base_name}{extension}"
+    file_name = inner_name
+    if compression:
+        suffix, mime = COMPRESSIONS[compression]
+        file_name = f"{base_name}.zip" if compression == 'zip' else f"{inner_name}{suffix}"
+
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    prune_exports(directory)
+    path = directory / f"{time.time_ns()}-{file_name}"
+
+    writer = WRITERS[export_format]
+    with _open_output(path, compression, inner_name) as stream:
+        rows = writer(_counted(chunks, progress), stream)
+    return ExportResult(path, file_name, mime, rows)
+
+
+def prune_exports(directory, max_age=EXPORT_MAX_AGE):
+    """Delete export files older than max_age seconds"""
+    cutoff = time.time() - max_age
+    for path in Path(directory).iterdir():
+        if path.is_file() and path.stat().st_mtime < cutoff:
+            path.unlink(missing_ok=True)
+
+
+def _counted(chunks, progress):
+    """Pass chunks through, reporting the running row count"""
+    rows = 0
+    for chunk in chunks:
+        yield chunk
+        rows += len(chunk)
+        if progress is not None:
+            progress(rows)
+
+
+@contextmanager
+def _open_output(path, compression, inner_name):
+    """Binary stream into the export file, through gzip or into a zip member"""
+    if compression == 'gzip':
+        with gzip.open(path, 'wb', compresslevel=6) as stream:
+            yield stream
+    elif compression == 'zip':
+        with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as archive:
+            with archive.open(inner_name, 'w', force_zip64=True) as stream:
+                yield stream
+    else:
+        with open(path, 'wb') as stream:
+            yield stream
+
+
+def _write_csv(chunks, stream):
+    text = io.TextIOWrapper(stream, encoding='utf-8', newline='')
+    rows = 0
+    for chunk in chunks:
+        chunk.to_csv(text, header=rows == 0, index=False)
+        rows += len(chunk)
+    text.flush()
+    text.detach()  # Leave the underlying stream for _open_output to close
+    return rows
+
+
+def _write_jsonl(chunks, stream):
+    rows = 0
+    for chunk in chunks:
+        if chunk.empty:
+            continue
+        lines = chunk.to_json(orient='records', lines=True, date_format='iso')
+        stream.write(lines.encode('utf-8'))
+        if not lines.endswith('\n'):
+            stream.write(b'\n')
+        rows += len(chunk)
+    return rows
+
+
+def _write_parquet(chunks, stream):
+    writer = None
+    rows = 0
+    try:
+        for chunk in chunks:
+            if writer is None:
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                writer = pq.ParquetWriter(stream, table.schema, compression='zstd')
+            else:
+                table = pa.Table.from_pandas(chunk, schema=writer.schema, preserve_index=False)
+            writer.write_table(table)
+            rows += len(chunk)
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
+
+
+def _write_xlsx(chunks, stream):
+    # Write-only workbooks stream rows to disk instead of keeping cell objects
+    workbook = Workbook(write_only=True)
+    sheet = None
+    sheet_rows = rows = 0
+    for chunk in chunks:
+        values = chunk.astype(object).where(chunk.notna(), None)
+        for row in values.itertuples(index=False, name=None):
+            if sheet is None or sheet_rows == XLSX_MAX_ROWS:
+                sheet = workbook.create_sheet(f"Data {len(workbook.worksheets) + 1}" if sheet else "Data")
+                sheet.append([str(column) for column in chunk.columns])
+                sheet_rows = 1
+            sheet.append(row)
+            sheet_rows += 1
+        rows += len(chunk)
+    if sheet is None:
+        workbook.create_sheet("Data")
+    workbook.save(stream)
+    return rows
+
+
+WRITERS = {
+    'CSV': _write_csv,
+    'JSON Lines': _write_jsonl,
+    'Parquet': _write_parquet,
+    'Excel (XLSX)': _write_xlsx
+}
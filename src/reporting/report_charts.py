@@ -0,0 +1,117 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+
+from matplotlib.figure import Figure
+
+from src.reporting.report_statistics import REPORT_PARAMETERS
+
+CHART_SIZE = (10, 4.2)  # Inches; two charts fill a portrait A4 page
+
+CHART_DPI = 150
+
+NBI_BLUE = '#2a5298'
+
+NBI_COLORS = ['#2a5298', '#1e88e5', '#43a047', '#fb8c00', '#e53935']
+
+
+def _daily_levels(fig, statistics, measurements):
+    daily = statistics['daily']
+    ax = fig.add_subplot()
+    ax.plot(daily.index, daily['water_level'], color=NBI_COLORS[0], label='Water level (m)')
+    ax.set_ylabel('Water level (m)')
+    flow_ax = ax.twinx()
+    flow_ax.plot(daily.index, daily['flow_rate'], color=NBI_COLORS[3], label='Flow rate (m³/s)')
+    flow_ax.set_ylabel('Flow rate (m³/s)')
+    ax.set_title('Network daily mean water level and flow')
+    _legend(ax, flow_ax)
+    fig.autofmt_xdate()
+
+
+def _daily_quality(fig, statistics, measurements):
+    daily = statistics['daily']
+    ax = fig.add_subplot()
+    ax.bar(daily.index, daily['readings'], color=NBI_COLORS[1], alpha=0.5, label='Readings')
+    ax.set_ylabel('Readings per day')
+    quality_ax = ax.twinx()
+    quality_ax.plot(daily.index, daily['data_quality'], color=NBI_COLORS[2], label='Data quality (%)')
+    quality_ax.set_ylabel('Data quality (%)')
+    quality_ax.set_ylim(0, 100)
+    ax.set_title('Data volume and quality per day')
+    _legend(ax, quality_ax)
+    fig.autofmt_xdate()
+
+
+def _legend(ax, twin_ax):
+    """One legend for the series of both y axes"""
+    handles, labels = ax.get_legend_handles_labels()
+    twin_handles, twin_labels = twin_ax.get_legend_handles_labels()
+    twin_ax.legend(handles + twin_handles, labels + twin_labels, loc='best', frameon=False, fontsize=8)
+
+
+def _country_bars(column, title, color):
+    def draw(fig, statistics, measurements):
+        values = statistics['countries'][column].sort_values()
+        ax = fig.add_subplot()
+        ax.barh(values.index, values.to_numpy(), color=color)
+        ax.set_xlim(0, 100)
+        ax.set_xlabel(column)
+        ax.set_title(title)
+        for y, value in enumerate(values.to_numpy()):
+            ax.text(min(value, 100) + 1, y, f"{value:.1f}", va='center', fontsize=8)
+    return draw
+
+
+def _parameter_distributions(fig, statistics, measurements):
+    axes = fig.subplots(1, len(REPORT_PARAMETERS))
+    for ax, (column, label), color in zip(axes, REPORT_PARAMETERS.items(), NBI_COLORS):
+        values = measurements[column].dropna().to_numpy()
+        if len(values):
+            ax.hist(values, bins=30, color=color)
+        ax.set_title(label, fontsize=9)
+        ax.tick_params(labelsize=7)
+    fig.suptitle('Distribution of readings')
+
+
+# Chart name -> draw(figure, statistics, measurements)
+CHARTS = {
+    'daily_levels': _daily_levels,
+    'daily_quality': _daily_quality,
+    'country_uptime': _country_bars('Uptime (%)', 'System uptime by country', NBI_COLORS[2]),
+    'country_quality': _country_bars('Data quality (%)', 'Average data quality by country', NBI_BLUE),
+    'parameter_distributions': _parameter_distributions
+}
+
+
+class ChartAssetCache:
+    """Rendered report charts as PNG files, shared by reports of the same data
+
+    A chart depends only on the readings and stations it was drawn from,
+    so reports over the same period and stations reuse the files instead
+    of drawing them again. Workers in other processes share the directory;
+    files are written under a temporary name and renamed into place.
+    """
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+
+    @staticmethod
+    def key(*parts):
+        """Cache key of the data a set of charts is drawn from"""
+        return hashlib.sha1(json.dumps(parts, default=str).encode()).hexdigest()[:16]
+
+    def get(self, key, name, statistics, measurements):
+        """Path of a chart PNG, drawn only if not cached; returns (path, cached)"""
+        path = self.directory / f"{key}-{name}.png"
+        if path.exists():
+            os.utime(path)  # Keeps charts in use from being pruned
+            return path, True
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        fig = Figure(figsize=CHART_SIZE, layout='tight')
+        CHARTS[name](fig, statistics, measurements)
+        temp_path = path.with_name(f"{path.stem}.{os.getpid()}.tmp")
+        fig.savefig(temp_path, format='png', dpi=CHART_DPI)
+        os.replace(temp_path, path)
+        return path, False
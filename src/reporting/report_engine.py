@@ -0,0 +1,337 @@
+import base64
+import html
+import itertools
+import multiprocessing
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
+import pandas as pd
+from matplotlib import rc_context
+from matplotlib.backends.backend_pdf import PdfPages
+from matplotlib.figure import Figure
+from matplotlib.image import imread
+
+from src.data_processing.measurement_store import MeasurementStore
+from src.reporting.export_pipeline import ExportResult, prune_exports
+from src.reporting.report_charts import ChartAssetCache
+from src.reporting.report_statistics import report_statistics
+
+# Format -> (file extension, MIME type)
+REPORT_FORMATS = {
+    'PDF Report': ('.pdf', 'application/pdf'),
+    'HTML Report': ('.html', 'text/html')
+}
+
+# Report -> charts and tables it contains, in page order
+REPORT_KINDS = {
+    'Executive Dashboard': {
+        'charts': ['daily_levels', 'country_uptime', 'country_quality'],
+        'tables': ['countries', 'alert_counts']
+    },
+    'Technical Report': {
+        'charts': ['daily_levels', 'daily_quality', 'country_uptime', 'country_quality', 'parameter_distributions'],
+        'tables': ['countries', 'parameters', 'stations', 'alert_counts', 'alerts']
+    }
+}
+
+TABLE_TITLES = {
+    'countries': 'Country summary',
+    'parameters': 'Parameter statistics',
+    'stations': 'Stations by data quality',
+    'alert_counts': 'Open alerts by type and severity',
+    'alerts': 'Open alerts'
+}
+
+ALERT_TABLES = {'alert_counts', 'alerts'}
+
+PAGE_SIZE = (8.27, 11.69)  # A4 portrait, inches
+
+TABLE_ROWS_PER_PAGE = 60
+
+REGULAR = 'medium'  # Weight of the regular standard PDF fonts (Helvetica, Courier)
+
+TABLE_WIDTH_POINTS = 0.9 * PAGE_SIZE[0] * 72  # Printable width of a table
+
+MAX_JOBS = 200  # Finished jobs kept for polling before the oldest are forgotten
+
+
+class ReportEngine:
+    """Renders PDF/HTML reports in worker processes, polled by job ID
+
+    Reading the period, computing the statistics and drawing the charts
+    take seconds on a large network, so they run in a process pool and the
+    page only submits a job and checks on it. Workers read measurements
+    from the Parquet store themselves; only the station table and the open
+    alerts are sent along with a job. A positive niceness lowers the
+    workers' CPU priority, for background work such as scheduled reports.
+    """
+
+    def __init__(self, store_root, output_dir, asset_dir, workers=2, niceness=0):
+        self.store_root = str(store_root)
+        self.output_dir = str(output_dir)
+        self.asset_dir = str(asset_dir)
+        self.workers = workers
+        self.niceness = niceness
+        self.jobs = OrderedDict()
+        self._pool = None
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def submit(self, kind, report_format, stations_df, alerts, start, end, base_name, options=None):
+        """Queue a report of stations_df over [start, end) and return its job ID
+
+        options switch off parts of the report: charts, alerts, summary.
+        """
+        spec = {
+            'kind': kind,
+            'format': report_format,
+            'stations': stations_df,
+            'alerts': [{key: value for key, value in alert.items() if key != 'coordinates'} for alert in alerts],
+            'start': pd.Timestamp(start),
+            'end': pd.Timestamp(end),
+            'base_name': base_name,
+            'options': {'charts': True, 'alerts': True, 'summary': True, **(options or {})},
+            'store_root': self.store_root,
+            'output_dir': self.output_dir,
+            'asset_dir': self.asset_dir
+        }
+        with self._lock:
+            job_id = f"r{next(self._ids)}"
+            try:
+                future = self._executor().submit(render_report, spec)
+            except BrokenProcessPool:
+                # A worker died (e.g. out of memory); start a fresh pool for this and later jobs
+                self._pool = None
+                future = self._executor().submit(render_report, spec)
+            job = {'id': job_id, 'kind': kind, 'format': report_format,
+                   'submitted': time.time(), 'finished': None, 'future': future}
+            future.add_done_callback(lambda _: job.update(finished=time.time()))
+            self.jobs[job_id] = job
+            self._forget_old_jobs()
+        return job_id
+
+    def status(self, job_id):
+        """State of a job: queued, running, done (with result) or failed (with error)"""
+        job = self.jobs.get(job_id)
+        if job is None:
+            return {'id': job_id, 'state': 'unknown'}
+        future = job['future']
+        status = {key: job[key] for key in ('id', 'kind', 'format', 'submitted')}
+        status['seconds'] = (job['finished'] or time.time()) - job['submitted']
+        if not future.done():
+            status['state'] = 'running' if future.running() else 'queued'
+        elif future.exception() is not None:
+            status['state'] = 'failed'
+            status['error'] = str(future.exception()) or type(future.exception()).__name__
+        else:
+            status['state'] = 'done'
+            status['result'], status['charts_cached'] = future.result()
+        return status
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def _executor(self):
+        if self._pool is None:
+            # Spawned, not forked: the app serves sessions from several threads
+            self._pool = ProcessPoolExecutor(max_workers=self.workers,
+                                             mp_context=multiprocessing.get_context('spawn'),
+                                             initializer=_lower_priority, initargs=(self.niceness,))
+        return self._pool
+
+    def _forget_old_jobs(self):
+        for job_id in list(self.jobs):
+            if len(self.jobs) <= MAX_JOBS:
+                break
+            if self.jobs[job_id]['future'].done():
+                del self.jobs[job_id]
+
+
+def _lower_priority(niceness):
+    """Worker initializer: yield the CPU to the dashboard's own processes"""
+    if niceness and hasattr(os, 'nice'):
+        os.nice(niceness)
+
+
+def render_report(spec):
+    """Worker: read the period, compute the statistics and write the report; returns (result, charts cached)"""
+    stations_df = spec['stations']
+    store = MeasurementStore(spec['store_root'])
+    measurements = store.read(start=spec['start'], end=spec['end'], station_ids=stations_df['station_id'])
+    statistics = report_statistics(stations_df, measurements, spec['alerts'], spec['start'], spec['end'])
+
+    layout = REPORT_KINDS[spec['kind']]
+    options = spec['options']
+    charts = []
+    charts_cached = 0
+    if options['charts'] and len(measurements):
+        cache = ChartAssetCache(spec['asset_dir'])
+        if cache.directory.exists():
+            prune_exports(cache.directory)
+        key = cache.key(store_fingerprint(store.root, spec['start'], spec['end']),
+                        spec['start'], spec['end'], sorted(stations_df['station_id']))
+        for name in layout['charts']:
+            path, cached = cache.get(key, name, statistics, measurements)
+            charts.append(path)
+            charts_cached += cached
+    tables = [name for name in layout['tables'] if options['alerts'] or name not in ALERT_TABLES]
+
+    extension, mime = REPORT_FORMATS[spec['format']]
+    file_name = f"{spec['base_name']}{extension}"
+    output_dir = Path(spec['output_dir'])
+    output_dir.mkdir(parents=True, exist_ok=True)
+    prune_exports(output_dir)
+    path = output_dir / f"{time.time_ns()}-{file_name}"
+
+    writer = _write_pdf if spec['format'] == 'PDF Report' else _write_html
+    writer(path, spec['kind'], statistics, charts, tables, options['summary'])
+    return ExportResult(path, file_name, mime, len(measurements)), charts_cached
+
+
+def store_fingerprint(root, start, end):
+    """Files of the period's partitions with sizes and times; changes with any write to them"""
+    first_day = pd.Timestamp(start).strftime('%Y-%m-%d')
+    last_day = pd.Timestamp(end).strftime('%Y-%m-%d')
+    entries = []
+    for path in Path(root).glob('country=*/day=*/*.parquet'):
+        if first_day <= path.parent.name[len('day='):] <= last_day:
+            stat = path.stat()
+            entries.append((str(path.relative_to(root)), stat.st_size, stat.st_mtime_ns))
+    return sorted(entries)
+
+
+def _summary_lines(statistics):
+    overview = statistics['overview']
+    return [
+        ('Reporting period', f"{overview['period_start']:%Y-%m-%d} to "
+                             f"{overview['period_end'] - pd.Timedelta(days=1):%Y-%m-%d}"),
+        ('Stations', f"{overview['total_stations']:,} ({overview['active_stations']:,} active) "
+                     f"in {overview['countries']} countries"),
+        ('Data points analyzed', f"{overview['data_points']:,}"),
+        ('Average data quality', _percent(overview['avg_quality'])),
+        ('Transmission success', _percent(overview['transmission_success'])),
+        ('System uptime', _percent(overview['system_uptime'])),
+        ('Average battery level', _percent(overview['avg_battery'])),
+        ('Open alerts', f"{overview['open_alerts']:,} ({overview['critical_alerts']:,} critical)")
+    ]
+
+
+def _percent(value):
+    return 'n/a' if pd.isna(value) else f"{value:.1f}%"
+
+
+def _table_frame(statistics, name):
+    frame = statistics[name]
+    if name == 'alerts':
+        frame = frame.assign(timestamp=frame['timestamp'].map(lambda value: f"{value:%Y-%m-%d %H:%M}"))
+    return frame.reset_index() if frame.index.name else frame
+
+
+def _write_pdf(path, kind, statistics, charts, tables, include_summary):
+    generated = pd.Timestamp.now()
+    # The standard PDF fonts need no glyph layout or embedding, which dominates the table pages
+    with rc_context({'pdf.use14corefonts': True}), PdfPages(path, metadata={'Title': f"NBI {kind}", 'Creator': 'NBI Water Resources Management System'}) as pdf:
+        fig = Figure(figsize=PAGE_SIZE)
+        fig.text(0.08, 0.92, 'Nile Basin Initiative', fontsize=14, color='#2a5298', weight=REGULAR)
+        fig.text(0.08, 0.88, kind, fontsize=24, weight='bold')
+        fig.text(0.08, 0.85, f"Generated {generated:%Y-%m-%d %H:%M}", fontsize=10, color='#666666', weight=REGULAR)
+        if include_summary:
+            for row, (label, value) in enumerate(_summary_lines(statistics)):
+                y = 0.76 - row * 0.035
+                fig.text(0.08, y, label, fontsize=11, color='#444444', weight=REGULAR)
+                fig.text(0.45, y, value, fontsize=11, weight='bold')
+        pdf.savefig(fig)
+
+        for page_charts in _pages(charts, 2):
+            fig = Figure(figsize=PAGE_SIZE)
+            for slot, chart in enumerate(page_charts):
+                ax = fig.add_axes([0.04, 0.52 - slot * 0.47, 0.92, 0.44])
+                ax.imshow(imread(chart))
+                ax.set_axis_off()
+            pdf.savefig(fig)
+
+        for name in tables:
+            frame = _table_frame(statistics, name)
+            for number, rows in enumerate(_pages(range(len(frame)), TABLE_ROWS_PER_PAGE) or [[]]):
+                fig = Figure(figsize=PAGE_SIZE)
+                fig.text(0.05, 0.95, TABLE_TITLES[name] + (' (continued)' if number else ''),
+                         fontsize=14, weight='bold')
+                if rows:
+                    _draw_table(fig, frame.iloc[rows])
+                else:
+                    fig.text(0.05, 0.9, 'Nothing to report for this period.', fontsize=10, weight=REGULAR)
+                pdf.savefig(fig)
+
+
+def _draw_table(fig, page):
+    """Draw a table as one monospaced text block per column
+
+    A text artist per cell (matplotlib's own tables) makes a long station
+    listing take tens of seconds to render; a block per column is instant.
+    """
+    cells = page.astype(object).where(page.notna(), '')
+    columns = [[str(column), *map(_cell, cells[column])] for column in page.columns]
+    widths = [max(map(len, column)) + 2 for column in columns]
+    fontsize = min(8, TABLE_WIDTH_POINTS / (0.6 * sum(widths)))  # Monospace glyphs are ~0.6 em wide
+    x = 0.05
+    for column, width, dtype in zip(columns, widths, page.dtypes):
+        numeric = pd.api.types.is_numeric_dtype(dtype)
+        left, x = x, x + 0.9 * width / sum(widths)
+        anchor = {'x': x - 0.005, 'ha': 'right'} if numeric else {'x': left, 'ha': 'left'}
+        fig.text(s=column[0], y=0.92, va='top', fontsize=fontsize, family='monospace', weight='bold', **anchor)
+        fig.text(s='\n'.join(column[1:]), y=0.9, va='top', fontsize=fontsize, family='monospace',
+                 weight=REGULAR, linespacing=1.5, **anchor)
+
+
+def _write_html(path, kind, statistics, charts, tables, include_summary):
+    generated = pd.Timestamp.now()
+    parts = [
+        f"<!DOCTYPE html><html><head><meta charset='utf-8'><title>NBI {html.escape(kind)}</title>",
+        f"<style>{HTML_STYLE}</style></head><body>",
+        f"<p class='org'>Nile Basin Initiative</p><h1>{html.escape(kind)}</h1>",
+        f"<p class='generated'>Generated {generated:%Y-%m-%d %H:%M}</p>"
+    ]
+    if include_summary:
+        parts.append("<table class='summary'>")
+        parts.extend(f"<tr><th>{html.escape(label)}</th><td>{html.escape(value)}</td></tr>"
+                     for label, value in _summary_lines(statistics))
+        parts.append("</table>")
+    for chart in charts:
+        encoded = base64.b64encode(Path(chart).read_bytes()).decode('ascii')
+        parts.append(f"<img src='data:image/png;base64,{encoded}' alt='{html.escape(Path(chart).stem)}'>")
+    for name in tables:
+        frame = _table_frame(statistics, name)
+        parts.append(f"<h2>{TABLE_TITLES[name]}</h2>")
+        if frame.empty:
+            parts.append("<p>Nothing to report for this period.</p>")
+        else:
+            parts.append(frame.to_html(index=False, na_rep='', float_format=_cell, classes='data'))
+    parts.append("</body></html>")
+    path.write_text(''.join(parts), encoding='utf-8')
+
+
+HTML_STYLE = """
+body { font-family: Helvetica, Arial, sans-serif; max-width: 1000px; margin: 2rem auto; color: #222; }
+.org { color: #2a5298; margin: 0; } .generated { color: #666; }
+h1 { margin: 0.2rem 0; } h2 { color: #2a5298; margin-top: 2rem; }
+img { width: 100%; margin: 1rem 0; }
+table { border-collapse: collapse; font-size: 0.85rem; }
+th, td { border-bottom: 1px solid #ddd; padding: 0.3rem 0.6rem; text-align: right; }
+.summary th { text-align: left; font-weight: normal; color: #444; } .summary td { font-weight: bold; }
+"""
+
+
+def _cell(value):
+    return f"{value:,.1f}" if isinstance(value, float) else str(value)
+
+
+def _pages(items, size):
+    items = list(items)
+    return [items[start:start + size] for start in range(0, len(items), size)]
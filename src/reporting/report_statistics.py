@@ -0,0 +1,135 @@
+import numpy as np
+import pandas as pd
+
+from src.alerts.alert_engine import SEVERITY_NAMES
+from src.data_processing.measurement_generator import FREQUENCY_STEPS
+from src.data_processing.rollups import TRANSMISSION_OK_QUALITY
+
+REPORT_PARAMETERS = {
+    'water_level': 'Water level (m)',
+    'flow_rate': 'Flow rate (m³/s)',
+    'temperature': 'Temperature (°C)',
+    'data_quality': 'Data quality (%)',
+    'battery_level': 'Battery (%)'
+}
+
+ALERT_SEVERITIES = list(SEVERITY_NAMES[:0:-1])  # Most severe first
+
+ALERT_COLUMNS = ['station_id', 'station_name', 'country', 'type', 'severity', 'current_value', 'threshold', 'timestamp']
+
+
+def scheduled_readings(stations_df, start, end):
+    """Readings each station should have sent in [start, end) at its data frequency"""
+    span = max(pd.Timestamp(end) - pd.Timestamp(start), pd.Timedelta(0))
+    counts = [
+        span // pd.Timedelta(FREQUENCY_STEPS.get(frequency, FREQUENCY_STEPS['Daily'])[0])
+        for frequency in stations_df['data_frequency']
+    ]
+    return pd.Series(counts, index=stations_df['station_id'].to_numpy(), dtype=float)
+
+
+def system_uptime(stations_df, usable_readings, start, end):
+    """Usable readings as a percentage of the scheduled ones (NaN when nothing was due)
+
+    A reading is usable when it arrived with data quality above
+    TRANSMISSION_OK_QUALITY, as for the dashboard's transmission success.
+    """
+    scheduled = scheduled_readings(stations_df, start, end).sum()
+    if not scheduled:
+        return np.nan
+    return min(usable_readings / scheduled, 1.0) * 100
+
+
+def covered_period(start, end, first_reading, last_reading):
+    """Part of [start, end) that the data covers, as a (start, end) pair"""
+    if first_reading is None or pd.isna(first_reading):
+        return pd.Timestamp(start), pd.Timestamp(start)
+    covered_start = max(pd.Timestamp(start), pd.Timestamp(first_reading))
+    covered_end = min(pd.Timestamp(end), pd.Timestamp(last_reading) + pd.Timedelta(seconds=1))
+    return covered_start, max(covered_start, covered_end)
+
+
+def report_statistics(stations_df, measurements_df, alerts, start, end):
+    """Figures and tables behind the executive and technical reports
+
+    start and end bound the requested period; uptime is only counted over
+    the part of it covered by data, so a period reaching past the archive
+    is not reported as an outage.
+    """
+    measurements = measurements_df[measurements_df['station_id'].isin(stations_df['station_id'])]
+    # Compact frames hold float32/uint8 readings; report figures are computed in float64
+    measurements = measurements.astype({column: float for column in REPORT_PARAMETERS})
+    usable = measurements['data_quality'] > TRANSMISSION_OK_QUALITY
+    covered_start, covered_end = covered_period(
+        start, end, measurements['timestamp'].min(), measurements['timestamp'].max()
+    )
+
+    scheduled = scheduled_readings(stations_df, covered_start, covered_end)
+    usable_by_station = measurements.loc[usable, 'station_id'].value_counts()
+    countries = stations_df.set_index('station_id')['country']
+
+    overview = {
+        'period_start': pd.Timestamp(start),
+        'period_end': pd.Timestamp(end),
+        'total_stations': len(stations_df),
+        'active_stations': int((stations_df['status'] == 'Active').sum()),
+        'countries': int(stations_df['country'].nunique()),
+        'data_points': len(measurements),
+        'avg_quality': measurements['data_quality'].mean(),
+        'avg_battery': measurements['battery_level'].mean(),
+        'transmission_success': usable.mean() * 100 if len(measurements) else np.nan,
+        'system_uptime': system_uptime(stations_df, int(usable.sum()), covered_start, covered_end),
+        'critical_alerts': sum(alert['severity'] == 'Critical' for alert in alerts),
+        'open_alerts': len(alerts)
+    }
+
+    by_country = measurements.assign(country=measurements['station_id'].map(countries)).groupby('country')
+    country_table = pd.DataFrame({
+        'Stations': stations_df.groupby('country').size(),
+        'Active': stations_df[stations_df['status'] == 'Active'].groupby('country').size(),
+        'Readings': by_country.size(),
+        'Water level (m)': by_country['water_level'].mean(),
+        'Flow rate (m³/s)': by_country['flow_rate'].mean(),
+        'Data quality (%)': by_country['data_quality'].mean(),
+        'Uptime (%)': (
+            usable_by_station.groupby(countries).sum()
+            / scheduled.groupby(countries).sum().replace(0, np.nan) * 100
+        ).clip(upper=100)
+    }).fillna({'Active': 0, 'Readings': 0}).round(1)
+    country_table.index.name = 'Country'
+
+    parameter_table = pd.DataFrame({
+        label: measurements[column].describe(percentiles=[0.05, 0.5, 0.95])
+        for column, label in REPORT_PARAMETERS.items()
+    }).T.round(2)
+    parameter_table.index.name = 'Parameter'
+
+    station_table = measurements.groupby('station_id').agg(
+        readings=('data_quality', 'size'),
+        data_quality=('data_quality', 'mean'),
+        battery_level=('battery_level', 'min')
+    )
+    station_table['uptime'] = (usable_by_station.reindex(station_table.index, fill_value=0)
+                               / scheduled.reindex(station_table.index).replace(0, np.nan) * 100).clip(upper=100)
+    station_table = (station_table.join(stations_df.set_index('station_id')[['name', 'country', 'status']])
+                     .sort_values('data_quality').round(1))
+    station_table = station_table[['name', 'country', 'status', 'readings', 'data_quality', 'uptime', 'battery_level']]
+    station_table.columns = ['Name', 'Country', 'Status', 'Readings', 'Data quality (%)', 'Uptime (%)', 'Min battery (%)']
+    station_table.index.name = 'Station'
+
+    daily = measurements.set_index('timestamp')[list(REPORT_PARAMETERS)].resample('D').mean()
+    daily['readings'] = measurements.set_index('timestamp')['station_id'].resample('D').size()
+
+    alert_table = pd.DataFrame(alerts, columns=ALERT_COLUMNS)
+    alert_counts = (alert_table.groupby(['type', 'severity']).size().unstack(fill_value=0)
+                    .reindex(columns=ALERT_SEVERITIES, fill_value=0))
+
+    return {
+        'overview': overview,
+        'countries': country_table,
+        'parameters': parameter_table,
+        'stations': station_table,
+        'daily': daily,
+        'alerts': alert_table,
+        'alert_counts': alert_counts
+    }
@@ -0,0 +1,416 @@
+import json
+import os
+import re
+import smtplib
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from datetime import datetime, timedelta
+from email.message import EmailMessage
+from pathlib import Path
+
+from src.reporting.report_engine import store_fingerprint
+
+FREQUENCIES = ['Daily', 'Weekly', 'Monthly', 'Quarterly']
+
+QUARTER_START_MONTHS = (1, 4, 7, 10)
+
+EMAIL_PATTERN = re.compile(r"^[^@\s,;]+@[^@\s,;]+\.[^@\s,;]+$")
+
+REPORT_SENDER = "NBI Water Resources <reports@nilebasin.org>"
+
+STALE_RUN_SECONDS = 3600  # A run claimed this long ago without finishing died with its process
+
+MAX_REUSED_REPORTS = 64  # Rendered reports remembered for schedules asking for the same one
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS schedules (
+    id INTEGER PRIMARY KEY,
+    kind TEXT NOT NULL,
+    format TEXT NOT NULL,
+    frequency TEXT NOT NULL,
+    send_time TEXT NOT NULL,
+    recipients TEXT NOT NULL,
+    filters TEXT NOT NULL,
+    include_charts INTEGER NOT NULL,
+    include_alerts INTEGER NOT NULL,
+    include_summary INTEGER NOT NULL,
+    created_at TEXT NOT NULL,
+    next_run TEXT NOT NULL,
+    running_since TEXT,
+    last_run TEXT,
+    last_status TEXT,
+    last_error TEXT
+);
+CREATE INDEX IF NOT EXISTS schedules_next_run ON schedules (next_run);
+CREATE TABLE IF NOT EXISTS deliveries (
+    id INTEGER PRIMARY KEY,
+    schedule_id INTEGER NOT NULL,
+    scheduled_for TEXT NOT NULL,
+    delivered_at TEXT NOT NULL,
+    status TEXT NOT NULL,
+    file_name TEXT,
+    coalesced_runs INTEGER NOT NULL,
+    reused INTEGER NOT NULL,
+    error TEXT
+);
+"""
+
+
+def parse_recipients(text):
+    """Split a recipient list (lines, commas or semicolons) into (valid, invalid) addresses"""
+    addresses = [address.strip() for address in re.split(r"[\n,;]+", text or '') if address.strip()]
+    valid = [address for address in addresses if EMAIL_PATTERN.match(address)]
+    return valid, [address for address in addresses if address not in valid]
+
+
+def is_run_day(frequency, day):
+    """Weekly reports go out on Mondays, monthly on the 1st, quarterly on the 1st of a quarter"""
+    if frequency == 'Weekly':
+        return day.weekday() == 0
+    if frequency == 'Monthly':
+        return day.day == 1
+    if frequency == 'Quarterly':
+        return day.day == 1 and day.month in QUARTER_START_MONTHS
+    return True
+
+
+def next_occurrence(frequency, send_time, after):
+    """First run time of a schedule strictly after `after`"""
+    hour, minute = map(int, send_time.split(':'))
+    day = after.date()
+    while True:
+        candidate = datetime(day.year, day.month, day.day, hour, minute)
+        if candidate > after and is_run_day(frequency, day):
+            return candidate
+        day += timedelta(days=1)
+
+
+def report_period(frequency, scheduled_for):
+    """[start, end) reported by a run: the day, week, month or quarter before its run day"""
+    end = datetime(scheduled_for.year, scheduled_for.month, scheduled_for.day)
+    if frequency == 'Daily':
+        return end - timedelta(days=1), end
+    if frequency == 'Weekly':
+        return end - timedelta(days=7), end
+    months = 3 if frequency == 'Quarterly' else 1
+    month_index = end.year * 12 + end.month - 1 - months
+    return datetime(month_index // 12, month_index % 12 + 1, 1), end
+
+
+class ScheduleStore:
+    """Report schedules and their delivery log in a SQLite database
+
+    Every call opens its own connection, so sessions and the scheduler
+    thread can share the store. Claiming a run is one conditional UPDATE,
+    so two app processes on the same database never run it twice.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(SCHEMA)
+
+    def add(self, kind, report_format, frequency, send_time, recipients, filters,
+            include_charts=True, include_alerts=True, include_summary=True, now=None):
+        """Store a schedule and return its ID"""
+        if frequency not in FREQUENCIES:
+            raise ValueError(f"Unknown frequency {frequency!r}")
+        now = now or datetime.now()
+        with closing(self._connect()) as connection, connection:
+            cursor = connection.execute(
+                "INSERT INTO schedules (kind, format, frequency, send_time, recipients, filters, include_charts, "
+                "include_alerts, include_summary, created_at, next_run) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (kind, report_format, frequency, send_time, json.dumps(list(recipients)), json.dumps(filters),
+                 int(include_charts), int(include_alerts), int(include_summary), now.isoformat(),
+                 next_occurrence(frequency, send_time, now).isoformat())
+            )
+            return cursor.lastrowid
+
+    def remove(self, schedule_id):
+        with closing(self._connect()) as connection, connection:
+            connection.execute("DELETE FROM schedules WHERE id = ?", (schedule_id,))
+
+    def schedules(self):
+        with closing(self._connect()) as connection:
+            rows = connection.execute("SELECT * FROM schedules ORDER BY next_run").fetchall()
+        return [self._schedule(row) for row in rows]
+
+    def due(self, now):
+        """Schedules whose next run has come and that are not running"""
+        with closing(self._connect()) as connection:
+            rows = connection.execute(
+                "SELECT * FROM schedules WHERE next_run <= ? AND (running_since IS NULL OR running_since < ?) "
+                "ORDER BY next_run",
+                (now.isoformat(), (now - timedelta(seconds=STALE_RUN_SECONDS)).isoformat())
+            ).fetchall()
+        return [self._schedule(row) for row in rows]
+
+    def claim(self, schedule, next_run, now):
+        """Mark a due schedule as running and move its next run on; False if another runner got it first"""
+        with closing(self._connect()) as connection, connection:
+            cursor = connection.execute(
+                "UPDATE schedules SET next_run = ?, running_since = ? WHERE id = ? AND next_run = ?",
+                (next_run.isoformat(), now.isoformat(), schedule['id'], schedule['next_run'].isoformat())
+            )
+            return cursor.rowcount == 1
+
+    def finish(self, schedule_id, scheduled_for, status, file_name=None, coalesced_runs=0, reused=False, error=None):
+        """Record the outcome of a run and release the schedule"""
+        now = datetime.now().isoformat()
+        with closing(self._connect()) as connection, connection:
+            connection.execute(
+                "UPDATE schedules SET running_since = NULL, last_run = ?, last_status = ?, last_error = ? WHERE id = ?",
+                (scheduled_for.isoformat(), status, error, schedule_id)
+            )
+            connection.execute(
+                "INSERT INTO deliveries (schedule_id, scheduled_for, delivered_at, status, file_name, "
+                "coalesced_runs, reused, error) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (schedule_id, scheduled_for.isoformat(), now, status, file_name, coalesced_runs, int(reused), error)
+            )
+
+    def deliveries(self, limit=20):
+        with closing(self._connect()) as connection:
+            rows = connection.execute("SELECT * FROM deliveries ORDER BY id DESC LIMIT ?", (limit,)).fetchall()
+        return [dict(row) for row in rows]
+
+    def _connect(self):
+        connection = sqlite3.connect(self.path, timeout=30)
+        connection.row_factory = sqlite3.Row
+        return connection
+
+    @staticmethod
+    def _schedule(row):
+        schedule = dict(row)
+        schedule['recipients'] = json.loads(schedule['recipients'])
+        schedule['filters'] = json.loads(schedule['filters'])
+        for column in ('created_at', 'next_run', 'running_since', 'last_run'):
+            if schedule[column]:
+                schedule[column] = datetime.fromisoformat(schedule[column])
+        return schedule
+
+
+class OutboxMailer:
+    """Local SMTP stand-in: every message is written to a directory as an .eml file"""
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+
+    def send(self, message):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.directory / f"{time.time_ns()}.eml"
+        temp_path = path.with_suffix('.tmp')
+        temp_path.write_bytes(message.as_bytes())
+        os.replace(temp_path, path)
+        return path
+
+
+class SmtpMailer:
+    """Delivers messages through an SMTP relay"""
+
+    def __init__(self, host, port=25, username=None, password=None, use_tls=False):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+
+    def send(self, message):
+        with smtplib.SMTP(self.host, self.port, timeout=60) as smtp:
+            if self.use_tls:
+                smtp.starttls()
+            if self.username:
+                smtp.login(self.username, self.password)
+            smtp.send_message(message)
+
+
+class ReportScheduler:
+    """Runs due report schedules in the background and mails the reports
+
+    A daemon thread checks the store every poll_interval seconds. Reports
+    are rendered by the scheduler's own ReportEngine, which should have few
+    low-priority workers so a burst of scheduled reports leaves the
+    dashboard responsive. At most max_concurrent renders are in flight;
+    other due schedules wait for the next check. Schedules asking for the
+    same report (kind, format, sections, stations, period and unchanged
+    data) share one render. Runs missed while the app was down are
+    coalesced into one run for the latest missed occurrence.
+    """
+
+    def __init__(self, store, engine, mailer, stations_provider, alerts_provider,
+                 max_concurrent=2, poll_interval=30):
+        self.store = store
+        self.engine = engine
+        self.mailer = mailer
+        self.stations_provider = stations_provider
+        self.alerts_provider = alerts_provider
+        self.max_concurrent = max_concurrent
+        self.poll_interval = poll_interval
+        self.last_error = None
+        self._in_flight = {}
+        self._rendered = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='report-scheduler', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def busy(self):
+        """True while renders are in flight"""
+        return bool(self._in_flight)
+
+    def tick(self, now=None):
+        """Deliver finished renders, then start due runs; returns the number of runs started"""
+        with self._lock:
+            self._collect()
+            now = now or datetime.now()
+            due = self.store.due(now)
+            if not due:
+                return 0
+            stations_df = self.stations_provider()
+            alerts = self.alerts_provider()
+            started = 0
+            for schedule in due:
+                scheduled_for, coalesced_runs, next_run = _plan_run(schedule, now)
+                key, request = self._render_request(schedule, scheduled_for, stations_df, alerts)
+                run = {'schedule': schedule, 'scheduled_for': scheduled_for, 'coalesced_runs': coalesced_runs}
+
+                reusable = self._rendered.get(key)
+                if reusable is not None and not reusable.path.exists():
+                    del self._rendered[key]  # Pruned from the output directory
+                    reusable = None
+                joins = key in self._in_flight
+                if reusable is None and not joins and len(self._in_flight) >= self.max_concurrent:
+                    continue  # Stays due until a render slot frees up
+                if not self.store.claim(schedule, next_run, now):
+                    continue
+                started += 1
+
+                if reusable is not None:
+                    self._deliver(run, reusable, reused=True)
+                elif joins:
+                    self._in_flight[key]['runs'].append(run)
+                else:
+                    try:
+                        job_id = self.engine.submit(**request)
+                    except (OSError, RuntimeError) as error:
+                        self.store.finish(schedule['id'], scheduled_for, 'failed', coalesced_runs=coalesced_runs,
+                                          error=f"Could not start the report: {error}")
+                        continue
+                    self._in_flight[key] = {'job_id': job_id, 'runs': [run]}
+            return started
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.tick()
+                self.last_error = None
+            except Exception as error:  # Keep scheduling; the page shows the error
+                self.last_error = f"{type(error).__name__}: {error}"
+            # Poll quickly while renders are in flight, so reports go out as soon as they are ready
+            self._stop.wait(1 if self._in_flight else self.poll_interval)
+
+    def _render_request(self, schedule, scheduled_for, stations_df, alerts):
+        """ReportEngine.submit arguments of a run, and the key of the report they produce"""
+        filters = schedule['filters']
+        selected = stations_df
+        for column, values in (('country', filters.get('countries')), ('type', filters.get('types')),
+                               ('status', filters.get('statuses'))):
+            if values:
+                selected = selected[selected[column].isin(values)]
+        station_ids = set(selected['station_id'])
+        alerts = [alert for alert in alerts if alert['station_id'] in station_ids]
+        start, end = report_period(schedule['frequency'], scheduled_for)
+        options = {'charts': bool(schedule['include_charts']), 'alerts': bool(schedule['include_alerts']),
+                   'summary': bool(schedule['include_summary'])}
+
+        key = json.dumps([
+            schedule['kind'], schedule['format'], options, sorted(station_ids), start, end,
+            store_fingerprint(self.engine.store_root, start, end),
+            sorted((alert['station_id'], alert['type'], alert['severity']) for alert in alerts)
+            if options['alerts'] else None
+        ], default=str)
+        request = {
+            'kind': schedule['kind'],
+            'report_format': schedule['format'],
+            'stations_df': selected,
+            'alerts': alerts,
+            'start': start,
+            'end': end,
+            'base_name': f"nbi_{schedule['kind'].lower().replace(' ', '_')}_{start:%Y%m%d}_{end:%Y%m%d}",
+            'options': options
+        }
+        return key, request
+
+    def _collect(self):
+        """Mail the reports whose render finished"""
+        for key, flight in list(self._in_flight.items()):
+            status = self.engine.status(flight['job_id'])
+            if status['state'] in ('queued', 'running'):
+                continue
+            del self._in_flight[key]
+            if status['state'] == 'done':
+                self._rendered[key] = status['result']
+                while len(self._rendered) > MAX_REUSED_REPORTS:
+                    self._rendered.pop(next(iter(self._rendered)))
+                for number, run in enumerate(flight['runs']):
+                    self._deliver(run, status['result'], reused=number > 0)
+            else:
+                for run in flight['runs']:
+                    self.store.finish(run['schedule']['id'], run['scheduled_for'], 'failed',
+                                      coalesced_runs=run['coalesced_runs'],
+                                      error=status.get('error', 'Report job was lost'))
+
+    def _deliver(self, run, result, reused):
+        schedule = run['schedule']
+        start, end = report_period(schedule['frequency'], run['scheduled_for'])
+        try:
+            self.mailer.send(_report_message(schedule, result, start, end))
+        except (OSError, smtplib.SMTPException) as error:
+            self.store.finish(schedule['id'], run['scheduled_for'], 'failed', result.file_name,
+                              run['coalesced_runs'], reused, f"Delivery failed: {error}")
+            return
+        self.store.finish(schedule['id'], run['scheduled_for'], 'sent', result.file_name,
+                          run['coalesced_runs'], reused)
+
+
+def _plan_run(schedule, now):
+    """(occurrence to run, missed occurrences folded into it, next run after now)"""
+    occurrence = schedule['next_run']
+    coalesced_runs = 0
+    following = next_occurrence(schedule['frequency'], schedule['send_time'], occurrence)
+    while following <= now:
+        occurrence = following
+        coalesced_runs += 1
+        following = next_occurrence(schedule['frequency'], schedule['send_time'], occurrence)
+    return occurrence, coalesced_runs, following
+
+
+def _report_message(schedule, result, start, end):
+    period = f"{start:%Y-%m-%d} to {end - timedelta(days=1):%Y-%m-%d}"
+    message = EmailMessage()
+    message['Subject'] = f"NBI {schedule['frequency']} {schedule['kind']}: {period}"
+    message['From'] = REPORT_SENDER
+    message['To'] = ', '.join(schedule['recipients'])
+    message.set_content(
+        f"The {schedule['frequency'].lower()} {schedule['kind']} of the Nile Basin monitoring network "
+        f"for {period} is attached ({result.rows:,} readings).\n\n"
+        f"This report is sent automatically by the NBI Water Resources Management System."
+    )
+    maintype, subtype = result.mime.split('/')
+    with result.open() as report_file:
+        message.add_attachment(report_file.read(), maintype=maintype, subtype=subtype, filename=result.file_name)
+    return message
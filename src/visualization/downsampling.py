@@ -0,0 +1,145 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import plotly.graph_objects as go
+
+# About one point per horizontal pixel of a full-width chart
+DEFAULT_POINT_BUDGET = 1000
+
+# Traces of series with more raw points than this are drawn with WebGL
+SCATTERGL_THRESHOLD = 5000
+
+
+def lttb_indices(x, y, n_out):
+    """Indices of the points kept by Largest-Triangle-Three-Buckets
+
+    The first and last points are always kept. The points in between are
+    split into n_out - 2 buckets, and from each bucket the point forming the
+    largest triangle with the previously kept point and the mean of the next
+    bucket is kept, which preserves peaks and the visual shape of the line.
+    """
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.intp)
+    kept = np.empty(n_out, dtype=np.intp)
+    kept[0], kept[-1] = 0, n - 1
+
+    previous = 0
+    for bucket in range(n_out - 2):
+        start, stop = edges[bucket], edges[bucket + 1]
+        # Mean of the next bucket (the last point for the final bucket)
+        next_stop = edges[bucket + 2] if bucket + 2 < len(edges) else n
+        next_x = x[stop:next_stop].mean()
+        next_y = y[stop:next_stop].mean()
+
+        area = np.abs((x[previous] - next_x) * (y[start:stop] - y[previous])
+                      - (x[previous] - x[start:stop]) * (next_y - y[previous]))
+        previous = start + int(np.argmax(area)) if stop > start else start
+        kept[bucket + 1] = previous
+    return kept
+
+
+def minmax_indices(y, n_out):
+    """Indices of the minimum and maximum of each of n_out // 2 equal buckets, in order"""
+    n = len(y)
+    n_buckets = max(1, n_out // 2)
+    if n <= n_out:
+        return np.arange(n)
+
+    y = np.asarray(y, dtype=np.float64)
+    edges = np.linspace(0, n, n_buckets + 1).astype(np.intp)
+    # Pad buckets to a common width so the reduction is a single 2-D argmin/argmax
+    width = int(np.diff(edges).max())
+    positions = edges[:-1, None] + np.arange(width)
+    in_bucket = positions < edges[1:, None]
+    positions = np.minimum(positions, n - 1)
+    values = y[positions]
+    lows = np.where(in_bucket, values, np.inf).argmin(axis=1)
+    highs = np.where(in_bucket, values, -np.inf).argmax(axis=1)
+
+    rows = np.arange(n_buckets)
+    return np.unique(np.concatenate([positions[rows, lows], positions[rows, highs]]))
+
+
+def downsample(x, y, max_points=DEFAULT_POINT_BUDGET, method='lttb'):
+    """Reduce a series to at most max_points points with LTTB or min/max decimation"""
+    y = np.asarray(y)
+    if len(y) <= max_points:
+        return np.asarray(x), y
+
+    # NaN gaps would poison the triangle areas, so they are dropped first
+    valid = ~np.isnan(y.astype(np.float64))
+    x, y = np.asarray(x)[valid], y[valid]
+    if method == 'minmax':
+        kept = minmax_indices(y, max_points)
+    else:
+        x_numeric = x.astype('datetime64[ns]').view(np.int64) if np.issubdtype(x.dtype, np.datetime64) else x
+        kept = lttb_indices(x_numeric, y, max_points)
+    return x[kept], y[kept]
+
+
+def scatter_trace(x, y, source_points=None, **kwargs):
+    """go.Scatter for small series, go.Scattergl above SCATTERGL_THRESHOLD points
+
+    source_points is the length of the series before downsampling (len(x)
+    by default), so a long history keeps WebGL once reduced to its budget.
+    """
+    points = len(x) if source_points is None else source_points
+    trace_type = go.Scattergl if points > SCATTERGL_THRESHOLD else go.Scatter
+    return trace_type(x=x, y=y, **kwargs)
+
+
+class SeriesCache:
+    """LRU cache of downsampled chart series
+
+    Keys identify the dataset version, a station, a time range and the
+    slice of data that was reduced (row count and first/last timestamps),
+    so a new version or appended readings produce a new entry instead of
+    a stale chart.
+    """
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(station_id, time_range, data, max_points, method, data_version=None):
+        if data.empty:
+            return (data_version, station_id, time_range, 0, None, None, max_points, method)
+        timestamps = data['timestamp']
+        return (data_version, station_id, time_range, len(data), timestamps.iloc[0], timestamps.iloc[-1],
+                max_points, method)
+
+    def get_series(self, station_id, time_range, data, columns,
+                   max_points=DEFAULT_POINT_BUDGET, method='lttb', data_version=None):
+        """Downsampled (timestamps, values) of each column, cached per dataset version, station and range"""
+        key = self.make_key(station_id, time_range, data, max_points, method, data_version)
+        with self._lock:
+            series = self._entries.get(key)
+            if series is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return series
+            self.misses += 1
+
+        timestamps = data['timestamp'].to_numpy()
+        series = {
+            column: downsample(timestamps, data[column].to_numpy(dtype=float), max_points, method)
+            for column in columns
+        }
+        with self._lock:
+            self._entries[key] = series
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return series
+
+    def stats(self):
+        return {'entries': len(self._entries), 'hits': self.hits, 'misses': self.misses}
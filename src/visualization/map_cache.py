@@ -0,0 +1,66 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+
+class MapArtifactCache:
+    """LRU cache of rendered map HTML bounded by a total byte budget"""
+
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(station_ids, alerts_only, map_style, data_version):
+        """Hash the inputs that determine the rendered map"""
+        digest = hashlib.sha256()
+        for station_id in sorted(station_ids):
+            digest.update(str(station_id).encode())
+            digest.update(b'\0')
+        digest.update(f"|{bool(alerts_only)}|{map_style}|{data_version}".encode())
+        return digest.hexdigest()
+
+    def get(self, key):
+        """Return cached HTML (marking it most recently used) or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, html):
+        """Store HTML, evicting least recently used entries beyond the budget"""
+        size = len(html.encode('utf-8'))
+        if size > self.max_bytes:
+            return  # Never cache an artifact larger than the whole budget
+        with self._lock:
+            if key in self._entries:
+                self.current_bytes -= self._entries.pop(key)[1]
+            self._entries[key] = (html, size)
+            self.current_bytes += size
+            while self.current_bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.current_bytes -= evicted_size
+
+    def get_or_render(self, key, render):
+        """Return cached HTML, or call render() to build and cache it"""
+        html = self.get(key)
+        if html is None:
+            html = render()
+            self.put(key, html)
+        return html
+
+    def stats(self):
+        return {
+            'entries': len(self._entries),
+            'bytes': self.current_bytes,
+            'hits': self.hits,
+            'misses': self.misses
+        }
@@ -1,8 +1,58 @@
 import folium
+from folium.plugins import FastMarkerCluster, MarkerCluster
 import plotly.graph_objects as go
 import plotly.express as px
 import pandas as pd
 
+from src.data_processing.latest_readings import LatestReadingIndex
+
+
+STATUS_COLORS = {
+    'Active': '#4CAF50',
+    'Maintenance': '#FF9800',
+    'Offline': '#F44336',
+    'Calibration': '#2196F3'
+}
+
+# Networks larger than this are rendered as a single FastMarkerCluster layer
+FAST_RENDER_THRESHOLD = 500
+
+# Builds each station marker and its popup in the browser from the row
+# [lat, lon, name, status, color, country, type, elevation, climate,
+#  transmission, feature, installed, level, flow, temperature, quality, battery]
+FAST_MARKER_CALLBACK = """
+function (row) {
+    var color = row[4];
+    var marker = L.circleMarker(new L.LatLng(row[0], row[1]), {
+        radius: 7, color: color, fillColor: color, fillOpacity: 0.8, weight: 2
+    });
+    marker.bindTooltip(row[2] + ' (' + row[3] + ')');
+    marker.bindPopup(function () {
+        var fields = [['Country', row[5]], ['Type', row[6]],
+                      ['Status', '<span style="color: ' + color + ';">' + row[3] + '</span>'],
+                      ['Elevation', row[7] + 'm'], ['Climate', row[8]], ['Transmission', row[9]],
+                      ['Feature', row[10]], ['Installed', row[11]]];
+        var html = '<div style="font-family: Arial; width: 300px;">' +
+                   '<h4 style="color: ' + color + '; margin-bottom: 10px;">🌊 ' + row[2] + '</h4>' +
+                   '<table style="width: 100%; font-size: 12px;">';
+        for (var i = 0; i < fields.length; i++) {
+            html += '<tr><td><b>' + fields[i][0] + ':</b></td><td>' + fields[i][1] + '</td></tr>';
+        }
+        html += '</table>';
+        if (row[12] !== null) {
+            html += '<br><b>Latest Readings:</b><br>' +
+                    'Water Level: ' + row[12].toFixed(2) + 'm<br>' +
+                    'Flow Rate: ' + row[13].toFixed(1) + ' m³/s<br>' +
+                    'Temperature: ' + row[14].toFixed(1) + '°C<br>' +
+                    'Data Quality: ' + row[15].toFixed(1) + '%<br>' +
+                    'Battery: ' + row[16].toFixed(0) + '%';
+        }
+        return html + '</div>';
+    }, {maxWidth: 350});
+    return marker;
+}
+"""
+
 class NileBasinMapper:
     """Create maps for Nile Basin water resources"""
     
@@ -75,3 +125,162 @@ class NileBasinMapper:
         )
         
         return fig
+
+
+def create_professional_nile_map(stations_df, measurements_df=None, latest_readings=None, render_mode='auto',
+                                 map_style='Street Map'):
+    """Create a professional interactive map with enhanced features
+
+    render_mode 'markers' adds one folium Marker with a pre-rendered popup
+    per station; 'fast' sends all stations as one FastMarkerCluster layer
+    whose popups are built in the browser. 'auto' picks 'fast' for networks
+    larger than FAST_RENDER_THRESHOLD stations.
+    """
+    if latest_readings is None and measurements_df is not None:
+        latest_readings = LatestReadingIndex(measurements_df)
+    if render_mode == 'auto':
+        render_mode = 'fast' if len(stations_df) > FAST_RENDER_THRESHOLD else 'markers'
+
+    # Initialize map with better styling
+    m = folium.Map(
+        location=[15, 30],
+        zoom_start=4,
+        tiles=None  # We'll add custom tiles
+    )
+
+    # Add multiple tile layers for better visualization (map_style is shown first)
+    folium.TileLayer('OpenStreetMap', name='Street Map', show=map_style == 'Street Map').add_to(m)
+    folium.TileLayer('CartoDB positron', name='Light Map', show=map_style == 'Light Map').add_to(m)
+    folium.TileLayer('CartoDB dark_matter', name='Dark Map', show=map_style == 'Dark Map').add_to(m)
+
+    # Add satellite imagery
+    folium.TileLayer(
+        tiles='https://server.arcgisonline.com/ArcGIS/rest/services/World_Imagery/MapServer/tile/{z}/{y}/{x}',
+        attr='Esri',
+        name='Satellite',
+        overlay=False,
+        control=True,
+        show=map_style == 'Satellite'
+    ).add_to(m)
+
+    # Stations layer
+    if render_mode == 'fast':
+        _add_fast_station_layer(m, stations_df, latest_readings)
+    else:
+        _add_station_markers(m, stations_df, latest_readings)
+
+    # Legend counts from a single pass over the statuses
+    status_counts = stations_df['status'].value_counts()
+
+    # Add enhanced legend
+    legend_html = f'''
+    <div style="position: fixed; 
+                bottom: 50px; left: 50px; width: 200px; height: 140px; 
+                background-color: white; border: 2px solid grey; z-index: 9999; 
+                font-size: 14px; padding: 15px; border-radius: 10px;
+                box-shadow: 0 4px 8px rgba(0,0,0,0.1);">
+    <h4 style="margin-top: 0; color: #333;">Station Status</h4>
+    <p style="margin: 5px 0;"><i class="fa fa-circle" style="color: #4CAF50;"></i> Active ({status_counts.get('Active', 0)})</p>
+    <p style="margin: 5px 0;"><i class="fa fa-circle" style="color: #FF9800;"></i> Maintenance ({status_counts.get('Maintenance', 0)})</p>
+    <p style="margin: 5px 0;"><i class="fa fa-circle" style="color: #2196F3;"></i> Calibration ({status_counts.get('Calibration', 0)})</p>
+    <p style="margin: 5px 0;"><i class="fa fa-circle" style="color: #F44336;"></i> Offline ({status_counts.get('Offline', 0)})</p>
+    </div>
+    '''
+    m.get_root().html.add_child(folium.Element(legend_html))
+
+    # Add layer control
+    folium.LayerControl().add_to(m)
+
+    return m
+
+
+def _add_station_markers(map_obj, stations_df, latest_readings):
+    """Add one folium Marker with a server-rendered popup per station"""
+    # Create marker clusters for better performance
+    marker_cluster = MarkerCluster(name='Monitoring Stations').add_to(map_obj)
+
+    # Add stations with enhanced popups
+    for _, station in stations_df.iterrows():
+        color = STATUS_COLORS.get(station['status'], '#9E9E9E')
+
+        # Get latest measurement if available
+        latest_data = ""
+        if latest_readings is not None:
+            latest = latest_readings.get(station['station_id'])
+            if latest is not None:
+                latest_data = f"""
+                <br><b>Latest Readings:</b><br>
+                Water Level: {latest['water_level']:.2f}m<br>
+                Flow Rate: {latest['flow_rate']:.1f} m³/s<br>
+                Temperature: {latest['temperature']:.1f}°C<br>
+                Data Quality: {latest['data_quality']:.1f}%<br>
+                Battery: {latest['battery_level']:.0f}%
+                """
+
+        popup_content = f"""
+        <div style="font-family: Arial; width: 300px;">
+            <h4 style="color: {color}; margin-bottom: 10px;">
+                🌊 {station['name']}
+            </h4>
+            <table style="width: 100%; font-size: 12px;">
+                <tr><td><b>Country:</b></td><td>{station['country']}</td></tr>
+                <tr><td><b>Type:</b></td><td>{station['type']}</td></tr>
+                <tr><td><b>Status:</b></td><td><span style="color: {color};">{station['status']}</span></td></tr>
+                <tr><td><b>Elevation:</b></td><td>{station['elevation']:.0f}m</td></tr>
+                <tr><td><b>Climate:</b></td><td>{station['climate_zone']}</td></tr>
+                <tr><td><b>Transmission:</b></td><td>{station['transmission_method']}</td></tr>
+                <tr><td><b>Feature:</b></td><td>{station['major_feature']}</td></tr>
+                <tr><td><b>Installed:</b></td><td>{station['installation_date'].strftime('%Y-%m-%d')}</td></tr>
+            </table>
+            {latest_data}
+        </div>
+        """
+
+        # Enhanced marker with custom icon
+        icon = folium.Icon(
+            color='white',
+            icon_color=color,
+            icon='tint',
+            prefix='fa'
+        )
+
+        folium.Marker(
+            location=[station['latitude'], station['longitude']],
+            popup=folium.Popup(popup_content, max_width=350),
+            tooltip=f"{station['name']} ({station['status']})",
+            icon=icon
+        ).add_to(marker_cluster)
+
+
+def _add_fast_station_layer(map_obj, stations_df, latest_readings):
+    """Add all stations as one FastMarkerCluster layer with client-side popups"""
+    installed = pd.to_datetime(stations_df['installation_date']).dt.strftime('%Y-%m-%d')
+    columns = [
+        stations_df['latitude'].round(5),
+        stations_df['longitude'].round(5),
+        stations_df['name'],
+        stations_df['status'],
+        stations_df['status'].map(STATUS_COLORS).fillna('#9E9E9E'),
+        stations_df['country'],
+        stations_df['type'],
+        stations_df['elevation'].round(0).astype(int),
+        stations_df['climate_zone'],
+        stations_df['transmission_method'],
+        stations_df['major_feature'],
+        installed
+    ]
+
+    # Latest readings joined in one reindex (null when a station never reported)
+    reading_columns = ['water_level', 'flow_rate', 'temperature', 'data_quality', 'battery_level']
+    if latest_readings is not None and len(latest_readings):
+        latest = latest_readings.frame.reindex(stations_df['station_id'].to_numpy())
+        for column in reading_columns:
+            values = latest[column].round(2)
+            columns.append(values.astype(object).where(values.notna(), None))
+    else:
+        columns.extend([[None] * len(stations_df)] * len(reading_columns))
+
+    rows = [list(row) for row in zip(*(
+        column.tolist() if hasattr(column, 'tolist') else column for column in columns
+    ))]
+    FastMarkerCluster(rows, callback=FAST_MARKER_CALLBACK, name='Monitoring Stations').add_to(map_obj)
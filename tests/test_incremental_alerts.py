@@ -0,0 +1,82 @@
+import pandas as pd
+
+from src.alerts.incremental import IncrementalAlertEvaluator
+from src.data_processing.fleet_generator import generate_stations
+
+NOW = pd.Timestamp('2026-01-31')
+
+
+def make_readings(stations_df, timestamps, battery_level):
+    """Readings inside every threshold except the battery, for each station at each timestamp"""
+    return pd.DataFrame([
+        {
+            'station_id': station_id,
+            'timestamp': timestamp,
+            'water_level': 450.0 if station_type == 'River Flow' else 500.0,
+            'flow_rate': 100.0,
+            'temperature': 25.0,
+            'data_quality': 95.0,
+            'transmission_status': 'Success',
+            'battery_level': battery_level
+        }
+        for station_id, station_type in zip(stations_df['station_id'], stations_df['type'])
+        for timestamp in timestamps
+    ])
+
+
+def battery_alerts(evaluator):
+    return [alert for alert in evaluator.active_alerts() if alert['type'] == 'Battery Alert']
+
+
+def test_daily_station_opens_alert_on_warm_up():
+    stations_df = generate_stations(1, seed=0, frequency='Daily', now=NOW).assign(type='River Flow')
+    timestamps = pd.date_range(end=NOW, periods=30, freq='D')
+    evaluator = IncrementalAlertEvaluator(stations_df)
+
+    evaluator.update(make_readings(stations_df, timestamps, battery_level=0.0))
+
+    alerts = battery_alerts(evaluator)
+    assert len(alerts) == 1
+    assert alerts[0]['severity'] == 'Critical'
+    assert alerts[0]['timestamp'] == NOW
+
+
+def test_daily_station_breached_once_stays_pending():
+    stations_df = generate_stations(1, seed=0, frequency='Daily', now=NOW).assign(type='River Flow')
+    readings = pd.concat([
+        make_readings(stations_df, pd.date_range(end=NOW - pd.Timedelta(days=1), periods=29, freq='D'), 90.0),
+        make_readings(stations_df, [NOW], 0.0)
+    ], ignore_index=True)
+    evaluator = IncrementalAlertEvaluator(stations_df)
+
+    evaluator.update(readings)
+
+    assert battery_alerts(evaluator) == []
+    evaluator.update(make_readings(stations_df, [NOW + pd.Timedelta(days=1)], 0.0))
+    assert len(battery_alerts(evaluator)) == 1
+
+
+def test_hourly_station_needs_min_duration_of_breach():
+    stations_df = generate_stations(1, seed=0, frequency='Hourly', now=NOW).assign(type='River Flow')
+    readings = pd.concat([
+        make_readings(stations_df, pd.date_range(end=NOW - pd.Timedelta(hours=1), periods=47, freq='h'), 90.0),
+        make_readings(stations_df, [NOW], 0.0)
+    ], ignore_index=True)
+    evaluator = IncrementalAlertEvaluator(stations_df)
+
+    evaluator.update(readings)
+    assert battery_alerts(evaluator) == []
+
+    evaluator.update(make_readings(stations_df, [NOW + pd.Timedelta(hours=1)], 0.0))
+    assert len(battery_alerts(evaluator)) == 1
+
+
+def test_update_without_known_stations_emits_nothing():
+    stations_df = generate_stations(1, seed=0, frequency='Hourly', now=NOW).assign(type='River Flow')
+    unknown = make_readings(stations_df, [NOW], 0.0).assign(station_id='NBI-XXX-999')
+    evaluator = IncrementalAlertEvaluator(stations_df)
+
+    assert evaluator.update(unknown) == []
+    assert evaluator.update(make_readings(stations_df, [NOW + pd.Timedelta(hours=1)], 90.0).iloc[0:0]) == []
+    assert evaluator.update(unknown.assign(timestamp=NOW + pd.Timedelta(hours=2))) == []
+    assert evaluator.active_alerts() == []
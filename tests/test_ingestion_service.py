@@ -0,0 +1,77 @@
+import asyncio
+
+import pandas as pd
+
+from src.data_processing.fleet_generator import generate_stations
+from src.data_processing.measurement_store import MeasurementStore
+from src.ingestion.protocol import encode_request, read_message
+from src.ingestion.service import TelemetryIngestService
+
+NOW = pd.Timestamp('2026-01-31')
+
+
+def make_batch(station_id, timestamps):
+    return {
+        'station_id': station_id,
+        'readings': [
+            {
+                'timestamp': timestamp.isoformat(),
+                'water_level': 450.0 + i,
+                'flow_rate': 120.0,
+                'temperature': 24.5,
+                'data_quality': 93.0,
+                'battery_level': 88.0
+            }
+            for i, timestamp in enumerate(timestamps)
+        ]
+    }
+
+
+async def post(port, payload):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    try:
+        writer.write(encode_request('POST', '/telemetry', payload))
+        await writer.drain()
+        (_, status, *_), _, body = await read_message(reader, 1024 * 1024)
+        return int(status), body
+    finally:
+        writer.close()
+
+
+def run_service(store, stations_df, payloads):
+    async def session():
+        service = await TelemetryIngestService(store, stations_df, port=0, commit_interval=0.01).start()
+        try:
+            return [await post(service.port, payload) for payload in payloads]
+        finally:
+            await service.stop()
+    return asyncio.run(session())
+
+
+def test_posted_batch_is_read_back_from_store(tmp_path):
+    stations_df = generate_stations(5, seed=0, now=NOW)
+    station_id = stations_df['station_id'].iloc[0]
+    timestamps = pd.date_range(end=NOW, periods=3, freq='h')
+    store = MeasurementStore(tmp_path / 'measurements')
+
+    (status, _), = run_service(store, stations_df, [make_batch(station_id, timestamps)])
+
+    assert status == 200
+    stored = store.read()
+    assert stored['station_id'].tolist() == [station_id] * 3
+    assert stored['timestamp'].tolist() == list(timestamps)
+    assert stored['water_level'].tolist() == [450.0, 451.0, 452.0]
+    assert (stored['transmission_status'] == stations_df['transmission_method'].iloc[0]).all()
+
+
+def test_rejected_batch_is_not_stored(tmp_path):
+    stations_df = generate_stations(5, seed=0, now=NOW)
+    store = MeasurementStore(tmp_path / 'measurements')
+
+    responses = run_service(store, stations_df, [
+        make_batch('NBI-XXX-999', [NOW]),
+        {'station_id': [1], 'readings': []}
+    ])
+
+    assert [status for status, _ in responses] == [400, 400]
+    assert store.is_empty()
@@ -0,0 +1,28 @@
+import numpy as np
+import pandas as pd
+
+from src.data_processing.compact_schema import compact_measurements, compact_stations
+from src.data_processing.fleet_generator import generate_stations
+from src.data_processing.measurement_generator import MeasurementGenerator
+from src.data_processing.rollups import ROLLUP_PARAMETERS, MeasurementRollups
+
+NOW = pd.Timestamp('2026-01-31')
+
+
+def test_compact_schema_rollups_match_full_schema():
+    stations_df = generate_stations(60, seed=1, now=NOW)
+    measurements_df = MeasurementGenerator(days=7, seed=1).generate(stations_df, end_time=NOW)
+    compact_stations_df = compact_stations(stations_df)
+    compact_df = compact_measurements(measurements_df, station_ids=compact_stations_df['station_id'])
+
+    full = MeasurementRollups(measurements_df)
+    compact = MeasurementRollups(compact_df)
+
+    for parameter in ROLLUP_PARAMETERS:
+        expected = full.summarize(parameter, 'country', stations_df)
+        actual = compact.summarize(parameter, 'country', compact_stations_df).reindex(expected.index)
+        assert (expected['std'] > 0).all()
+        # Compact readings are float32 or rounded to whole percentages
+        tolerance = 0.5 if compact_df[parameter].dtype == np.uint8 else 1e-3
+        np.testing.assert_allclose(actual['std'], expected['std'], atol=tolerance, rtol=0.05)
+        np.testing.assert_allclose(actual['mean'], expected['mean'], atol=tolerance, rtol=1e-4)
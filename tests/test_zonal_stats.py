@@ -0,0 +1,27 @@
+import os
+
+import numpy as np
+
+from src.data_processing.wapor_raster import RasterGrid, WaPORRasterStore
+from src.data_processing.zonal_stats import ZonalStatsEngine
+
+GRID = RasterGrid.from_bounds(28.8, -3.0, 31.0, -1.0, resolution=0.01)
+
+
+def test_rewritten_raster_is_summarized_again(tmp_path):
+    store = WaPORRasterStore(tmp_path)
+    engine = ZonalStatsEngine()
+
+    store.write('L2-AETI-M.2024-01', np.full((GRID.height, GRID.width), 10.0, dtype=np.float32), GRID)
+    raster = store.open('L2-AETI-M.2024-01')
+    first = engine.summarize(raster, 'L2-AETI-M', '2024-01').set_index('country')
+    raster.close()
+    assert first.loc['Rwanda', 'mean'] == 10.0
+
+    path = store.write('L2-AETI-M.2024-01', np.full((GRID.height, GRID.width), 20.0, dtype=np.float32), GRID)
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))  # Coarse mtime clocks
+    raster = store.open('L2-AETI-M.2024-01')
+    second = engine.summarize(raster, 'L2-AETI-M', '2024-01').set_index('country')
+    raster.close()
+    assert second.loc['Rwanda', 'mean'] == 20.0